@@ -0,0 +1,11 @@
+"""
+Gunicorn settings, read from the working directory by ``gunicorn jobportal.wsgi:application``.
+"""
+
+
+def post_worker_init(worker):
+    # Load the job search index before the worker takes requests, rather
+    # than on the first search (see jobs.search.preload_search_index)
+    from jobs.search import preload_search_index
+
+    preload_search_index()
@@ -52,6 +52,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     # Local apps
     "jobs",
     "accounts",
@@ -122,6 +123,86 @@ else:
     }
 
 
+# Cache
+# Local memory by default; set REDIS_URL to share cached listings and their
+# invalidation version across all workers.
+REDIS_URL = os.environ.get('REDIS_URL')
+if REDIS_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+
+# Seconds a cached job listing (page IDs + total count) is kept
+JOB_LISTING_CACHE_TIMEOUT = int(os.environ.get('JOB_LISTING_CACHE_TIMEOUT', 300))
+
+# Seconds a whole home/job detail page rendered for an anonymous visitor is
+# kept; pages are also dropped as soon as a job they show changes
+JOB_PAGE_CACHE_TIMEOUT = int(os.environ.get('JOB_PAGE_CACHE_TIMEOUT', 60))
+
+# /api/jobs/changes/: changes younger than this many seconds wait for the
+# next sync (so slow commits are not skipped), and deleted-job tombstones
+# (and with them sync cursors) are kept this many days
+JOB_CHANGES_SETTLE_SECONDS = int(os.environ.get('JOB_CHANGES_SETTLE_SECONDS', 5))
+JOB_TOMBSTONE_RETENTION_DAYS = int(os.environ.get('JOB_TOMBSTONE_RETENTION_DAYS', 30))
+
+# Seconds clients may reuse category/company/FAQ/testimonial API responses
+# before revalidating them with their ETag
+REFERENCE_DATA_MAX_AGE = int(os.environ.get('REFERENCE_DATA_MAX_AGE', 3600))
+# Seconds a worker keeps those rows in memory before reloading them. Changes
+# reach the other workers right away through a shared cache (REDIS_URL);
+# with the per-process default cache, only after this long
+REFERENCE_DATA_RELOAD_SECONDS = int(os.environ.get('REFERENCE_DATA_RELOAD_SECONDS', 60))
+
+# Live job updates (/api/jobs/stream/, /ws/jobs/; ASGI only). With REDIS_URL
+# events go through Redis pub/sub so clients on any worker get every change.
+# Keep-alive interval in seconds, and events a client may fall behind before
+# it is disconnected
+JOB_LIVE_BACKEND = os.environ.get(
+    'JOB_LIVE_BACKEND', 'jobs.live.RedisBackend' if REDIS_URL else 'jobs.live.LocalBackend'
+)
+JOB_LIVE_HEARTBEAT = int(os.environ.get('JOB_LIVE_HEARTBEAT', 15))
+JOB_LIVE_QUEUE_SIZE = int(os.environ.get('JOB_LIVE_QUEUE_SIZE', 100))
+
+# Serve the home page and the job/category/company read endpoints with their
+# async views (jobs.async_views). Turn on when running under the ASGI server,
+# e.g. uvicorn jobportal.asgi:application
+ASYNC_READ_VIEWS = os.environ.get('ASYNC_READ_VIEWS', 'False').lower() == 'true'
+
+# Paginated views that show "about N" above the given number of rows instead
+# of running an exact COUNT(*); None keeps exact counts for that view
+APPROXIMATE_COUNT_THRESHOLDS = {
+    "home": 1000,
+    "saved_jobs": None,
+    "my_applications": None,
+    "job_applications": 1000,
+}
+
+# Keep employer dashboard totals in a per-employer EmployerStats row adjusted
+# on every change, instead of aggregating the employer's jobs on each view
+EMPLOYER_STATS_ROLLUP = os.environ.get('EMPLOYER_STATS_ROLLUP', 'False').lower() == 'true'
+
+# Job views are buffered per process and written in one batched UPDATE once
+# this many are pending or this many seconds have passed since the last write
+JOB_VIEW_FLUSH_THRESHOLD = int(os.environ.get('JOB_VIEW_FLUSH_THRESHOLD', 100))
+JOB_VIEW_FLUSH_INTERVAL = float(os.environ.get('JOB_VIEW_FLUSH_INTERVAL', 10))
+
+# In-process job search index, used when PostgreSQL full-text search is not
+# available. Workers persist it to JOB_SEARCH_INDEX_PATH (by default a file in
+# a temp directory private to the user) so restarts load it instead of
+# rebuilding; files other users could have written are not loaded.
+JOB_SEARCH_INDEX_ENABLED = os.environ.get('JOB_SEARCH_INDEX_ENABLED', 'True').lower() == 'true'
+JOB_SEARCH_INDEX_PATH = os.environ.get('JOB_SEARCH_INDEX_PATH')
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
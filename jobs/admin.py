@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Company, Category, Job, Application, SavedJob, Testimonial, FAQ
+from .models import Company, Category, Skill, Job, Application, SavedJob, EmployerStats, JobDailyStats, Testimonial, FAQ
 
 
 @admin.register(Company)
@@ -15,9 +15,15 @@ class CategoryAdmin(admin.ModelAdmin):
     search_fields = ("name",)
 
 
+@admin.register(Skill)
+class SkillAdmin(admin.ModelAdmin):
+    list_display = ("name", "key")
+    search_fields = ("name", "key")
+
+
 @admin.register(Job)
 class JobAdmin(admin.ModelAdmin):
-    list_display = ("title", "company", "location", "employment_type", "work_mode", "is_active", "created_at")
+    list_display = ("title", "company", "location", "employment_type", "work_mode", "application_count", "saved_count", "view_count", "is_active", "created_at")
     list_filter = ("company", "category", "employment_type", "work_mode", "experience_level", "is_active", "created_at")
     search_fields = ("title", "description", "location", "skills_required")
     list_editable = ("is_active",)
@@ -59,6 +65,21 @@ class SavedJobAdmin(admin.ModelAdmin):
     date_hierarchy = "created_at"
 
 
+@admin.register(EmployerStats)
+class EmployerStatsAdmin(admin.ModelAdmin):
+    list_display = ("employer", "total_jobs", "active_jobs", "total_applications", "pending", "hired", "updated_at")
+    search_fields = ("employer__username",)
+    readonly_fields = ("updated_at",)
+
+
+@admin.register(JobDailyStats)
+class JobDailyStatsAdmin(admin.ModelAdmin):
+    list_display = ("job", "date", "views", "saves", "applications")
+    list_filter = ("date",)
+    search_fields = ("job__title",)
+    date_hierarchy = "date"
+
+
 @admin.register(Testimonial)
 class TestimonialAdmin(admin.ModelAdmin):
     list_display = ("name", "company", "rating", "is_active", "created_at")
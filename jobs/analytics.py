@@ -0,0 +1,120 @@
+"""
+Daily per-job analytics.
+
+``JobDailyStats`` holds one row per job and day with the views, saves and
+applications it received. Views are added by the view counter as it
+flushes; saves and applications are rolled up from the ``SavedJob`` and
+``Application`` rows by the ``rollup_job_stats`` command, which only reads
+rows past the watermark it stored on its previous run. Increments and the
+new watermark commit in one transaction, so a run that fails leaves
+nothing behind and running it again never counts a row twice. Deleting a
+save or application later does not lower the count of the day it was made.
+
+Dashboards and the API read the rollup, never the raw rows.
+"""
+import datetime
+
+from django.db import transaction
+from django.db.models import Case, Count, F, Max, PositiveIntegerField, Q, Sum, Value, When
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+STAT_FIELDS = ["views", "saves", "applications"]
+
+# Rolled-up source models: watermark name -> (model path, JobDailyStats field)
+ROLLUP_SOURCES = {
+    "saved_jobs": ("jobs.SavedJob", "saves"),
+    "applications": ("jobs.Application", "applications"),
+}
+
+
+def add_daily_counts(field, counts, using="default"):
+    """
+    Add ``counts`` (``{(job_id, date): n}``) to ``field`` of the matching
+    JobDailyStats rows, creating missing rows. Counts for jobs that no
+    longer exist are dropped.
+    """
+    from .models import Job, JobDailyStats
+
+    job_ids = Job.objects.using(using).filter(pk__in={job_id for job_id, _ in counts}).values_list("pk", flat=True)
+    job_ids = set(job_ids)
+    counts = {key: n for key, n in counts.items() if key[0] in job_ids and n}
+    if not counts:
+        return
+
+    rows = JobDailyStats.objects.using(using)
+    # Insert-if-missing then increment, so concurrent writers never
+    # overwrite each other's counts
+    rows.bulk_create(
+        [JobDailyStats(job_id=job_id, date=date) for job_id, date in counts],
+        ignore_conflicts=True,
+    )
+    match = Q()
+    for job_id, date in counts:
+        match |= Q(job_id=job_id, date=date)
+    row_ids = {(job_id, date): pk for pk, job_id, date in rows.filter(match).values_list("pk", "job_id", "date")}
+    increment = Case(
+        *[When(pk=row_ids[key], then=Value(n)) for key, n in counts.items()],
+        default=Value(0),
+        output_field=PositiveIntegerField(),
+    )
+    rows.filter(pk__in=row_ids.values()).update(**{field: F(field) + increment})
+
+
+def rollup(name, using="default", lag=60, batch_size=5000):
+    """
+    Add the rows of source ``name`` created since its watermark to the
+    daily stats, in batches of ``batch_size`` primary keys. Rows younger
+    than ``lag`` seconds are left for the next run, so rows whose
+    transaction commits within ``lag`` seconds of the insert are not
+    skipped by a concurrent run. Returns the rows rolled up.
+    """
+    from django.apps import apps
+
+    from .models import RollupWatermark
+
+    model_path, field = ROLLUP_SOURCES[name]
+    source = apps.get_model(model_path).objects.using(using).order_by()
+    cutoff = timezone.now() - datetime.timedelta(seconds=lag)
+    upper = source.filter(created_at__lte=cutoff).aggregate(upper=Max("pk"))["upper"]
+
+    rolled_up = 0
+    while upper is not None:
+        with transaction.atomic(using=using):
+            watermark, _ = RollupWatermark.objects.using(using).select_for_update().get_or_create(name=name)
+            start = watermark.position
+            if start >= upper:
+                break
+            end = min(start + batch_size, upper)
+            batch = source.filter(pk__gt=start, pk__lte=end)
+            counts = {
+                (row["job_id"], row["date"]): row["n"]
+                for row in batch.values("job_id", date=TruncDate("created_at")).annotate(n=Count("pk"))
+            }
+            add_daily_counts(field, counts, using)
+            watermark.position = end
+            watermark.save(update_fields=["position", "updated_at"])
+        rolled_up += sum(counts.values())
+    return rolled_up
+
+
+def daily_series(stats, days, today=None):
+    """
+    Per-day totals of the JobDailyStats queryset ``stats`` over the last
+    ``days`` days, oldest first, with days without a row filled with zeros.
+    """
+    today = today or timezone.localdate()
+    start = today - datetime.timedelta(days=days - 1)
+    totals = {
+        row["date"]: row
+        for row in stats.filter(date__gte=start, date__lte=today)
+        .order_by()
+        .values("date")
+        .annotate(**{field: Sum(field) for field in STAT_FIELDS})
+    }
+    series = []
+    for offset in range(days):
+        date = start + datetime.timedelta(days=offset)
+        row = totals.get(date, {})
+        series.append({"date": date.isoformat(), **{field: row.get(field) or 0 for field in STAT_FIELDS}})
+    return series
@@ -1,14 +1,35 @@
+from django.conf import settings
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from jobs.api_views import JobViewSet, CompanyViewSet, CategoryViewSet, TestimonialViewSet, FAQViewSet
+from jobs import async_views
+from jobs.api_views import (
+    JobViewSet, ApplicationViewSet, JobDailyStatsViewSet, CompanyViewSet, CategoryViewSet, TestimonialViewSet, FAQViewSet,
+    job_stream,
+)
 
 router = DefaultRouter()
 router.register(r'jobs', JobViewSet, basename='job')
+router.register(r'applications', ApplicationViewSet, basename='application')
+router.register(r'job-stats', JobDailyStatsViewSet, basename='job-stats')
 router.register(r'companies', CompanyViewSet, basename='company')
 router.register(r'categories', CategoryViewSet, basename='category')
 router.register(r'testimonials', TestimonialViewSet, basename='testimonial')
 router.register(r'faqs', FAQViewSet, basename='faq')
 
+# Async versions of the public read endpoints, served ahead of the router's
+# routes for the same URLs (see jobs.async_views)
+async_read_urlpatterns = [
+    path('jobs/', async_views.job_list),
+    path('jobs/<int:pk>/', async_views.job_detail),
+    path('categories/', async_views.category_list),
+    path('categories/<int:pk>/', async_views.category_detail),
+    path('companies/', async_views.company_list),
+    path('companies/<int:pk>/', async_views.company_detail),
+]
+
 urlpatterns = [
+    # Ahead of the router, whose job detail route would take "stream" as a pk
+    path('jobs/stream/', job_stream, name='job-stream'),
+    *(async_read_urlpatterns if settings.ASYNC_READ_VIEWS else []),
     path('', include(router.urls)),
 ]
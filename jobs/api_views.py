@@ -1,60 +1,249 @@
-from rest_framework import viewsets, filters
+import copy
+import datetime
+
+from rest_framework import viewsets, filters, permissions, status
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
+from django.core.handlers.asgi import ASGIRequest
+from django.http import JsonResponse, StreamingHttpResponse
+from django.utils import timezone
 from django_filters.rest_framework import DjangoFilterBackend
-from .models import Job, Company, Category, Application, Testimonial, FAQ
+from .analytics import daily_series
+from .changes import cursor_expired, decode_changes_cursor, encode_changes_cursor, job_changes
+from .facets import FACET_PARAMS, facet_counts, facet_filters
+from .fieldsets import SparseFieldsViewSetMixin
+from .filters import JobFilter, JobSearchFilter
+from .live import sse_events, subscribe
+from .pagination import CachedPageNumberPagination
+from .refdata import ReferenceDataViewSetMixin
+from .models import Job, JobDailyStats, Category, Application
 from .serializers import (
-    JobSerializer, JobListSerializer, CompanySerializer,
-    CategorySerializer, ApplicationSerializer, TestimonialSerializer, FAQSerializer
+    JobSerializer, JobListSerializer, JobListFastSerializer, JobChangesSerializer, CompanySerializer,
+    CategorySerializer, ApplicationSerializer, ApplicationStatusBulkSerializer, JobBatchSerializer,
+    JobDailyStatsSerializer, TestimonialSerializer, FAQSerializer
 )
 
 
-class JobViewSet(viewsets.ReadOnlyModelViewSet):
+class JobViewSet(SparseFieldsViewSetMixin, viewsets.ReadOnlyModelViewSet):
     """
     API endpoint for jobs
     GET /api/jobs/ - List all jobs
     GET /api/jobs/{id}/ - Get job detail
+    GET /api/jobs/facets/ - Facet counts for the current filters
+    GET /api/jobs/batch/?ids=1,2,3 - Several jobs by id, in the order given
+    POST /api/jobs/batch/ - Same, with {"ids": [...]} for long lists
+    GET /api/jobs/changes/?since={cursor} - Jobs changed and removed since a cursor
+
+    List and detail take ?fields=id,title,company_name to return (and load)
+    only those fields; the same holds for the other viewsets below.
     """
-    queryset = Job.objects.filter(is_active=True).select_related('company', 'category')
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
-    filterset_fields = ['employment_type', 'work_mode', 'experience_level', 'location']
-    search_fields = ['title', 'description', 'company__name']
+    # Skills and the other formatted values come from Job.display
+    queryset = Job.objects.filter(is_active=True).select_related(
+        'company', 'category'
+    ).defer('search_vector')
+    # OrderingFilter runs first so the relevance ordering applied by the
+    # fuzzy filters and JobSearchFilter is not overridden by the default
+    filter_backends = [filters.OrderingFilter, DjangoFilterBackend, JobSearchFilter]
+    filterset_class = JobFilter
     ordering_fields = ['created_at', 'salary_min']
     ordering = ['-created_at']
+    pagination_class = CachedPageNumberPagination
+    # Cursors and the default ordering read created_at
+    sparse_keep = ['created_at']
+    sparse_actions = ['list', 'retrieve', 'batch', 'changes']
+    
+    # Serve list responses from values() rows (see JobListFastSerializer)
+    fast_list = True
+    # Changed jobs per /changes/ response, by default and at most
+    changes_limit = 100
+    max_changes_limit = 500
+    
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action == 'list' and self.fast_list:
+            return queryset.values(
+                *JobListFastSerializer.values_for(self.get_sparse_fields())
+            )
+        return queryset
     
     def get_serializer_class(self):
         if self.action == 'list':
-            return JobListSerializer
+            return JobListFastSerializer if self.fast_list else JobListSerializer
+        if self.action == 'changes':
+            return JobChangesSerializer
         return JobSerializer
+    
+    @action(detail=False, methods=['get', 'post'])
+    def batch(self, request):
+        if request.method == 'POST':
+            data = request.data
+        else:
+            ids = request.query_params.get('ids', '')
+            data = {'ids': [value.strip() for value in ids.split(',') if value.strip()]}
+        serializer = JobBatchSerializer(data=data)
+        serializer.is_valid(raise_exception=True)
+        ids = list(dict.fromkeys(serializer.validated_data['ids']))
+
+        jobs = self.sparse_queryset(self.get_queryset()).in_bulk(ids)
+        return Response({
+            'results': self.get_serializer([jobs[pk] for pk in ids if pk in jobs], many=True).data,
+            'missing': [pk for pk in ids if pk not in jobs],
+        })
+
+    @action(detail=False)
+    def changes(self, request):
+        try:
+            cursor = decode_changes_cursor(request.query_params.get('since', ''))
+        except ValueError as exc:
+            raise ValidationError({'since': str(exc)})
+        if cursor_expired(cursor):
+            return Response(
+                {'detail': 'This cursor has expired; fetch the full job list again.'},
+                status=status.HTTP_410_GONE,
+            )
+        try:
+            limit = int(request.query_params.get('limit', self.changes_limit))
+        except ValueError:
+            limit = self.changes_limit
+        limit = min(max(limit, 1), self.max_changes_limit)
+
+        # Inactive jobs too: they are reported as removed
+        columns = JobChangesSerializer.values_for(self.get_sparse_fields())
+        jobs = Job.objects.values(*columns, 'updated_at', 'is_active')
+        changed, removed, next_cursor, has_more = job_changes(jobs, cursor, limit)
+        return Response({
+            'changed': self.get_serializer(changed, many=True).data,
+            'removed': removed,
+            'cursor': encode_changes_cursor(next_cursor),
+            'has_more': has_more,
+        })
+
+    def facet_request(self, request):
+        """``request`` without the facet filter parameters."""
+        django_request = copy.copy(request._request)
+        django_request.GET = request._request.GET.copy()
+        for name in FACET_PARAMS:
+            django_request.GET.pop(name, None)
+        return self.initialize_request(django_request)
+
+    @action(detail=False)
+    def facets(self, request):
+        # The list's filters, except the facets: facet_counts applies those
+        # to every facet but its own
+        facet_request = self.facet_request(request)
+        jobs = self.get_queryset()
+        for backend in self.filter_backends:
+            jobs = backend().filter_queryset(facet_request, jobs, self)
+        filters = facet_filters(request.query_params)
+        return Response(facet_counts(jobs, filters, Category.objects.all()))
+
+
+class ApplicationViewSet(SparseFieldsViewSetMixin, viewsets.ReadOnlyModelViewSet):
+    """
+    API endpoint for the applications to the current employer's jobs
+    GET /api/applications/?job={id}&status={status} - List applications
+    POST /api/applications/bulk-status/ - Set {"status"} on applications {"ids"}
+    """
+    serializer_class = ApplicationSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    filter_backends = [DjangoFilterBackend]
+    filterset_fields = ['job', 'status']
 
+    def get_queryset(self):
+        return Application.objects.filter(
+            job__posted_by=self.request.user
+        ).select_related('job__company', 'applicant').defer('job__search_vector')
 
-class CompanyViewSet(viewsets.ReadOnlyModelViewSet):
+    @action(detail=False, methods=['post'], url_path='bulk-status')
+    def bulk_status(self, request):
+        serializer = ApplicationStatusBulkSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        ids = serializer.validated_data['ids']
+        status = serializer.validated_data['status']
+        updated = Application.bulk_set_status(request.user, ids, status)
+        return Response({'status': status, 'updated': updated})
+
+
+class JobDailyStatsViewSet(SparseFieldsViewSetMixin, viewsets.ReadOnlyModelViewSet):
+    """
+    API endpoint for the daily stats of the current employer's jobs
+    GET /api/job-stats/?job={id}&days=30 - Daily rows per job
+    GET /api/job-stats/series/?job={id}&days=30 - Daily totals, one entry per day
+    """
+    serializer_class = JobDailyStatsSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    filter_backends = []
+    max_days = 365
+
+    def get_days(self):
+        try:
+            days = int(self.request.query_params.get('days', 30))
+        except ValueError:
+            days = 30
+        return min(max(days, 1), self.max_days)
+
+    def get_stats(self):
+        stats = JobDailyStats.objects.filter(job__posted_by=self.request.user)
+        job = self.request.query_params.get('job')
+        if job and job.isdigit():
+            stats = stats.filter(job_id=job)
+        return stats
+
+    def get_queryset(self):
+        since = timezone.localdate() - datetime.timedelta(days=self.get_days() - 1)
+        return self.get_stats().filter(date__gte=since).order_by('-date', 'job_id')
+
+    @action(detail=False)
+    def series(self, request):
+        return Response(daily_series(self.get_stats(), self.get_days()))
+
+
+class CompanyViewSet(ReferenceDataViewSetMixin, SparseFieldsViewSetMixin, viewsets.ReadOnlyModelViewSet):
     """
     API endpoint for companies
     """
-    queryset = Company.objects.all()
+    reference = 'companies'
     serializer_class = CompanySerializer
 
 
-class CategoryViewSet(viewsets.ReadOnlyModelViewSet):
+class CategoryViewSet(ReferenceDataViewSetMixin, SparseFieldsViewSetMixin, viewsets.ReadOnlyModelViewSet):
     """
     API endpoint for categories
     """
-    queryset = Category.objects.all()
+    reference = 'categories'
     serializer_class = CategorySerializer
 
 
-class TestimonialViewSet(viewsets.ReadOnlyModelViewSet):
+class TestimonialViewSet(ReferenceDataViewSetMixin, SparseFieldsViewSetMixin, viewsets.ReadOnlyModelViewSet):
     """
     API endpoint for testimonials
     """
-    queryset = Testimonial.objects.filter(is_active=True)
+    reference = 'testimonials'
     serializer_class = TestimonialSerializer
 
 
-class FAQViewSet(viewsets.ReadOnlyModelViewSet):
+class FAQViewSet(ReferenceDataViewSetMixin, SparseFieldsViewSetMixin, viewsets.ReadOnlyModelViewSet):
     """
     API endpoint for FAQs
     """
-    queryset = FAQ.objects.filter(is_active=True)
+    reference = 'faqs'
     serializer_class = FAQSerializer
+
+
+async def job_stream(request):
+    """
+    Server-Sent Events stream of new, updated and removed jobs, filtered by
+    ``category`` (slug), ``work_mode`` and ``location``. ASGI only.
+    """
+    if not isinstance(request, ASGIRequest):
+        # Under WSGI the never-ending response would hold a worker for good
+        return JsonResponse({'detail': 'Live updates need the ASGI server.'}, status=503)
+    work_mode = request.GET.get('work_mode')
+    if work_mode and work_mode not in dict(Job.WORK_MODE_CHOICES):
+        return JsonResponse({'work_mode': f'Unknown work mode: {work_mode}'}, status=400)
+    response = StreamingHttpResponse(sse_events(subscribe(request.GET)), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    # Keep reverse proxies from buffering the stream
+    response['X-Accel-Buffering'] = 'no'
+    return response
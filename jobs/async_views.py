@@ -0,0 +1,264 @@
+"""
+Async versions of the public read paths, for the ASGI server.
+
+``home`` and the job, category and company list and detail endpoints of
+the API, as coroutines that run their queries and cache reads with the
+async ORM and cache APIs, so a request waiting on the database does not
+hold a worker thread. They are routed in place of the sync views when
+``ASYNC_READ_VIEWS`` is set (see jobs.urls and jobs.api_urls), and give
+the same responses (see AsyncViewTests in jobs.tests).
+
+The API views reuse the DRF viewsets to build querysets, serializers and
+responses, and only do the I/O themselves. Each request still goes
+through the viewset's ``initial()`` (authentication, permissions and
+throttles, run in a thread as they read the session), and errors through
+its exception handler. Requests they do not handle natively go to the
+sync view (run in a thread, as Django runs any sync view under ASGI):
+other methods, the browsable API, and keyword or fuzzy searches when
+full-text search is not available, as those read the in-process search
+index or candidate values while the queryset is built.
+
+Templates are rendered in a thread as well: rendering reads the session
+and the user, which are sync only.
+"""
+from asgiref.sync import sync_to_async
+from django.db import DEFAULT_DB_ALIAS
+from django.http import Http404, HttpResponse
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework.exceptions import APIException
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+
+from . import views
+from .api_views import CategoryViewSet, CompanyViewSet, JobViewSet
+from .cache import acached, acached_page, alisting_key, alisting_version
+from .facets import afacet_counts
+from .pagecache import atag_page, cache_anonymous_page
+from .pagination import akeyset_page, listing_paginator
+from .refdata import reference_cache
+from .search import uses_full_text
+
+# Query parameters the native paths handle
+PAGE_PARAMS = {"page", "fields", "format"}
+JOB_LIST_PARAMS = PAGE_PARAMS | {
+    "employment_type", "work_mode", "experience_level", "category", "salary_min",
+    "skills", "skills_match", "ordering", "pagination", "cursor",
+}
+# Read the search index (or candidate values) unless full-text search is available
+SEARCH_PARAMS = {"search", "location", "title"}
+
+
+def full_text_search():
+    return uses_full_text(DEFAULT_DB_ALIAS)
+
+
+class AsyncRoute:
+    """One viewset action: its sync view and what the async one handles natively."""
+
+    def __init__(self, viewset_class, action, basename, detail, params, search=False):
+        self.viewset_class = viewset_class
+        self.action = action
+        self.basename = basename
+        self.detail = detail
+        self.params = params
+        self.search = search
+        # The view the router builds for this route
+        self.sync_view = viewset_class.as_view(
+            {"get": action}, basename=basename, detail=detail, suffix="Instance" if detail else "List",
+        )
+
+    async def delegate(self, request, **kwargs):
+        return await sync_to_async(self.sync_view)(request, **kwargs)
+
+    def handles(self, request):
+        if request.method != "GET":
+            return False
+        allowed = self.params | SEARCH_PARAMS if self.search and full_text_search() else self.params
+        return set(request.GET) <= allowed
+
+    async def respond(self, request, handler, **kwargs):
+        """
+        The response to ``request``: ``await handler(view)`` with the
+        viewset set up and checked as by the sync view, or the sync view's
+        own response for requests the async view leaves to it.
+        """
+        view = self.viewset(request, **kwargs)
+        if view is None:
+            return await self.delegate(request, **kwargs)
+        try:
+            await sync_to_async(view.initial)(view.request, **kwargs)
+            response = await handler(view)
+        except Exception as exc:
+            response = view.handle_exception(exc)
+        return finish(view, response)
+
+    def viewset(self, request, **kwargs):
+        """
+        The viewset set up to handle ``request`` as the sync view would, or
+        None if the async view leaves the request to it.
+        """
+        if not self.handles(request):
+            return None
+        view = self.viewset_class(
+            action_map={"get": self.action}, args=(), kwargs=kwargs, format_kwarg=None,
+            **self.sync_view.initkwargs,
+        )
+        # As ViewSetMixin.as_view does; the Allow header is built from these
+        view.get = view.head = getattr(view, self.action)
+        view.headers = view.default_response_headers
+        view.request = view.initialize_request(request, **kwargs)
+        try:
+            renderer, media_type = view.perform_content_negotiation(view.request)
+        except (APIException, Http404):
+            # Unknown ?format=
+            return None
+        if not isinstance(renderer, JSONRenderer):
+            return None
+        return view
+
+
+def route_view(route):
+    """
+    Mark the decorated view as the async view of ``route``: exempt from
+    CSRF checks like DRF's views, and described like the router's view
+    (for the browsable API's names and breadcrumbs).
+    """
+    def decorator(view):
+        view = csrf_exempt(view)
+        view.cls = route.viewset_class
+        view.initkwargs = route.sync_view.initkwargs
+        view.actions = route.sync_view.actions
+        return view
+    return decorator
+
+
+def finish(view, response):
+    """
+    ``response`` finalized and rendered as by the viewset, as a plain
+    HttpResponse: Django would otherwise render it again in a thread.
+    """
+    response = view.finalize_response(view.request, response)
+    if not isinstance(response, Response):
+        return response
+    response.render()
+    rendered = HttpResponse(response.content, status=response.status_code)
+    for header, value in response.items():
+        rendered[header] = value
+    return rendered
+
+
+JOB_LIST = AsyncRoute(JobViewSet, "list", "job", False, JOB_LIST_PARAMS, search=True)
+JOB_DETAIL = AsyncRoute(JobViewSet, "retrieve", "job", True, PAGE_PARAMS)
+
+
+async def list_jobs(view):
+    queryset = view.filter_queryset(view.get_queryset())
+    rows = await view.paginator.apaginate_queryset(queryset, view.request, view=view)
+    data = await view.get_serializer(rows, many=True).adata()
+    return view.get_paginated_response(data)
+
+
+async def retrieve_job(view):
+    queryset = view.filter_queryset(view.get_queryset())
+    job = await queryset.filter(pk=view.kwargs["pk"]).afirst()
+    if job is None:
+        raise Http404
+    view.check_object_permissions(view.request, job)
+    if "display" not in job.get_deferred_fields() and not job.display:
+        # Saved without display values: computing them runs queries
+        return Response(await sync_to_async(lambda: view.get_serializer(job).data)())
+    return Response(view.get_serializer(job).data)
+
+
+@route_view(JOB_LIST)
+async def job_list(request):
+    if not JobViewSet.fast_list:
+        return await JOB_LIST.delegate(request)
+    return await JOB_LIST.respond(request, list_jobs)
+
+
+@route_view(JOB_DETAIL)
+async def job_detail(request, pk):
+    return await JOB_DETAIL.respond(request, retrieve_job, pk=pk)
+
+
+def reference_routes(viewset_class, basename):
+    return (
+        AsyncRoute(viewset_class, "list", basename, False, PAGE_PARAMS),
+        AsyncRoute(viewset_class, "retrieve", basename, True, PAGE_PARAMS),
+    )
+
+
+async def reference_response(route, request, **kwargs):
+    """The reference data viewset's response, with its rows loaded asynchronously first."""
+    async def handler(view):
+        view._reference_entry = await reference_cache.aget(view.reference)
+        return getattr(view, route.action)(view.request, **kwargs)
+
+    return await route.respond(request, handler, **kwargs)
+
+
+CATEGORY_LIST, CATEGORY_DETAIL = reference_routes(CategoryViewSet, "category")
+COMPANY_LIST, COMPANY_DETAIL = reference_routes(CompanyViewSet, "company")
+
+
+@route_view(CATEGORY_LIST)
+async def category_list(request):
+    return await reference_response(CATEGORY_LIST, request)
+
+
+@route_view(CATEGORY_DETAIL)
+async def category_detail(request, pk):
+    return await reference_response(CATEGORY_DETAIL, request, pk=pk)
+
+
+@route_view(COMPANY_LIST)
+async def company_list(request):
+    return await reference_response(COMPANY_LIST, request)
+
+
+@route_view(COMPANY_DETAIL)
+async def company_detail(request, pk):
+    return await reference_response(COMPANY_DETAIL, request, pk=pk)
+
+
+@cache_anonymous_page("home")
+async def home(request):
+    if (request.GET.get("q") or request.GET.get("location")) and not full_text_search():
+        # Unwrapped: this wrapper already handles the page cache
+        return await sync_to_async(views.home.__wrapped__)(request)
+
+    await atag_page(request, "listings")
+    listing, search_results, jobs, filters, by_recency = views.home_jobs(request.GET)
+    try:
+        key = await alisting_key("home", request.GET, ignore=("page", "cursor"))
+        cursor = request.GET.get("cursor") if by_recency else None
+        pagination = {}
+        if cursor:
+            try:
+                jobs, next_cursor, previous_cursor = await akeyset_page(jobs, cursor, 12)
+                pagination = {
+                    "next": next_cursor and views._listing_url(request, cursor=next_cursor),
+                    "previous": previous_cursor and views._listing_url(request, cursor=previous_cursor),
+                }
+            except ValueError:
+                cursor = None
+        if not cursor:
+            jobs = await acached_page(
+                jobs, 12, request.GET.get("page"), key, listing,
+                paginator_class=listing_paginator("home"),
+            )
+            pagination = views.home_page_links(request, jobs, by_recency)
+
+        categories = (await reference_cache.aget("categories")).rows
+        facets = await acached(f"{key}:facets", lambda: afacet_counts(search_results, filters, categories))
+
+        return await sync_to_async(views.render_home)(request, {
+            "jobs": jobs,
+            "categories": categories,
+            "facets": facets,
+            "pagination": pagination,
+            "card_version": await alisting_version(),
+        })
+    except Exception as e:
+        return views.database_setup_response(e)
@@ -0,0 +1,272 @@
+"""
+Query-result cache for job listings.
+
+Entries are keyed by the normalized request parameters and hold only the
+page's job IDs and the total count, so a hit costs one ``pk IN (...)``
+query instead of the filter, ``COUNT(*)`` and page queries. Every key
+embeds a listing version number that is bumped whenever a Job, Company or
+Category changes; all cached listings are invalidated at once without
+having to track which entries a change affects. The version lives in the
+configured cache, so with a shared backend every worker sees the bump.
+
+Entries that depend on a few specific objects instead (cached pages, see
+jobs.pagecache) record the versions of tags such as ``job:42`` and are
+invalidated with ``purge_tags``.
+
+Functions prefixed with ``a`` are the same operations for async views
+(jobs.async_views), reading and writing the same entries through the
+cache's and the ORM's async APIs.
+"""
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.paginator import Paginator
+
+VERSION_KEY = "jobs:listing:version"
+HITS_KEY = "jobs:listing:hits"
+MISSES_KEY = "jobs:listing:misses"
+TAG_KEY = "jobs:tag:{}"
+
+
+def listing_timeout():
+    return getattr(settings, "JOB_LISTING_CACHE_TIMEOUT", 300)
+
+
+def listing_version():
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        # Seed from the clock so an evicted version never repeats an old one
+        version = int(time.time() * 1000)
+        cache.add(VERSION_KEY, version, None)
+        version = cache.get(VERSION_KEY, version)
+    return version
+
+
+async def alisting_version():
+    version = await cache.aget(VERSION_KEY)
+    if version is None:
+        version = int(time.time() * 1000)
+        await cache.aadd(VERSION_KEY, version, None)
+        version = await cache.aget(VERSION_KEY, version)
+    return version
+
+
+def bump_listing_version():
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        cache.set(VERSION_KEY, int(time.time() * 1000), None)
+
+
+def _count(key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, 0, None)
+        try:
+            cache.incr(key)
+        except ValueError:
+            pass
+
+
+async def _acount(key):
+    try:
+        await cache.aincr(key)
+    except ValueError:
+        await cache.aadd(key, 0, None)
+        try:
+            await cache.aincr(key)
+        except ValueError:
+            pass
+
+
+def cache_stats(hits_key=HITS_KEY, misses_key=MISSES_KEY):
+    hits = cache.get(hits_key, 0)
+    misses = cache.get(misses_key, 0)
+    total = hits + misses
+    return {
+        "hits": hits,
+        "misses": misses,
+        "hit_ratio": round(hits / total, 3) if total else None,
+    }
+
+
+def listing_stats():
+    return cache_stats(HITS_KEY, MISSES_KEY)
+
+
+def params_digest(params, ignore=()):
+    """
+    Digest of the query dict ``params``, ignoring empty values, parameter
+    order, repeated whitespace and the parameters named in ``ignore``.
+    """
+    normalized = sorted(
+        (name, " ".join(value.split()))
+        for name, values in params.lists()
+        if name not in ignore
+        for value in values
+        if value.strip()
+    )
+    return hashlib.sha1(repr(normalized).encode()).hexdigest()
+
+
+def listing_key(namespace, params, ignore=("page",)):
+    """
+    Cache key for a listing described by the query dict ``params``. Empty
+    values and parameter order do not matter; ``ignore`` names parameters
+    that are keyed separately (the page number).
+    """
+    return f"jobs:listing:{listing_version()}:{namespace}:{params_digest(params, ignore)}"
+
+
+async def alisting_key(namespace, params, ignore=("page",)):
+    return f"jobs:listing:{await alisting_version()}:{namespace}:{params_digest(params, ignore)}"
+
+
+def tag_versions(tags):
+    """
+    Current version of each of ``tags``. Cache entries store the versions
+    of the tags they depend on and are stale once any of them changed.
+    """
+    keys = {TAG_KEY.format(tag): tag for tag in tags}
+    found = cache.get_many(keys)
+    for key in keys.keys() - found.keys():
+        # Seeded from the clock like the listing version
+        version = int(time.time() * 1000)
+        cache.add(key, version, None)
+        found[key] = cache.get(key, version)
+    return {tag: found[key] for key, tag in keys.items()}
+
+
+async def atag_versions(tags):
+    keys = {TAG_KEY.format(tag): tag for tag in tags}
+    found = await cache.aget_many(keys)
+    for key in keys.keys() - found.keys():
+        version = int(time.time() * 1000)
+        await cache.aadd(key, version, None)
+        found[key] = await cache.aget(key, version)
+    return {tag: found[key] for key, tag in keys.items()}
+
+
+def purge_tags(*tags):
+    """Make every cache entry that depends on any of ``tags`` stale."""
+    for tag in tags:
+        try:
+            cache.incr(TAG_KEY.format(tag))
+        except ValueError:
+            # Never seeded (or evicted): nothing cached can match it
+            pass
+
+
+def cached(key, compute):
+    """``cache.get_or_set`` that records hits and misses."""
+    value = cache.get(key)
+    if value is not None:
+        _count(HITS_KEY)
+        return value
+    _count(MISSES_KEY)
+    value = compute()
+    cache.set(key, value, listing_timeout())
+    return value
+
+
+async def acached(key, compute):
+    """``cached`` with ``compute`` a coroutine function."""
+    value = await cache.aget(key)
+    if value is not None:
+        await _acount(HITS_KEY)
+        return value
+    await _acount(MISSES_KEY)
+    value = await compute()
+    await cache.aset(key, value, listing_timeout())
+    return value
+
+
+def row_pk(row):
+    """Primary key of a model instance or of a ``values()`` row."""
+    return row["id"] if isinstance(row, dict) else row.pk
+
+
+def hydrate(queryset, ids):
+    """Objects (or ``values()`` rows) of ``queryset`` with primary keys ``ids``, in that order."""
+    objects = {row_pk(obj): obj for obj in queryset.filter(pk__in=ids)}
+    return [objects[pk] for pk in ids if pk in objects]
+
+
+async def ahydrate(queryset, ids):
+    objects = {row_pk(obj): obj async for obj in queryset.filter(pk__in=ids)}
+    return [objects[pk] for pk in ids if pk in objects]
+
+
+def cached_page(queryset, per_page, page_number, key, base_queryset, strict=False, paginator_class=Paginator):
+    """
+    Page ``page_number`` of ``queryset`` with its job IDs and the total
+    count cached under ``key``. On a hit the jobs are loaded from
+    ``base_queryset`` by primary key, so none of the filtering in
+    ``queryset`` is repeated.
+
+    Like ``Paginator.get_page`` out-of-range pages fall back to the nearest
+    valid one, unless ``strict`` is set, in which case ``InvalidPage`` is
+    raised as by ``Paginator.page``.
+    """
+    paginator = paginator_class(queryset, per_page)
+    key = f"{key}:{per_page}:{page_number or 1}"
+    entry = cache.get(key)
+    if entry is not None:
+        # Paginator.count is a cached_property: seed it with the cached total
+        paginator.__dict__["count"] = entry["count"]
+        paginator.is_approximate = entry.get("approximate", False)
+    page = paginator.page(page_number or 1) if strict else paginator.get_page(page_number)
+
+    if entry is not None and entry["number"] == page.number:
+        _count(HITS_KEY)
+        page.object_list = hydrate(base_queryset, entry["ids"])
+        return page
+
+    _count(MISSES_KEY)
+    page.object_list = list(page.object_list)
+    cache.set(key, {
+        "count": paginator.count,
+        "approximate": getattr(paginator, "is_approximate", False),
+        "number": page.number,
+        "ids": [row_pk(obj) for obj in page.object_list],
+    }, listing_timeout())
+    return page
+
+
+async def apaginator_count(paginator):
+    """Load ``paginator.count`` with the async ORM, so reading it runs no query."""
+    if "count" not in paginator.__dict__:
+        acount = getattr(paginator, "acount", None)
+        paginator.__dict__["count"] = await (acount() if acount else paginator.object_list.acount())
+    return paginator.count
+
+
+async def acached_page(queryset, per_page, page_number, key, base_queryset, strict=False, paginator_class=Paginator):
+    """``cached_page`` for async views; both read and write the same entries."""
+    paginator = paginator_class(queryset, per_page)
+    key = f"{key}:{per_page}:{page_number or 1}"
+    entry = await cache.aget(key)
+    if entry is not None:
+        paginator.__dict__["count"] = entry["count"]
+        paginator.is_approximate = entry.get("approximate", False)
+    else:
+        await apaginator_count(paginator)
+    page = paginator.page(page_number or 1) if strict else paginator.get_page(page_number)
+
+    if entry is not None and entry["number"] == page.number:
+        await _acount(HITS_KEY)
+        page.object_list = await ahydrate(base_queryset, entry["ids"])
+        return page
+
+    await _acount(MISSES_KEY)
+    page.object_list = [obj async for obj in page.object_list]
+    await cache.aset(key, {
+        "count": paginator.count,
+        "approximate": getattr(paginator, "is_approximate", False),
+        "number": page.number,
+        "ids": [row_pk(obj) for obj in page.object_list],
+    }, listing_timeout())
+    return page
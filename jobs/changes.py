@@ -0,0 +1,143 @@
+"""
+Delta sync of jobs for API clients.
+
+A client keeps a local store of job list items and asks
+``/api/jobs/changes/?since=<cursor>`` for what changed since its previous
+sync: the jobs created or updated since then (by ``updated_at``, read with
+a keyset over ``(updated_at, id)``), and the ids of jobs that were
+deactivated or deleted. Deletions are recorded as ``JobTombstone`` rows by
+a post_delete receiver. The cursor holds the position in both streams plus
+the time of the sync that issued it.
+
+Changes younger than ``JOB_CHANGES_SETTLE_SECONDS`` are left for the next
+sync: a transaction that commits a little after it set ``updated_at`` (or
+inserted a tombstone) would otherwise land behind a cursor already handed
+out. Tombstones older than ``JOB_TOMBSTONE_RETENTION_DAYS`` are removed by
+``prune_job_tombstones``; a cursor issued before that horizon is expired
+and the client has to fetch everything again.
+
+Changes written with ``QuerySet.update()`` (the application, save and view
+counters) do not touch ``updated_at`` and are not reported, nor are edits
+of a job's company or category; the counters and the company name are left
+out of the reported jobs (see ``JobChangesSerializer``) for that reason.
+"""
+import base64
+from collections import namedtuple
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+
+ChangesCursor = namedtuple("ChangesCursor", ["synced_at", "updated_at", "job_id", "tombstone_id"])
+
+# No position yet: every job and tombstone is a change
+START = ChangesCursor(None, None, 0, 0)
+
+# Cursor format marker, so a cursor never parses as an ISO 8601 time
+CURSOR_PREFIX = "c1."
+
+
+def settle_seconds():
+    return getattr(settings, "JOB_CHANGES_SETTLE_SECONDS", 5)
+
+
+def retention_days():
+    return getattr(settings, "JOB_TOMBSTONE_RETENTION_DAYS", 30)
+
+
+def encode_changes_cursor(cursor):
+    raw = "|".join([
+        cursor.synced_at.isoformat(),
+        cursor.updated_at.isoformat() if cursor.updated_at else "",
+        str(cursor.job_id),
+        "" if cursor.tombstone_id is None else str(cursor.tombstone_id),
+    ])
+    return CURSOR_PREFIX + base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_changes_cursor(value):
+    """
+    The ``ChangesCursor`` for a ``since`` parameter: empty for a full sync,
+    a cursor from a previous response, or an ISO 8601 time to start from
+    (e.g. when the client's list was fetched). ValueError if malformed.
+    """
+    if not value:
+        return START
+    if not value.startswith(CURSOR_PREFIX):
+        try:
+            since = datetime.fromisoformat(value)
+        except ValueError as exc:
+            raise ValueError(f"Invalid cursor: {value!r}") from exc
+        if timezone.is_naive(since):
+            since = timezone.make_aware(since, dt_timezone.utc)
+        return ChangesCursor(since, since, 0, None)
+    try:
+        encoded = value[len(CURSOR_PREFIX):]
+        raw = base64.urlsafe_b64decode(encoded + "=" * (-len(encoded) % 4)).decode()
+        synced_at, updated_at, job_id, tombstone_id = raw.split("|")
+        return ChangesCursor(
+            datetime.fromisoformat(synced_at),
+            datetime.fromisoformat(updated_at) if updated_at else None,
+            int(job_id),
+            int(tombstone_id) if tombstone_id else None,
+        )
+    except (TypeError, UnicodeDecodeError, ValueError) as exc:
+        raise ValueError(f"Invalid cursor: {value!r}") from exc
+
+
+def cursor_expired(cursor, now=None):
+    """Whether tombstones the client has not seen may already be pruned."""
+    if cursor.synced_at is None:
+        return False
+    return cursor.synced_at < (now or timezone.now()) - timedelta(days=retention_days())
+
+
+def job_changes(jobs, cursor, limit, now=None):
+    """
+    Up to ``limit`` changed jobs and deleted job ids after ``cursor``.
+
+    ``jobs`` is a ``values()`` queryset over all jobs, active or not,
+    including ``id``, ``updated_at`` and ``is_active``. Returns
+    ``(changed, removed, next_cursor, has_more)``: the rows of active
+    jobs, the ids of deactivated and deleted ones, the cursor to pass as
+    ``since`` next time and whether more changes are already waiting.
+    """
+    from .models import JobTombstone
+
+    now = now or timezone.now()
+    horizon = now - timedelta(seconds=settle_seconds())
+
+    rows = jobs.filter(updated_at__lte=horizon).order_by("updated_at", "pk")
+    if cursor.updated_at is not None:
+        rows = rows.filter(
+            Q(updated_at__gt=cursor.updated_at) | Q(updated_at=cursor.updated_at, pk__gt=cursor.job_id)
+        )
+    rows = list(rows[:limit + 1])
+
+    tombstones = JobTombstone.objects.using(jobs.db).filter(deleted_at__lte=horizon).order_by("pk")
+    if cursor.tombstone_id is not None:
+        tombstones = tombstones.filter(pk__gt=cursor.tombstone_id)
+    elif cursor.updated_at is not None:
+        # Started from a time rather than a cursor
+        tombstones = tombstones.filter(deleted_at__gt=cursor.updated_at)
+    tombstones = list(tombstones.values_list("pk", "job_id")[:limit + 1])
+
+    has_more = len(rows) > limit or len(tombstones) > limit
+    rows, tombstones = rows[:limit], tombstones[:limit]
+
+    changed = [row for row in rows if row["is_active"]]
+    removed = [row["id"] for row in rows if not row["is_active"]]
+    removed.extend(job_id for _, job_id in tombstones)
+
+    next_cursor = ChangesCursor(
+        horizon,
+        rows[-1]["updated_at"] if rows else cursor.updated_at,
+        rows[-1]["id"] if rows else cursor.job_id,
+        tombstones[-1][0] if tombstones else cursor.tombstone_id,
+    )
+    if next_cursor.tombstone_id is None:
+        # Caught up with the tombstones of a time-based start: continue by id
+        last = JobTombstone.objects.using(jobs.db).filter(deleted_at__lte=horizon).order_by("-pk").first()
+        next_cursor = next_cursor._replace(tombstone_id=last.pk if last else 0)
+    return changed, removed, next_cursor, has_more
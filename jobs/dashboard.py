@@ -0,0 +1,69 @@
+"""
+Employer dashboard totals.
+
+``aggregate_employer_stats`` computes an employer's job counts and
+per-status application counts in one query of conditional ``COUNT``s over
+their jobs joined to the applications. With ``EMPLOYER_STATS_ROLLUP`` on,
+the totals are kept in an ``EmployerStats`` row that the model signal
+receivers adjust on every change, so the dashboard reads a single row no
+matter how many jobs the employer has posted. The row is created from the
+aggregate on the employer's first dashboard view; ``recount_employer_stats``
+rewrites rows that drifted (e.g. after ``QuerySet.update()`` calls, which
+bypass the receivers).
+"""
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Count, Q
+
+from .models import Application, EmployerStats, Job
+
+STATUSES = [status for status, _ in Application.STATUS_CHOICES]
+
+STAT_FIELDS = ["total_jobs", "active_jobs", "total_applications", *STATUSES]
+
+
+def rollup_enabled():
+    return getattr(settings, "EMPLOYER_STATS_ROLLUP", False)
+
+
+def aggregate_employer_stats(employer, using="default"):
+    """``{stat: count}`` for ``employer``, from one aggregate query."""
+    aggregates = {
+        # The join repeats each job once per application, hence distinct
+        "total_jobs": Count("pk", distinct=True),
+        "active_jobs": Count("pk", distinct=True, filter=Q(is_active=True)),
+        "total_applications": Count("applications"),
+    }
+    for status in STATUSES:
+        aggregates[status] = Count("applications", filter=Q(applications__status=status))
+    return Job.objects.using(using).filter(posted_by=employer).order_by().aggregate(**aggregates)
+
+
+def employer_stats(employer, using="default"):
+    """Dashboard totals of ``employer``, from the rollup row when enabled."""
+    if not rollup_enabled():
+        return aggregate_employer_stats(employer, using)
+
+    row = EmployerStats.objects.using(using).filter(employer=employer).values(*STAT_FIELDS).first()
+    if row is not None:
+        return row
+    stats = aggregate_employer_stats(employer, using)
+    try:
+        with transaction.atomic(using=using):
+            EmployerStats.objects.using(using).create(employer=employer, **stats)
+    except IntegrityError:
+        # Another request created the row first
+        pass
+    return stats
+
+
+def recount_employer_stats(employer_ids, using="default"):
+    """Rewrite the rollup rows of ``employer_ids`` that drifted; returns how many."""
+    repaired = 0
+    rows = EmployerStats.objects.using(using).filter(employer_id__in=employer_ids)
+    for row in rows:
+        stats = aggregate_employer_stats(row.employer_id, using)
+        if any(getattr(row, field) != value for field, value in stats.items()):
+            EmployerStats.objects.using(using).filter(pk=row.pk).update(**stats)
+            repaired += 1
+    return repaired
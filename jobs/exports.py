@@ -0,0 +1,79 @@
+"""
+Streaming exports of a job's applications.
+
+Rows are read with ``QuerySet.iterator(chunk_size=...)`` (a server-side
+cursor on PostgreSQL) and written out one at a time through a
+``StreamingHttpResponse``, so memory use stays flat however many
+applications a job has.
+"""
+import csv
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+EXPORT_FIELDS = ["id", "applicant", "email", "status", "applied_at", "updated_at", "cover_letter"]
+
+CHUNK_SIZE = 2000
+
+# Spreadsheet apps evaluate cells starting with these as formulas
+FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+class Echo:
+    """File-like object whose ``write`` returns the value, for ``csv.writer``."""
+
+    def write(self, value):
+        return value
+
+
+def application_rows(applications, chunk_size=CHUNK_SIZE):
+    """Export rows (dicts keyed by ``EXPORT_FIELDS``) for the ``applications`` queryset."""
+    rows = applications.order_by("pk").values_list(
+        "pk",
+        "applicant__username",
+        "applicant__first_name",
+        "applicant__last_name",
+        "applicant__email",
+        "status",
+        "created_at",
+        "updated_at",
+        "cover_letter",
+    )
+    for pk, username, first_name, last_name, email, status, created_at, updated_at, cover_letter in rows.iterator(
+        chunk_size=chunk_size
+    ):
+        yield {
+            "id": pk,
+            "applicant": f"{first_name} {last_name}".strip() or username,
+            "email": email,
+            "status": status,
+            "applied_at": created_at,
+            "updated_at": updated_at,
+            "cover_letter": cover_letter,
+        }
+
+
+def _cell(value):
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def csv_lines(rows):
+    writer = csv.writer(Echo())
+    yield writer.writerow(EXPORT_FIELDS)
+    for row in rows:
+        yield writer.writerow([_cell(row[field]) for field in EXPORT_FIELDS])
+
+
+def ndjson_lines(rows):
+    for row in rows:
+        yield json.dumps(row, cls=DjangoJSONEncoder) + "\n"
+
+
+EXPORT_FORMATS = {
+    "csv": ("text/csv", csv_lines),
+    "ndjson": ("application/x-ndjson", ndjson_lines),
+}
@@ -0,0 +1,111 @@
+"""
+Facet counts for the job search sidebar.
+
+All counts for one result set come from a single ``aggregate()`` of
+filtered ``COUNT``s. Each facet is counted against every active filter
+except its own, so the other values of a facet stay visible (and show how
+many jobs switching to them would give) once one of them is selected.
+"""
+from django.db.models import Count, Q
+
+from .models import Job
+
+SALARY_THRESHOLDS = [50000, 100000, 150000, 200000]
+
+CHOICE_FACETS = {
+    "employment_type": Job.EMPLOYMENT_TYPE_CHOICES,
+    "work_mode": Job.WORK_MODE_CHOICES,
+    "experience_level": Job.EXPERIENCE_CHOICES,
+}
+
+# Request parameters of the facet filters
+FACET_PARAMS = ["category", *CHOICE_FACETS, "salary_min"]
+
+
+def facet_filters(params):
+    """Active facet filters from request parameters, with empty/invalid ones dropped."""
+    filters = {}
+    for name in ["category", *CHOICE_FACETS]:
+        value = params.get(name, "")
+        if value:
+            filters[name] = value
+    try:
+        filters["salary_min"] = int(params.get("salary_min", ""))
+    except ValueError:
+        pass
+    return filters
+
+
+def facet_q(filters, exclude=None):
+    """``Q`` for the active facet filters, leaving out the ``exclude`` facet."""
+    q = Q()
+    for name, value in filters.items():
+        if name == exclude:
+            continue
+        if name == "category":
+            q &= Q(category__slug=value)
+        elif name == "salary_min":
+            q &= Q(salary_min__gte=value)
+        else:
+            q &= Q(**{name: value})
+    return q
+
+
+def apply_facet_filters(queryset, filters):
+    return queryset.filter(facet_q(filters))
+
+
+def _facet_aggregates(filters, categories):
+    thresholds = set(SALARY_THRESHOLDS)
+    if "salary_min" in filters:
+        thresholds.add(filters["salary_min"])
+    values = {
+        "category": [(category.slug, category.name, Q(category_id=category.pk)) for category in categories],
+        "salary_min": [
+            (threshold, f"{threshold // 1000}K+", Q(salary_min__gte=threshold))
+            for threshold in sorted(thresholds)
+        ],
+    }
+    for name, choices in CHOICE_FACETS.items():
+        values[name] = [(value, label, Q(**{name: value})) for value, label in choices]
+
+    aggregates = {}
+    for name, facet_values in values.items():
+        others = facet_q(filters, exclude=name)
+        for position, (_, _, value_q) in enumerate(facet_values):
+            aggregates[f"{name}__{position}"] = Count("pk", filter=others & value_q)
+    return values, aggregates
+
+
+def _facet_result(values, counts, filters):
+    return {
+        name: [
+            {
+                "value": value,
+                "label": label,
+                "count": counts[f"{name}__{position}"],
+                "selected": filters.get(name) == value,
+            }
+            for position, (value, label, _) in enumerate(facet_values)
+        ]
+        for name, facet_values in values.items()
+    }
+
+
+def facet_counts(queryset, filters, categories):
+    """
+    Per-value counts for category, employment type, work mode, experience
+    level and salary thresholds over ``queryset`` (the search result before
+    facet filters are applied), in one query.
+
+    Returns ``{facet: [{"value", "label", "count", "selected"}, ...]}``.
+    """
+    values, aggregates = _facet_aggregates(filters, categories)
+    counts = queryset.order_by().aggregate(**aggregates) if aggregates else {}
+    return _facet_result(values, counts, filters)
+
+
+async def afacet_counts(queryset, filters, categories):
+    values, aggregates = _facet_aggregates(filters, categories)
+    counts = await queryset.order_by().aaggregate(**aggregates) if aggregates else {}
+    return _facet_result(values, counts, filters)
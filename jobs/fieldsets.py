@@ -0,0 +1,135 @@
+"""
+Sparse fieldsets for the API: ``?fields=id,title,company``.
+
+The requested fields both trim the serialized output and narrow the
+queryset: ``.only()`` loads just the columns those fields read, relations
+no remaining field reads are neither joined nor prefetched. Serializers
+opt in with ``SparseFieldsSerializerMixin`` and declare what their method
+fields read in ``Meta.sparse_sources``; viewsets add
+``SparseFieldsViewSetMixin``.
+"""
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch, QuerySet
+from rest_framework.exceptions import ValidationError
+
+FIELDS_PARAM = "fields"
+
+
+class SparseFieldsSerializerMixin:
+    """
+    ``fields=[...]`` keeps only the named fields. ``field_sources()`` lists
+    the model lookups the remaining fields read.
+    """
+
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+    def field_sources(self):
+        declared = getattr(self.Meta, "sparse_sources", {})
+        sources = []
+        for name, field in self.fields.items():
+            if name in declared:
+                sources.extend(declared[name])
+            elif isinstance(field, SparseFieldsSerializerMixin):
+                sources.extend(f"{field.source}__{source}" for source in field.field_sources())
+            elif field.source != "*":
+                sources.append(field.source.replace(".", "__"))
+        return sources
+
+
+def _prefetch_name(lookup):
+    return lookup.prefetch_to if isinstance(lookup, Prefetch) else lookup
+
+
+def restrict_queryset(queryset, sources, keep=()):
+    """
+    ``queryset`` loading only what ``sources`` (model lookups such as
+    ``title``, ``company__name`` or ``job_skills``) read, plus the fields in
+    ``keep``. Forward relations on the way are joined with select_related;
+    reverse and many-to-many ones keep their prefetch if the queryset had
+    one.
+    """
+    columns = {"pk", *keep}
+    joins = set()
+    prefetches = set()
+    for source in sources:
+        model = queryset.model
+        parts = source.split("__")
+        for depth, part in enumerate(parts, 1):
+            try:
+                field = model._meta.get_field(part)
+            except FieldDoesNotExist:
+                # Not a model field (a property or annotation): nothing to load
+                break
+            if field.is_relation and (field.one_to_many or field.many_to_many or not field.concrete):
+                prefetches.add("__".join(parts[:depth]))
+                break
+            if field.is_relation and depth < len(parts):
+                joins.add("__".join(parts[:depth]))
+                model = field.related_model
+            else:
+                # A column, or a foreign key read as its id
+                columns.add("__".join(parts[:depth]))
+                break
+
+    # select_related needs the foreign keys it follows to be loaded
+    columns.update(joins)
+    lookups = [
+        lookup for lookup in queryset._prefetch_related_lookups
+        if _prefetch_name(lookup) in prefetches
+    ]
+    queryset = queryset.select_related(None).prefetch_related(None).prefetch_related(*lookups)
+    if joins:
+        # select_related() without arguments would follow every relation
+        queryset = queryset.select_related(*sorted(joins))
+    return queryset.only(*sorted(columns))
+
+
+class SparseFieldsViewSetMixin:
+    """
+    Handles ``?fields=`` for list and detail responses: unknown names are
+    rejected with a 400, the serializer gets the field list and
+    ``filter_queryset()`` narrows the queryset to the columns they need.
+    ``sparse_keep`` names fields to load regardless (ordering, cursors).
+    """
+    sparse_keep = ()
+    sparse_actions = ("list", "retrieve")
+
+    def get_sparse_fields(self):
+        if self.action not in self.sparse_actions:
+            return None
+        value = self.request.query_params.get(FIELDS_PARAM) if self.request else None
+        if not value:
+            return None
+        fields = [name.strip() for name in value.split(",") if name.strip()]
+        available = list(self.get_serializer_class()().fields)
+        unknown = [name for name in fields if name not in available]
+        if unknown:
+            raise ValidationError({FIELDS_PARAM: (
+                "Unknown field(s): {}. Available: {}".format(", ".join(unknown), ", ".join(available))
+            )})
+        return fields
+
+    def filter_queryset(self, queryset):
+        return self.sparse_queryset(super().filter_queryset(queryset))
+
+    def sparse_queryset(self, queryset):
+        fields = self.get_sparse_fields()
+        serializer_class = self.get_serializer_class()
+        if fields is None or not issubclass(serializer_class, SparseFieldsSerializerMixin):
+            return queryset
+        if not isinstance(queryset, QuerySet):
+            # Rows already in memory (reference data): only the output is trimmed
+            return queryset
+        sources = serializer_class(fields=fields).field_sources()
+        return restrict_queryset(queryset, sources, keep=self.sparse_keep)
+
+    def get_serializer(self, *args, **kwargs):
+        fields = self.get_sparse_fields()
+        if fields is not None:
+            kwargs["fields"] = fields
+        return super().get_serializer(*args, **kwargs)
+
@@ -0,0 +1,51 @@
+import django_filters
+from rest_framework import filters
+
+from .models import Job
+from .search import match_location, match_skills, match_title, search_jobs
+
+
+class JobFilter(django_filters.FilterSet):
+    """
+    Exact filters on the choice fields plus typo-tolerant ``location`` and
+    ``title`` matching (trigram similarity, best matches first).
+    """
+    location = django_filters.CharFilter(method="filter_location")
+    title = django_filters.CharFilter(method="filter_title")
+    category = django_filters.CharFilter(field_name="category__slug")
+    salary_min = django_filters.NumberFilter(field_name="salary_min", lookup_expr="gte")
+    # Comma-separated skill names; any of them, or all with ?skills_match=all
+    skills = django_filters.CharFilter(method="filter_skills")
+
+    class Meta:
+        model = Job
+        fields = ['employment_type', 'work_mode', 'experience_level', 'location', 'title', 'category', 'salary_min', 'skills']
+
+    def _ranked(self):
+        params = self.request.query_params if self.request is not None else {}
+        explicit = {JobSearchFilter.search_param, filters.OrderingFilter.ordering_param}
+        return not (explicit & set(params))
+
+    def filter_location(self, queryset, name, value):
+        return match_location(queryset, value, ranked=self._ranked())
+
+    def filter_title(self, queryset, name, value):
+        return match_title(queryset, value, ranked=self._ranked())
+
+    def filter_skills(self, queryset, name, value):
+        match_all = self.data.get("skills_match") == "all"
+        return match_skills(queryset, value.split(","), match_all=match_all)
+
+
+class JobSearchFilter(filters.SearchFilter):
+    """
+    ``?search=`` backed by jobs.search instead of OR-ed ``icontains`` lookups.
+
+    Results are relevance-ranked unless the client asks for an explicit
+    ``?ordering=``.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        q = " ".join(self.get_search_terms(request))
+        ranked = filters.OrderingFilter.ordering_param not in request.query_params
+        return search_jobs(queryset, q, ranked=ranked)
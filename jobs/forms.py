@@ -1,5 +1,6 @@
 from django import forms
 from .models import Job, Application, Company, Category
+from .refdata import reference_rows
 
 
 class JobForm(forms.ModelForm):
@@ -86,3 +87,12 @@ class JobSearchForm(forms.Form):
             'placeholder': 'Min Salary'
         })
     )
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Options from the per-process reference cache instead of a query per
+        # render; validation still goes through the queryset
+        category = self.fields['category']
+        category.choices = [('', category.empty_label)] + [
+            (row.pk, str(row)) for row in reference_rows('categories')
+        ]
@@ -1,6 +1,12 @@
 from django.http import JsonResponse
 from django.db import connection
 from jobs.models import Job, Company, Category
+from jobs.cache import listing_stats
+from jobs.search import loaded_search_index, search_index_enabled
+from jobs.pagecache import page_stats
+from jobs.live import broadcaster
+from jobs.refdata import reference_cache
+from jobs.viewcounter import view_counter
 import os
 
 
@@ -60,4 +66,28 @@ def health_check(request):
     except Exception as e:
         status['errors'].append(f'Company model: {str(e)}')
     
+    try:
+        # Reported, not loaded: workers load it at startup
+        index = loaded_search_index()
+        if index is not None:
+            status['search'] = index.stats()
+        else:
+            status['search'] = 'not loaded' if search_index_enabled('default') else 'postgres full-text'
+    except Exception as e:
+        status['errors'].append(f'Search index: {str(e)}')
+    
+    try:
+        status['listing_cache'] = listing_stats()
+    except Exception as e:
+        status['errors'].append(f'Listing cache: {str(e)}')
+    
+    try:
+        status['page_cache'] = page_stats()
+    except Exception as e:
+        status['errors'].append(f'Page cache: {str(e)}')
+    
+    status['view_counter'] = view_counter.stats()
+    status['reference_data'] = reference_cache.stats()
+    status['live_updates'] = broadcaster.stats()
+    
     return JsonResponse(status, json_dumps_params={'indent': 2})
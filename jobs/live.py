@@ -0,0 +1,347 @@
+"""
+Live push of new and updated jobs over ASGI.
+
+Clients open one long-lived connection instead of polling ``/api/jobs/``:
+Server-Sent Events at ``/api/jobs/stream/`` or a WebSocket at
+``/ws/jobs/``, both taking the optional filters ``category`` (slug),
+``work_mode`` and ``location`` (case-insensitive substring). They receive
+``created`` and ``updated`` events carrying the job as ``/api/jobs/``
+lists it, and ``removed`` events (``{"id": ...}``, sent to every client)
+for jobs deactivated or deleted. After a reconnect, clients catch up with
+``/api/jobs/changes/``.
+
+Job receivers publish an event once the change commits. The configured
+backend (``JOB_LIVE_BACKEND``) carries it to the ``broadcaster`` of every
+process, which hands it to the matching subscribers' queues:
+``LocalBackend`` delivers within the process only, ``RedisBackend`` goes
+through a Redis pub/sub channel so every worker sees every change, and
+reconnects with backoff if the connection drops. Events are only built
+and published while some process listens for them (under WSGI none
+does). A subscriber that falls ``JOB_LIVE_QUEUE_SIZE`` events behind is
+disconnected rather than buffered without bound.
+
+Both endpoints need an ASGI server (e.g. ``uvicorn jobportal.asgi:application``);
+under WSGI the stream endpoint answers 503.
+"""
+import asyncio
+import json
+import logging
+import threading
+import time
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "jobs:live"
+FILTERS = ("category", "work_mode", "location")
+
+
+def heartbeat_seconds():
+    return getattr(settings, "JOB_LIVE_HEARTBEAT", 15)
+
+
+def queue_size():
+    return getattr(settings, "JOB_LIVE_QUEUE_SIZE", 100)
+
+
+class Subscription:
+    """One connected client: its filters and the queue of events waiting to be sent."""
+
+    def __init__(self, category=None, work_mode=None, location=None):
+        self.category = category or None
+        self.work_mode = work_mode or None
+        self.location = (location or "").strip().lower() or None
+        # Created on the event loop serving the client; events arrive from
+        # other threads through call_soon_threadsafe
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(queue_size())
+        self.closed = False
+
+    @classmethod
+    def from_params(cls, params):
+        return cls(**{name: params.get(name) for name in FILTERS})
+
+    def matches(self, event):
+        if event["type"] == "removed":
+            return True
+        job = event["job"]
+        return (
+            (self.category is None or event.get("category") == self.category)
+            and (self.work_mode is None or job.get("work_mode") == self.work_mode)
+            and (self.location is None or self.location in (job.get("location") or "").lower())
+        )
+
+    def offer(self, event):
+        if not self.closed:
+            self.loop.call_soon_threadsafe(self._put, event)
+
+    def _put(self, event):
+        if self.closed:
+            return
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # Too slow: drop what is queued and tell the connection to close
+            self.closed = True
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(None)
+
+    async def next_event(self, timeout=None):
+        """The next event, None once the subscription is closed; TimeoutError after ``timeout``."""
+        return await asyncio.wait_for(self.queue.get(), timeout)
+
+
+class Broadcaster:
+    """This process's subscribers, and delivery of events to the matching ones."""
+
+    def __init__(self):
+        self.subscribers = set()
+        self.lock = threading.Lock()
+        self.delivered = 0
+        self.dropped = 0
+
+    def subscribe(self, subscription):
+        with self.lock:
+            self.subscribers.add(subscription)
+
+    def unsubscribe(self, subscription):
+        with self.lock:
+            self.subscribers.discard(subscription)
+        if subscription.closed:
+            self.dropped += 1
+
+    def has_subscribers(self):
+        return bool(self.subscribers)
+
+    def deliver(self, event):
+        with self.lock:
+            subscribers = list(self.subscribers)
+        for subscription in subscribers:
+            if subscription.matches(event):
+                subscription.offer(event)
+                self.delivered += 1
+
+    def stats(self):
+        return {"subscribers": len(self.subscribers), "delivered": self.delivered, "dropped": self.dropped}
+
+
+broadcaster = Broadcaster()
+
+
+class LocalBackend:
+    """Delivers events to the subscribers of the publishing process only."""
+
+    def __init__(self, broadcaster):
+        self.broadcaster = broadcaster
+
+    def wants_events(self):
+        # Nobody to tell: skip building the event
+        return self.broadcaster.has_subscribers()
+
+    def publish(self, event):
+        self.broadcaster.deliver(event)
+
+    def start(self):
+        pass
+
+
+class RedisBackend:
+    """
+    Publishes events on a Redis pub/sub channel; a listener thread in each
+    process subscribed to it delivers them to that process's subscribers.
+    Needs the ``redis`` package and ``REDIS_URL``.
+    """
+
+    # Seconds a publish (run in on_commit, so on the request's thread) may
+    # wait for Redis, and a connection attempt may take
+    socket_timeout = 1.0
+    connect_timeout = 1.0
+    # Seconds the channel's subscriber count is reused before asking again
+    listeners_ttl = 5.0
+    # Reconnect delays of the listener thread, doubling up to the maximum
+    reconnect_delay = 1.0
+    max_reconnect_delay = 30.0
+
+    def __init__(self, broadcaster, url=None, channel=CHANNEL):
+        try:
+            import redis
+        except ImportError as exc:
+            raise ImproperlyConfigured("RedisBackend needs the redis package") from exc
+        url = url or getattr(settings, "REDIS_URL", None)
+        if not url:
+            raise ImproperlyConfigured("RedisBackend needs REDIS_URL")
+        self.broadcaster = broadcaster
+        self.channel = channel
+        self.client = redis.Redis.from_url(
+            url, socket_timeout=self.socket_timeout, socket_connect_timeout=self.connect_timeout
+        )
+        # Idle waits for messages must not time out; dead connections are
+        # found by the health checks instead
+        self.listen_client = redis.Redis.from_url(
+            url, socket_connect_timeout=self.connect_timeout, socket_keepalive=True, health_check_interval=30
+        )
+        self.listener = None
+        self.lock = threading.Lock()
+        self.listeners = 0
+        self.listeners_checked = None
+
+    def wants_events(self):
+        # Subscribers may be connected to any worker, whose listener thread
+        # then holds a subscription to the channel (none do under WSGI)
+        if self.broadcaster.has_subscribers():
+            return True
+        now = time.monotonic()
+        if self.listeners_checked is None or now - self.listeners_checked >= self.listeners_ttl:
+            try:
+                self.listeners = dict(self.client.pubsub_numsub(self.channel)).get(self.channel.encode(), 0)
+            except Exception:
+                logger.warning("Could not count live job listeners", exc_info=True)
+                self.listeners = 0
+            self.listeners_checked = now
+        return self.listeners > 0
+
+    def publish(self, event):
+        self.client.publish(self.channel, json.dumps(event))
+
+    def start(self):
+        with self.lock:
+            if self.listener is None or not self.listener.is_alive():
+                self.listener = threading.Thread(target=self.listen, name="jobs-live-redis", daemon=True)
+                self.listener.start()
+
+    def listen(self):
+        delay = self.reconnect_delay
+        while True:
+            pubsub = self.listen_client.pubsub(ignore_subscribe_messages=True)
+            try:
+                pubsub.subscribe(self.channel)
+                delay = self.reconnect_delay
+                for message in pubsub.listen():
+                    try:
+                        self.broadcaster.deliver(json.loads(message["data"]))
+                    except Exception:
+                        logger.warning("Could not deliver a live job event", exc_info=True)
+            except Exception:
+                # Events published until the reconnect are missed; clients
+                # catch up with /api/jobs/changes/
+                logger.warning("Lost the live job event channel; reconnecting in %gs", delay, exc_info=True)
+            finally:
+                try:
+                    pubsub.close()
+                except Exception:
+                    pass
+            time.sleep(delay)
+            delay = min(delay * 2, self.max_reconnect_delay)
+
+
+@lru_cache(maxsize=None)
+def get_backend():
+    backend_class = import_string(getattr(settings, "JOB_LIVE_BACKEND", "jobs.live.LocalBackend"))
+    return backend_class(broadcaster)
+
+
+def job_event(job_id, created=False, using="default"):
+    """The event for a saved job: its list payload, or ``removed`` if it is no longer active."""
+    from .models import Job
+    from .serializers import JobListFastSerializer
+
+    row = Job.objects.using(using).filter(pk=job_id).values(
+        *JobListFastSerializer.values, "is_active", "category__slug"
+    ).first()
+    if row is None or not row["is_active"]:
+        return removed_event(job_id)
+    return {
+        "type": "created" if created else "updated",
+        "category": row["category__slug"],
+        "job": JobListFastSerializer([row]).data[0],
+    }
+
+
+def removed_event(job_id):
+    return {"type": "removed", "job": {"id": job_id}}
+
+
+def publish_job(job_id, created=False, removed=False, using="default"):
+    """Publish the event for a job change; called once the change has committed."""
+    backend = get_backend()
+    if not backend.wants_events():
+        return
+    try:
+        backend.publish(removed_event(job_id) if removed else job_event(job_id, created, using))
+    except Exception:
+        # Live updates are best effort; the change itself has committed
+        logger.warning("Could not publish a live job event", exc_info=True)
+
+
+def subscribe(params):
+    """A new ``Subscription`` for the filters in ``params``, registered with the broadcaster."""
+    get_backend().start()
+    subscription = Subscription.from_params(params)
+    broadcaster.subscribe(subscription)
+    return subscription
+
+
+def sse_message(event):
+    return f"event: {event['type']}\ndata: {json.dumps(event['job'])}\n\n"
+
+
+async def sse_events(subscription):
+    """Server-Sent Events for ``subscription``, with a comment line as keep-alive."""
+    try:
+        yield "retry: 5000\n\n"
+        while True:
+            try:
+                event = await subscription.next_event(heartbeat_seconds())
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+            if event is None:
+                break
+            yield sse_message(event)
+    finally:
+        broadcaster.unsubscribe(subscription)
+
+
+WEBSOCKET_PATH = "/ws/jobs/"
+
+
+async def websocket_application(scope, receive, send):
+    """ASGI application for ``/ws/jobs/``: every event is sent as ``{"type", "job"}`` JSON text."""
+    from django.http import QueryDict
+
+    if scope["path"] != WEBSOCKET_PATH:
+        await send({"type": "websocket.close", "code": 4404})
+        return
+    message = await receive()
+    if message["type"] != "websocket.connect":
+        return
+    subscription = subscribe(QueryDict(scope.get("query_string", b"").decode()))
+    await send({"type": "websocket.accept"})
+
+    incoming = asyncio.ensure_future(receive())
+    outgoing = asyncio.ensure_future(subscription.next_event())
+    try:
+        while True:
+            done, _ = await asyncio.wait({incoming, outgoing}, return_when=asyncio.FIRST_COMPLETED)
+            if incoming in done:
+                if incoming.result()["type"] == "websocket.disconnect":
+                    break
+                # Anything the client sends is ignored
+                incoming = asyncio.ensure_future(receive())
+            if outgoing in done:
+                event = outgoing.result()
+                if event is None:
+                    # 1013: try again later (the client fell too far behind)
+                    await send({"type": "websocket.close", "code": 1013})
+                    break
+                await send({"type": "websocket.send", "text": json.dumps({"type": event["type"], "job": event["job"]})})
+                outgoing = asyncio.ensure_future(subscription.next_event())
+    finally:
+        incoming.cancel()
+        outgoing.cancel()
+        broadcaster.unsubscribe(subscription)
@@ -0,0 +1,83 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.template import Context, Template
+
+from jobs.models import Job
+from jobs.serializers import JobListSerializer, JobSerializer
+
+# The display parts of a home page job card, computing the values on each
+# render (before) and reading them from Job.display (after)
+CARD_BEFORE = Template(
+    '{% for job in jobs %}{{ job.get_experience_level_display }}'
+    '{% if job.salary_range != "Salary not specified" %}{{ job.salary_range }}{% endif %}'
+    '{% for skill in job.skills_list|slice:":3" %}{{ skill }}{% endfor %}'
+    '{% if job.skills_list|length > 3 %}+{{ job.skills_list|length|add:"-3" }}{% endif %}{% endfor %}'
+)
+CARD_AFTER = Template(
+    '{% for job in jobs %}{{ job.display_values.experience_display }}'
+    '{% if job.display_values.salary_range != "Salary not specified" %}{{ job.display_values.salary_range }}{% endif %}'
+    '{% for skill in job.display_values.skills|slice:":3" %}{{ skill }}{% endfor %}'
+    '{% if job.display_values.skills|length > 3 %}+{{ job.display_values.skills|length|add:"-3" }}{% endif %}{% endfor %}'
+)
+
+
+class Command(BaseCommand):
+    help = 'Compare per-row render cost of computed and precomputed (Job.display) job display values'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=500, help='Jobs rendered per run')
+        parser.add_argument('--repeat', type=int, default=20, help='Timed runs per renderer and path')
+
+    def load(self, rows, precomputed):
+        jobs = list(
+            Job.objects.filter(is_active=True).select_related('company', 'category')
+            .prefetch_related('job_skills__skill').defer('search_vector')[:rows]
+        )
+        if not precomputed:
+            for job in jobs:
+                job.display = {}
+        return jobs
+
+    def time_render(self, render, jobs, repeat):
+        best = None
+        for _ in range(repeat):
+            for job in jobs:
+                # Values cached on the instance would hide the per-render cost
+                job.__dict__.pop('display_values', None)
+                job.__dict__.pop('skills_list', None)
+            started = time.perf_counter()
+            render(jobs)
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+        return best
+
+    def handle(self, *args, **options):
+        before_jobs = self.load(options['rows'], precomputed=False)
+        after_jobs = self.load(options['rows'], precomputed=True)
+        if not after_jobs:
+            raise CommandError('No active jobs to render')
+        if any(not job.display for job in after_jobs):
+            raise CommandError('Some jobs have no display values yet; run rebuild_job_display first')
+
+        def serialize(serializer_class):
+            # Serializers read display_values, which computes the values when display is empty
+            return lambda jobs: serializer_class(jobs, many=True).data
+
+        renderers = [
+            ('JobListSerializer', serialize(JobListSerializer), serialize(JobListSerializer)),
+            ('JobSerializer', serialize(JobSerializer), serialize(JobSerializer)),
+            ('home.html card', lambda jobs: CARD_BEFORE.render(Context({'jobs': jobs})),
+             lambda jobs: CARD_AFTER.render(Context({'jobs': jobs}))),
+        ]
+        count = len(after_jobs)
+        for name, before_render, after_render in renderers:
+            if before_render(before_jobs) != after_render(after_jobs):
+                raise CommandError(f'{name}: precomputed output differs from computed output')
+            before = self.time_render(before_render, before_jobs, options['repeat'])
+            after = self.time_render(after_render, after_jobs, options['repeat'])
+            self.stdout.write(
+                f'{name:<18} computed {before / count * 1e6:.1f} us/row, '
+                f'precomputed {after / count * 1e6:.1f} us/row, {before / after:.1f}x'
+            )
+        self.stdout.write(self.style.SUCCESS(f'{count} rows, outputs identical'))
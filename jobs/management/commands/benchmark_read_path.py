@@ -0,0 +1,137 @@
+import math
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand, CommandError
+
+from jobs.models import Job
+
+DEFAULT_PATHS = [
+    '/',
+    '/api/jobs/',
+    '/api/jobs/?page=2',
+    '/api/jobs/{job}/',
+    '/api/categories/',
+    '/api/companies/',
+]
+
+
+def percentile(latencies, p):
+    """Nearest-rank percentile of sorted ``latencies``."""
+    if not latencies:
+        return None
+    return latencies[max(math.ceil(p / 100 * len(latencies)) - 1, 0)]
+
+
+class Command(BaseCommand):
+    help = (
+        'Load test the public read path of running servers: the same requests at each concurrency '
+        'level against every target, with throughput and latency percentiles. To compare WSGI and '
+        'ASGI at equal worker counts, start e.g. '
+        '"gunicorn jobportal.wsgi:application --workers 4 --bind 127.0.0.1:8001" and '
+        '"ASYNC_READ_VIEWS=true uvicorn jobportal.asgi:application --workers 4 --port 8002" on the same '
+        'database, then pass --target wsgi=http://127.0.0.1:8001 --target asgi=http://127.0.0.1:8002'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--target', action='append', required=True, metavar='NAME=URL',
+            help='Server to test, e.g. asgi=http://127.0.0.1:8002; repeat to compare several',
+        )
+        parser.add_argument(
+            '--path', action='append', dest='paths',
+            help='Path to request, {job} standing for the newest active job; repeatable (default: home, '
+                 'job list, page 2, job detail, categories, companies)',
+        )
+        parser.add_argument('--concurrency', default='10,50,200', help='Comma-separated numbers of concurrent clients')
+        parser.add_argument('--requests', type=int, default=1000, help='Requests per target and concurrency level')
+        parser.add_argument('--warmup', type=int, default=50, help='Untimed requests per target before each level')
+        parser.add_argument('--timeout', type=float, default=30, help='Seconds before a request counts as failed')
+
+    def handle(self, *args, **options):
+        targets = []
+        for target in options['target']:
+            name, _, url = target.partition('=')
+            if not url:
+                raise CommandError(f'--target must be NAME=URL, not {target!r}')
+            targets.append((name, url.rstrip('/')))
+        try:
+            levels = [int(level) for level in options['concurrency'].split(',')]
+        except ValueError:
+            raise CommandError('--concurrency must be comma-separated integers')
+
+        job = Job.objects.filter(is_active=True).order_by('-created_at').values_list('pk', flat=True).first()
+        paths = [path.replace('{job}', str(job)) for path in options['paths'] or DEFAULT_PATHS]
+        # No proxies from the environment between the client and the servers
+        self.opener = urllib.request.build_opener(urllib.request.ProxyHandler({}))
+        self.timeout = options['timeout']
+        self.verbosity = options['verbosity']
+
+        for level in levels:
+            self.stdout.write(f'Concurrency {level}, {options["requests"]} requests over {len(paths)} paths:')
+            for name, base in targets:
+                self.run(base, paths, level, options['warmup'])
+                results = self.run(base, paths, level, options['requests'])
+                self.report(name, results)
+
+    def fetch(self, url):
+        started = time.perf_counter()
+        try:
+            with self.opener.open(url, timeout=self.timeout) as response:
+                response.read()
+                ok = response.status < 400
+        except (OSError, urllib.error.URLError):
+            ok = False
+        return time.perf_counter() - started, ok
+
+    def run(self, base, paths, concurrency, count):
+        """Send ``count`` requests, cycling through ``paths``, from ``concurrency`` clients."""
+        lock = threading.Lock()
+        sent = iter(range(count))
+        results = defaultdict(list)
+        errors = defaultdict(int)
+
+        def client():
+            while True:
+                with lock:
+                    number = next(sent, None)
+                if number is None:
+                    return
+                path = paths[number % len(paths)]
+                elapsed, ok = self.fetch(base + path)
+                with lock:
+                    if ok:
+                        results[path].append(elapsed)
+                    else:
+                        errors[path] += 1
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(concurrency) as pool:
+            for _ in range(concurrency):
+                pool.submit(client)
+        return {'elapsed': time.perf_counter() - started, 'latencies': results, 'errors': errors}
+
+    def report(self, name, results):
+        latencies = sorted(elapsed for path in results['latencies'].values() for elapsed in path)
+        errors = sum(results['errors'].values())
+        if not latencies:
+            self.stdout.write(self.style.ERROR(f'  {name:>8}: all {errors} requests failed'))
+            return
+        self.stdout.write(
+            f'  {name:>8}: {len(latencies) / results["elapsed"]:,.0f} req/s, '
+            f'p50 {percentile(latencies, 50) * 1000:.0f} ms, '
+            f'p99 {percentile(latencies, 99) * 1000:.0f} ms, '
+            f'max {latencies[-1] * 1000:.0f} ms, '
+            f'{errors} errors'
+        )
+        if self.verbosity > 1:
+            for path, path_latencies in results['latencies'].items():
+                path_latencies.sort()
+                self.stdout.write(
+                    f'            {path}: p50 {percentile(path_latencies, 50) * 1000:.0f} ms, '
+                    f'p99 {percentile(path_latencies, 99) * 1000:.0f} ms, {results["errors"][path]} errors'
+                )
@@ -0,0 +1,93 @@
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections, transaction
+from django.http import HttpRequest, QueryDict
+from django.utils import timezone
+
+from jobs import views
+from jobs.api_views import JobViewSet
+from jobs.models import Job
+from jobs.pagination import encode_cursor, keyset_query
+
+
+class Command(BaseCommand):
+    help = 'EXPLAIN the query shapes of the listing views and check each uses its index'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default='default', help='Database alias to check')
+        parser.add_argument('--verbose-plans', action='store_true', help='Print every query plan')
+
+    def api_queryset(self, viewset_class, params=''):
+        """The filtered queryset ``viewset_class``'s list action runs for ``?params``."""
+        request = HttpRequest()
+        request.method = 'GET'
+        request.GET = QueryDict(params)
+        view = viewset_class(action_map={'get': 'list'}, args=(), kwargs={}, format_kwarg=None)
+        view.request = view.initialize_request(request)
+        return view.filter_queryset(view.get_queryset())
+
+    def query_shapes(self):
+        """
+        (description, queryset, expected indexes) for each view query, built
+        by the views' own code; a plan using any one of the indexes passes.
+        """
+        user = User(pk=1)
+        job = Job(pk=1)
+        # A position inside the listing, as the "Next" links carry
+        cursor = encode_cursor({'created_at': timezone.now(), 'id': 1})
+        home = views.home_jobs(QueryDict())[2]
+        api = self.api_queryset(JobViewSet)
+        return [
+            ('home: first page', home[:12], ['job_active_recent_idx']),
+            ('home: next page (cursor)', keyset_query(home, cursor, 12)[0], ['job_active_recent_idx']),
+            ('jobs API: first page', api[:12], ['job_active_recent_idx']),
+            (
+                'jobs API: next page (cursor)',
+                keyset_query(self.api_queryset(JobViewSet, 'pagination=cursor'), cursor, 12)[0],
+                ['job_active_recent_idx'],
+            ),
+            ("employer_dashboard: employer's jobs", views.employer_jobs(user)[:20], ['job_posted_by_recent_idx']),
+            (
+                # All statuses: any index on the job finds its applications,
+                # which are then sorted (a job has few)
+                'job_applications: all applications of a job',
+                views.job_application_list(job)[:10],
+                ['application_job_status_idx', 'jobs_application_job_id'],
+            ),
+            (
+                'job_applications: applications by status',
+                views.job_application_list(job, 'pending')[:10],
+                ['application_job_status_idx'],
+            ),
+            ('my_applications: applicant history', views.applicant_applications(user)[:10], ['application_applicant_idx']),
+            ('saved_jobs: saved jobs of a user', views.user_saved_jobs(user)[:10], ['savedjob_user_recent_idx']),
+        ]
+
+    def handle(self, *args, **options):
+        using = options['database']
+        connection = connections[using]
+        failures = []
+
+        with transaction.atomic(using=using):
+            if connection.vendor == 'postgresql':
+                # Tiny development tables make sequential scans cheapest;
+                # this check is about whether the index can serve the query
+                with connection.cursor() as cursor:
+                    cursor.execute('SET LOCAL enable_seqscan = off')
+
+            for description, queryset, indexes in self.query_shapes():
+                queryset = queryset.using(using)
+                plan = queryset.explain()
+                if options['verbose_plans']:
+                    self.stdout.write(f'{description}\n{queryset.query}\n{plan}\n')
+                used = [index for index in indexes if index in plan]
+                if used:
+                    self.stdout.write(self.style.SUCCESS(f'✅ {description}: {used[0]}'))
+                else:
+                    failures.append(description)
+                    self.stdout.write(self.style.ERROR(
+                        f"❌ {description}: {' or '.join(indexes)} not used\n{queryset.query}\n{plan}"
+                    ))
+
+        if failures:
+            raise CommandError(f'{len(failures)} query shape(s) do not use their index')
@@ -0,0 +1,24 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from jobs.changes import retention_days
+from jobs.models import JobTombstone
+
+
+class Command(BaseCommand):
+    help = 'Delete deleted-job tombstones older than the delta sync retention period'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default='default', help='Database alias to prune')
+        parser.add_argument(
+            '--days', type=int, default=None,
+            help='Keep tombstones this many days (default: JOB_TOMBSTONE_RETENTION_DAYS)',
+        )
+
+    def handle(self, *args, **options):
+        days = options['days'] if options['days'] is not None else retention_days()
+        cutoff = timezone.now() - timedelta(days=days)
+        deleted, _ = JobTombstone.objects.using(options['database']).filter(deleted_at__lt=cutoff).delete()
+        self.stdout.write(self.style.SUCCESS(f'Deleted {deleted} tombstones older than {days} days'))
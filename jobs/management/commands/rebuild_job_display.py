@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+
+from jobs.models import Job
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the precomputed display values of jobs (Job.display), in batches'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default='default', help='Database alias to repair')
+        parser.add_argument('--batch-size', type=int, default=500, help='Jobs rebuilt per batch')
+
+    def handle(self, *args, **options):
+        using = options['database']
+        batch_size = options['batch_size']
+        jobs = Job.objects.using(using).order_by('pk')
+
+        checked = rebuilt = 0
+        last_pk = 0
+        while True:
+            batch = list(jobs.filter(pk__gt=last_pk).values_list('pk', flat=True)[:batch_size])
+            if not batch:
+                break
+            batch_checked, batch_rebuilt = Job.rebuild_display(jobs.filter(pk__in=batch))
+            checked += batch_checked
+            rebuilt += batch_rebuilt
+            last_pk = batch[-1]
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Checked {checked} jobs, rebuilt display values of {rebuilt}'
+        ))
@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+
+from jobs.dashboard import recount_employer_stats
+from jobs.models import EmployerStats
+
+
+class Command(BaseCommand):
+    help = 'Recompute the employer dashboard rollup rows from jobs and applications, in batches'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default='default', help='Database alias to repair')
+        parser.add_argument('--batch-size', type=int, default=100, help='Employers checked per batch')
+
+    def handle(self, *args, **options):
+        using = options['database']
+        batch_size = options['batch_size']
+        rows = EmployerStats.objects.using(using).order_by('pk')
+
+        checked = repaired = 0
+        last_pk = 0
+        while True:
+            batch = list(rows.filter(pk__gt=last_pk).values_list('pk', flat=True)[:batch_size])
+            if not batch:
+                break
+            repaired += recount_employer_stats(batch, using)
+            checked += len(batch)
+            last_pk = batch[-1]
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Checked {checked} employers, repaired stats of {repaired}'
+        ))
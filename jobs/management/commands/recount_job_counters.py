@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+
+from jobs.models import Job
+
+
+class Command(BaseCommand):
+    help = 'Recompute the denormalized application and saved counts of jobs, in batches'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default='default', help='Database alias to repair')
+        parser.add_argument('--batch-size', type=int, default=1000, help='Jobs checked per query')
+
+    def handle(self, *args, **options):
+        using = options['database']
+        batch_size = options['batch_size']
+        jobs = Job.objects.using(using).order_by('pk')
+
+        checked = repaired = 0
+        last_pk = 0
+        while True:
+            # Walk the table by primary key so each batch is an index range scan
+            batch = list(jobs.filter(pk__gt=last_pk).values_list('pk', flat=True)[:batch_size])
+            if not batch:
+                break
+            repaired += Job.recount_counters(jobs.filter(pk__in=batch))
+            checked += len(batch)
+            last_pk = batch[-1]
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Checked {checked} jobs, repaired counters of {repaired}'
+        ))
@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+
+from jobs.analytics import ROLLUP_SOURCES, rollup
+
+
+class Command(BaseCommand):
+    help = 'Add saves and applications made since the last run to the daily per-job stats'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default='default', help='Database alias to roll up')
+        parser.add_argument('--batch-size', type=int, default=5000, help='Source rows per transaction')
+        parser.add_argument(
+            '--lag', type=int, default=60,
+            help='Leave rows younger than this many seconds for the next run',
+        )
+
+    def handle(self, *args, **options):
+        for name in ROLLUP_SOURCES:
+            count = rollup(
+                name,
+                using=options['database'],
+                lag=options['lag'],
+                batch_size=options['batch_size'],
+            )
+            self.stdout.write(self.style.SUCCESS(f'Rolled up {count} {name.replace("_", " ")}'))
@@ -0,0 +1,48 @@
+# Generated by Django 5.2.7 on 2026-10-18 12:24
+
+import django.contrib.postgres.search
+from django.db import migrations
+
+SEARCH_VECTOR_SQL = """
+UPDATE jobs_job SET search_vector =
+    setweight(to_tsvector('english', coalesce(jobs_job.title, '')), 'A') ||
+    setweight(to_tsvector('english', coalesce(jobs_job.skills_required, '')), 'B') ||
+    setweight(to_tsvector('english', coalesce(jobs_company.name, '')), 'C') ||
+    setweight(to_tsvector('english', coalesce(jobs_job.description, '')), 'D')
+FROM jobs_company
+WHERE jobs_company.id = jobs_job.company_id
+"""
+
+
+def create_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute(SEARCH_VECTOR_SQL)
+    schema_editor.execute(
+        "CREATE INDEX IF NOT EXISTS jobs_job_search_vector_gin "
+        "ON jobs_job USING gin (search_vector)"
+    )
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute("DROP INDEX IF EXISTS jobs_job_search_vector_gin")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("jobs", "0002_faq_testimonial_remove_job_salary_application_status_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="job",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                editable=False, null=True
+            ),
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 5.2.7 on 2026-10-18 12:30
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("jobs", "0004_trigram_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Skill",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("name", models.CharField(max_length=100)),
+                ("key", models.CharField(max_length=100, unique=True)),
+            ],
+            options={
+                "ordering": ["name"],
+            },
+        ),
+        migrations.CreateModel(
+            name="JobSkill",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("position", models.PositiveSmallIntegerField(default=0)),
+                ("job", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name="job_skills", to="jobs.job")),
+                ("skill", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name="job_skills", to="jobs.skill")),
+            ],
+            options={
+                "ordering": ["position"],
+            },
+        ),
+        migrations.AddField(
+            model_name="job",
+            name="skills",
+            field=models.ManyToManyField(blank=True, related_name="jobs", through="jobs.JobSkill", to="jobs.skill"),
+        ),
+        migrations.AddIndex(
+            model_name="jobskill",
+            index=models.Index(fields=["skill", "job"], name="jobskill_skill_job_idx"),
+        ),
+        migrations.AlterUniqueTogether(
+            name="jobskill",
+            unique_together={("job", "skill")},
+        ),
+    ]
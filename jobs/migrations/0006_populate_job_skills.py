@@ -0,0 +1,52 @@
+from django.db import migrations
+
+
+def populate_job_skills(apps, schema_editor):
+    Job = apps.get_model("jobs", "Job")
+    Skill = apps.get_model("jobs", "Skill")
+    JobSkill = apps.get_model("jobs", "JobSkill")
+
+    # Same rules as Job.parse_skills / Skill.normalize
+    job_skill_names = {}
+    names = {}
+    for job_id, skills_required in Job.objects.values_list("id", "skills_required").iterator():
+        keys = []
+        for name in (skills_required or "").split(","):
+            name = name.strip()[:100].strip()
+            key = name.lower()
+            if name and key not in keys:
+                keys.append(key)
+                names.setdefault(key, name)
+        job_skill_names[job_id] = keys
+
+    Skill.objects.bulk_create(
+        [Skill(name=name, key=key) for key, name in names.items()],
+        ignore_conflicts=True,
+        batch_size=500,
+    )
+    skill_ids = dict(Skill.objects.values_list("key", "id"))
+    JobSkill.objects.bulk_create(
+        [
+            JobSkill(job_id=job_id, skill_id=skill_ids[key], position=position)
+            for job_id, keys in job_skill_names.items()
+            for position, key in enumerate(keys)
+        ],
+        ignore_conflicts=True,
+        batch_size=1000,
+    )
+
+
+def clear_job_skills(apps, schema_editor):
+    apps.get_model("jobs", "JobSkill").objects.all().delete()
+    apps.get_model("jobs", "Skill").objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("jobs", "0005_skill"),
+    ]
+
+    operations = [
+        migrations.RunPython(populate_job_skills, clear_job_skills),
+    ]
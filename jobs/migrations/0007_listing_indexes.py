@@ -0,0 +1,53 @@
+# Generated by Django 5.2.7 on 2026-10-18 12:35
+
+from django.conf import settings
+from django.db import migrations, models
+
+from jobs.migration_operations import AddIndexConcurrentlyOnPostgres
+
+
+class Migration(migrations.Migration):
+
+    # Concurrent index builds cannot run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ("jobs", "0006_populate_job_skills"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        AddIndexConcurrentlyOnPostgres(
+            model_name="application",
+            index=models.Index(
+                fields=["job", "status", "-created_at"],
+                name="application_job_status_idx",
+            ),
+        ),
+        AddIndexConcurrentlyOnPostgres(
+            model_name="application",
+            index=models.Index(
+                fields=["applicant", "-created_at"], name="application_applicant_idx"
+            ),
+        ),
+        AddIndexConcurrentlyOnPostgres(
+            model_name="job",
+            index=models.Index(
+                condition=models.Q(("is_active", True)),
+                fields=["-created_at", "-id"],
+                name="job_active_recent_idx",
+            ),
+        ),
+        AddIndexConcurrentlyOnPostgres(
+            model_name="job",
+            index=models.Index(
+                fields=["posted_by", "-created_at"], name="job_posted_by_recent_idx"
+            ),
+        ),
+        AddIndexConcurrentlyOnPostgres(
+            model_name="savedjob",
+            index=models.Index(
+                fields=["user", "-created_at"], name="savedjob_user_recent_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.7 on 2026-10-18 12:36
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def populate_job_counters(apps, schema_editor):
+    Job = apps.get_model("jobs", "Job")
+    Application = apps.get_model("jobs", "Application")
+    SavedJob = apps.get_model("jobs", "SavedJob")
+
+    # Same expressions as Job.counter_expressions
+    def count(model):
+        rows = model.objects.filter(job=OuterRef("pk")).order_by().values("job")
+        return Coalesce(Subquery(rows.annotate(n=Count("pk")).values("n")), 0)
+
+    Job.objects.update(application_count=count(Application), saved_count=count(SavedJob))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("jobs", "0007_listing_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="job",
+            name="application_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="job",
+            name="saved_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(populate_job_counters, migrations.RunPython.noop),
+    ]
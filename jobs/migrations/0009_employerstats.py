@@ -0,0 +1,34 @@
+# Generated by Django 5.2.7 on 2026-10-18 12:38
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("auth", "0012_alter_user_first_name_max_length"),
+        ("jobs", "0008_job_counters"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="EmployerStats",
+            fields=[
+                ("employer", models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name="employer_stats", serialize=False, to=settings.AUTH_USER_MODEL)),
+                ("total_jobs", models.PositiveIntegerField(default=0)),
+                ("active_jobs", models.PositiveIntegerField(default=0)),
+                ("total_applications", models.PositiveIntegerField(default=0)),
+                ("pending", models.PositiveIntegerField(default=0)),
+                ("reviewed", models.PositiveIntegerField(default=0)),
+                ("shortlisted", models.PositiveIntegerField(default=0)),
+                ("rejected", models.PositiveIntegerField(default=0)),
+                ("hired", models.PositiveIntegerField(default=0)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "verbose_name_plural": "Employer stats",
+            },
+        ),
+    ]
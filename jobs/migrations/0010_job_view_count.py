@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-18 12:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("jobs", "0009_employerstats"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="job",
+            name="view_count",
+            field=models.PositiveBigIntegerField(default=0, editable=False),
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.7 on 2026-10-18 12:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("jobs", "0010_job_view_count"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RollupWatermark",
+            fields=[
+                ("name", models.CharField(max_length=50, primary_key=True, serialize=False)),
+                ("position", models.BigIntegerField(default=0)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name="JobDailyStats",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("date", models.DateField()),
+                ("views", models.PositiveIntegerField(default=0)),
+                ("saves", models.PositiveIntegerField(default=0)),
+                ("applications", models.PositiveIntegerField(default=0)),
+                ("job", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name="daily_stats", to="jobs.job")),
+            ],
+            options={
+                "verbose_name_plural": "Job daily stats",
+                "ordering": ["job", "date"],
+                "unique_together": {("job", "date")},
+            },
+        ),
+    ]
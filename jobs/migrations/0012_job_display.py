@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-18 12:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("jobs", "0011_job_daily_stats"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="job",
+            name="display",
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
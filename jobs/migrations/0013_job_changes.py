@@ -0,0 +1,32 @@
+# Generated by Django 5.2.7 on 2026-10-18 12:56
+
+from django.conf import settings
+from django.db import migrations, models
+
+from jobs.migration_operations import AddIndexConcurrentlyOnPostgres
+
+
+class Migration(migrations.Migration):
+
+    # Concurrent index builds cannot run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ("jobs", "0012_job_display"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="JobTombstone",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("job_id", models.PositiveBigIntegerField()),
+                ("deleted_at", models.DateTimeField(auto_now_add=True, db_index=True)),
+            ],
+        ),
+        AddIndexConcurrentlyOnPostgres(
+            model_name="job",
+            index=models.Index(fields=["updated_at", "id"], name="job_updated_idx"),
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.7 on 2026-10-18 13:19
+
+from django.db import migrations, models
+
+
+def populate_labels(apps, schema_editor):
+    Job = apps.get_model("jobs", "Job")
+    JobSkill = apps.get_model("jobs", "JobSkill")
+
+    # Same rules as Job.parse_skills
+    for job in Job.objects.only("id", "skills_required", "display").iterator():
+        labels = []
+        keys = set()
+        for name in (job.skills_required or "").split(","):
+            name = name.strip()[:100].strip()
+            if name and name.lower() not in keys:
+                keys.add(name.lower())
+                labels.append(name)
+        job_skills = list(JobSkill.objects.filter(job_id=job.id).order_by("position"))
+        for job_skill in job_skills:
+            if job_skill.position < len(labels):
+                job_skill.label = labels[job_skill.position]
+        JobSkill.objects.bulk_update(job_skills, ["label"])
+        # The stored display values showed the canonical spellings
+        if job.display:
+            job.display["skills"] = [job_skill.label for job_skill in job_skills]
+            Job.objects.filter(pk=job.id).update(display=job.display)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("jobs", "0013_job_changes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="jobskill",
+            name="label",
+            field=models.CharField(blank=True, max_length=100),
+        ),
+        migrations.RunPython(populate_labels, migrations.RunPython.noop),
+    ]
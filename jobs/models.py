@@ -1,5 +1,28 @@
-from django.db import models
+from django.conf import settings
+from django.db import models, transaction
+from django.db.models import Count, F, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce, Greatest
 from django.contrib.auth.models import User
+from django.utils import timezone
+from django.utils.functional import cached_property
+from django.contrib.postgres.search import SearchVectorField
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from .cache import bump_listing_version, purge_tags
+from .live import publish_job
+from .refdata import bump_reference_version, reference_table
+from .search import loaded_search_index, update_search_vectors
+
+
+# Short experience labels shown on job cards and in the API
+EXPERIENCE_LABELS = {
+    "entry": "0-1 Yrs",
+    "junior": "1-3 Yrs",
+    "mid": "3-5 Yrs",
+    "senior": "5-8 Yrs",
+    "lead": "8+ Yrs",
+}
 
 
 class Company(models.Model):
@@ -20,6 +43,27 @@ class Category(models.Model):
         return self.name
 
 
+# Longest skill name kept; longer skills_required entries are cut to it
+SKILL_NAME_MAX_LENGTH = 100
+
+
+class Skill(models.Model):
+    # First spelling seen; jobs show their own (JobSkill.label)
+    name = models.CharField(max_length=SKILL_NAME_MAX_LENGTH)
+    # Case-folded name; what skill filters match against
+    key = models.CharField(max_length=SKILL_NAME_MAX_LENGTH, unique=True)
+
+    class Meta:
+        ordering = ["name"]
+
+    def __str__(self) -> str:
+        return self.name
+
+    @staticmethod
+    def normalize(name):
+        return name.strip().lower()
+
+
 class Job(models.Model):
     EMPLOYMENT_TYPE_CHOICES = [
         ('full_time', 'Full Time'),
@@ -55,6 +99,8 @@ class Job(models.Model):
     work_mode = models.CharField(max_length=20, choices=WORK_MODE_CHOICES, default='onsite')
     experience_level = models.CharField(max_length=20, choices=EXPERIENCE_CHOICES, default='entry')
     skills_required = models.CharField(max_length=500, blank=True, help_text="Comma-separated skills")
+    # Normalized copy of skills_required, kept in sync on save
+    skills = models.ManyToManyField(Skill, through="JobSkill", related_name="jobs", blank=True)
     company = models.ForeignKey(Company, on_delete=models.CASCADE, related_name="jobs")
     category = models.ForeignKey(Category, on_delete=models.SET_NULL, null=True, related_name="jobs")
     posted_by = models.ForeignKey(User, on_delete=models.CASCADE, related_name="posted_jobs")
@@ -62,12 +108,58 @@ class Job(models.Model):
     application_deadline = models.DateField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    # Weighted full-text document, maintained on PostgreSQL only (see jobs.search)
+    search_vector = SearchVectorField(null=True, editable=False)
+    # Denormalized counts, kept up to date by the Application/SavedJob
+    # signal receivers; repair with the recount_job_counters command
+    application_count = models.PositiveIntegerField(default=0, editable=False)
+    saved_count = models.PositiveIntegerField(default=0, editable=False)
+    # Written in batches by jobs.viewcounter, so it may lag a few seconds behind
+    view_count = models.PositiveBigIntegerField(default=0, editable=False)
+    # Formatted salary, experience, date and skills (see build_display),
+    # rebuilt on save; repair with the rebuild_job_display command
+    display = models.JSONField(default=dict, blank=True, editable=False)
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            # Listings and keyset pagination: active jobs, newest first
+            models.Index(
+                fields=["-created_at", "-id"],
+                condition=models.Q(is_active=True),
+                name="job_active_recent_idx",
+            ),
+            # Employer dashboard: an employer's jobs, newest first
+            models.Index(fields=["posted_by", "-created_at"], name="job_posted_by_recent_idx"),
+            # Delta sync: jobs changed since a cursor (see jobs.changes)
+            models.Index(fields=["updated_at", "id"], name="job_updated_idx"),
+        ]
+
+    # Written with QuerySet.update() only (counter receivers, jobs.viewcounter,
+    # refresh_display), so saving an instance loaded earlier must not write
+    # back the values it was loaded with
+    DENORMALIZED_FIELDS = ("application_count", "saved_count", "view_count", "display")
 
     def __str__(self) -> str:
         return self.title
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding and not kwargs.get("force_insert") and kwargs.get("update_fields") is None:
+            deferred = self.get_deferred_fields()
+            kwargs["update_fields"] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key
+                and field.name not in self.DENORMALIZED_FIELDS
+                and field.attname not in deferred
+            ]
+        super().save(*args, **kwargs)
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Stored value, so receivers can tell when a job is (de)activated
+        instance._loaded_is_active = dict(zip(field_names, values)).get("is_active")
+        return instance
     
     @property
     def salary_range(self):
@@ -77,11 +169,160 @@ class Job(models.Model):
             return f"{self.salary_currency} {self.salary_min:,}+"
         return "Salary not specified"
     
-    @property
+    @staticmethod
+    def format_salary(salary_min, salary_max, open_ended=True):
+        """Compact salary such as "80K-100K" (or "80K+" when ``open_ended``)."""
+        if salary_min and salary_max:
+            return f"{salary_min//1000}K-{salary_max//1000}K"
+        elif salary_min and open_ended:
+            return f"{salary_min//1000}K+"
+        return "Not specified"
+
+    # What build_display reads, besides the job's JobSkill rows (whose
+    # labels, or Skill names, are its skills). Code changing any of these
+    # with QuerySet.update() must call rebuild_display on the same jobs.
+    DISPLAY_SOURCE_FIELDS = (
+        "salary_min", "salary_max", "salary_currency", "experience_level", "created_at", "skills_required",
+    )
+
+    def build_display(self, skills=None):
+        """
+        The display values stored in ``display``, computed from the
+        ``DISPLAY_SOURCE_FIELDS``; ``skills`` defaults to ``skills_list``.
+        """
+        return {
+            "salary_range": self.salary_range,
+            "salary": self.format_salary(self.salary_min, self.salary_max),
+            "salary_short": self.format_salary(self.salary_min, self.salary_max, open_ended=False),
+            "experience": EXPERIENCE_LABELS.get(self.experience_level, self.get_experience_level_display()),
+            "experience_display": self.get_experience_level_display(),
+            "posted_date": self.created_at.strftime("%a %b %d %Y"),
+            "skills": list(self.skills_list if skills is None else skills),
+        }
+
+    @cached_property
+    def display_values(self):
+        """``display``, or the values computed on the fly for a job saved without it."""
+        return self.display or self.build_display()
+
+    def refresh_display(self, using=None):
+        """Rebuild and store ``display`` with the job's skills as its JobSkill rows spell them."""
+        using = using or self._state.db
+        rows = self.job_skills.using(using).order_by("position").values_list("label", "skill__name")
+        display = self.build_display(skills=[label or name for label, name in rows])
+        self.__dict__.pop("display_values", None)
+        if display == self.display:
+            return False
+        self.display = display
+        # update(), so saving the job does not recurse through post_save
+        Job.objects.using(using).filter(pk=self.pk).update(display=display)
+        return True
+
+    @classmethod
+    def rebuild_display(cls, queryset):
+        """
+        Recompute ``display`` for the jobs in ``queryset`` and store the
+        values that changed, without touching ``updated_at`` or firing
+        signals; returns ``(checked, rebuilt)``.
+        """
+        jobs = list(queryset.prefetch_related("job_skills__skill").defer("search_vector"))
+        stale = []
+        for job in jobs:
+            display = job.build_display()
+            if display != job.display:
+                job.display = display
+                stale.append(job)
+        cls.objects.using(queryset.db).bulk_update(stale, ["display"])
+        return len(jobs), len(stale)
+
+    @cached_property
     def skills_list(self):
-        if self.skills_required:
-            return [skill.strip() for skill in self.skills_required.split(',')]
-        return []
+        # Use job_skills (with their skill) prefetched by the listing if present
+        prefetched = getattr(self, "_prefetched_objects_cache", {}).get("job_skills")
+        if prefetched is not None:
+            return [job_skill.label or job_skill.skill.name for job_skill in prefetched]
+        return self.parse_skills(self.skills_required)
+
+    @staticmethod
+    def parse_skills(skills_required):
+        """
+        Skill names from a comma-separated string, first spelling of each
+        kept, each cut to ``SKILL_NAME_MAX_LENGTH`` characters.
+        """
+        skills = []
+        seen = set()
+        for skill in (skills_required or "").split(","):
+            skill = skill.strip()[:SKILL_NAME_MAX_LENGTH].strip()
+            if skill and Skill.normalize(skill) not in seen:
+                seen.add(Skill.normalize(skill))
+                skills.append(skill)
+        return skills
+
+    def sync_skills(self):
+        """Make the job's JobSkill rows match ``skills_required``."""
+        names = self.parse_skills(self.skills_required)
+        keys = [Skill.normalize(name) for name in names]
+        existing = {skill.key: skill for skill in Skill.objects.filter(key__in=keys)}
+        missing = [Skill(name=name, key=key) for name, key in zip(names, keys) if key not in existing]
+        if missing:
+            Skill.objects.bulk_create(missing, ignore_conflicts=True)
+            existing.update((skill.key, skill) for skill in Skill.objects.filter(key__in=keys))
+
+        wanted = [(existing[key].pk, position, name) for position, (key, name) in enumerate(zip(keys, names))]
+        current = list(self.job_skills.values_list("skill_id", "position", "label"))
+        if current == wanted:
+            return
+        self.job_skills.all().delete()
+        JobSkill.objects.bulk_create([
+            JobSkill(job=self, skill_id=skill_id, position=position, label=label)
+            for skill_id, position, label in wanted
+        ])
+
+    @staticmethod
+    def counter_expressions():
+        """Expressions computing application_count and saved_count from the related rows."""
+        def count(model):
+            rows = model.objects.filter(job=OuterRef("pk")).order_by().values("job")
+            return Coalesce(Subquery(rows.annotate(n=Count("pk")).values("n")), 0)
+
+        return {"application_count": count(Application), "saved_count": count(SavedJob)}
+
+    @classmethod
+    def recount_counters(cls, queryset):
+        """Recompute the counters of the jobs in ``queryset`` that drifted; returns how many."""
+        counters = cls.counter_expressions()
+        stale = queryset.annotate(
+            counted_applications=counters["application_count"],
+            counted_saves=counters["saved_count"],
+        ).filter(
+            ~Q(application_count=F("counted_applications")) | ~Q(saved_count=F("counted_saves"))
+        ).values_list("pk", flat=True)
+        stale = list(stale)
+        if not stale:
+            return 0
+        updated = cls.objects.using(queryset.db).filter(pk__in=stale).update(**counters)
+        _purge_job_counter_pages(stale, queryset.db)
+        return updated
+
+
+class JobSkill(models.Model):
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name="job_skills")
+    skill = models.ForeignKey(Skill, on_delete=models.CASCADE, related_name="job_skills")
+    # Order of the skill in skills_required
+    position = models.PositiveSmallIntegerField(default=0)
+    # The skill as this job's skills_required spells it
+    label = models.CharField(max_length=SKILL_NAME_MAX_LENGTH, blank=True)
+
+    class Meta:
+        unique_together = ("job", "skill")
+        ordering = ["position"]
+        indexes = [
+            # Serves skill filters: skill_id IN (...) -> job_id
+            models.Index(fields=["skill", "job"], name="jobskill_skill_job_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.job.title}: {self.skill.name}"
 
 
 class Application(models.Model):
@@ -104,10 +345,53 @@ class Application(models.Model):
     class Meta:
         unique_together = ("job", "applicant")
         ordering = ["-created_at"]
+        indexes = [
+            # job_applications: a job's applications by status, newest first
+            models.Index(fields=["job", "status", "-created_at"], name="application_job_status_idx"),
+            # my_applications: an applicant's applications, newest first
+            models.Index(fields=["applicant", "-created_at"], name="application_applicant_idx"),
+        ]
 
     def __str__(self) -> str:
         return f"{self.applicant.username} -> {self.job.title}"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Stored status, so receivers can move the employer's per-status counts
+        instance._loaded_status = dict(zip(field_names, values)).get("status")
+        return instance
+
+    @classmethod
+    def bulk_set_status(cls, employer, application_ids, status, job=None, using="default"):
+        """
+        Set ``status`` on the applications among ``application_ids`` (for
+        ``job`` if given) that belong to ``employer``'s jobs. The ownership
+        check is part of the UPDATE's WHERE clause, so no application of
+        another employer can be changed. Returns how many changed.
+        """
+        applications = cls.objects.using(using).filter(
+            pk__in=application_ids, job__posted_by=employer
+        ).exclude(status=status)
+        if job is not None:
+            applications = applications.filter(job=job)
+        # QuerySet.update() skips auto_now and the post_save receivers
+        changes = {"status": status, "updated_at": timezone.now()}
+        if not getattr(settings, "EMPLOYER_STATS_ROLLUP", False):
+            return applications.update(**changes)
+
+        with transaction.atomic(using=using):
+            # Lock the rows first to learn which statuses are being replaced
+            locked = list(applications.select_for_update(of=("self",)).values_list("pk", "status"))
+            if not locked:
+                return 0
+            updated = cls.objects.using(using).filter(pk__in=[pk for pk, _ in locked]).update(**changes)
+            deltas = {status: len(locked)}
+            for _, previous in locked:
+                deltas[previous] = deltas.get(previous, 0) - 1
+            _adjust_employer_stats(EmployerStats.objects.filter(employer=employer), using, **deltas)
+        return updated
+
 
 class SavedJob(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="saved_jobs")
@@ -117,11 +401,74 @@ class SavedJob(models.Model):
     class Meta:
         unique_together = ("user", "job")
         ordering = ["-created_at"]
+        indexes = [
+            # saved_jobs: a user's saved jobs, newest first
+            models.Index(fields=["user", "-created_at"], name="savedjob_user_recent_idx"),
+        ]
     
     def __str__(self):
         return f"{self.user.username} saved {self.job.title}"
 
 
+class EmployerStats(models.Model):
+    """
+    Dashboard totals of one employer, adjusted on every job and application
+    change when ``EMPLOYER_STATS_ROLLUP`` is on (see jobs.dashboard).
+    """
+    employer = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name="employer_stats")
+    total_jobs = models.PositiveIntegerField(default=0)
+    active_jobs = models.PositiveIntegerField(default=0)
+    total_applications = models.PositiveIntegerField(default=0)
+    pending = models.PositiveIntegerField(default=0)
+    reviewed = models.PositiveIntegerField(default=0)
+    shortlisted = models.PositiveIntegerField(default=0)
+    rejected = models.PositiveIntegerField(default=0)
+    hired = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name_plural = "Employer stats"
+
+    def __str__(self):
+        return f"Stats for {self.employer.username}"
+
+
+class JobDailyStats(models.Model):
+    """Views, saves and applications a job received on one day (see jobs.analytics)."""
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name="daily_stats")
+    date = models.DateField()
+    views = models.PositiveIntegerField(default=0)
+    saves = models.PositiveIntegerField(default=0)
+    applications = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        unique_together = ("job", "date")
+        ordering = ["job", "date"]
+        verbose_name_plural = "Job daily stats"
+
+    def __str__(self):
+        return f"{self.job.title} on {self.date}"
+
+
+class JobTombstone(models.Model):
+    """A deleted job, reported to clients syncing changes (see jobs.changes)."""
+    job_id = models.PositiveBigIntegerField()
+    deleted_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    def __str__(self):
+        return f"Job {self.job_id} deleted {self.deleted_at}"
+
+
+class RollupWatermark(models.Model):
+    """Last source primary key a rollup has processed."""
+    name = models.CharField(max_length=50, primary_key=True)
+    position = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.name} @ {self.position}"
+
+
 class Testimonial(models.Model):
     name = models.CharField(max_length=100)
     position = models.CharField(max_length=100)
@@ -151,3 +498,215 @@ class FAQ(models.Model):
     
     def __str__(self):
         return self.question
+
+
+@receiver(post_save, sender=Job)
+def update_job_search(sender, instance, raw=False, using=None, **kwargs):
+    if raw:
+        return
+    update_search_vectors(Job.objects.using(using).filter(pk=instance.pk))
+    index = loaded_search_index(using)
+    if index is not None:
+        index.refresh([instance.pk])
+
+
+@receiver(post_save, sender=Job)
+def sync_job_skills(sender, instance, raw=False, using=None, **kwargs):
+    if raw:
+        return
+    instance.__dict__.pop("skills_list", None)
+    instance.sync_skills()
+    instance.refresh_display(using)
+
+
+@receiver(post_save, sender=Skill)
+def refresh_skill_jobs_display(sender, instance, created, raw=False, using=None, **kwargs):
+    # Jobs whose JobSkill rows have no label show the skill's name
+    if raw or created:
+        return
+    Job.rebuild_display(Job.objects.using(using).filter(job_skills__skill=instance))
+
+
+@receiver(post_delete, sender=Job)
+def record_job_tombstone(sender, instance, using=None, **kwargs):
+    # Same transaction as the delete, so the two commit or roll back together
+    JobTombstone.objects.using(using).create(job_id=instance.pk)
+
+
+@receiver(post_delete, sender=Job)
+def remove_job_from_search_index(sender, instance, using=None, **kwargs):
+    index = loaded_search_index(using)
+    if index is not None:
+        index.discard(instance.pk)
+
+
+@receiver(post_save, sender=Company)
+def update_company_jobs_search(sender, instance, created, raw=False, using=None, **kwargs):
+    if raw or created:
+        return
+    update_search_vectors(Job.objects.using(using).filter(company=instance))
+    index = loaded_search_index(using)
+    if index is not None:
+        index.refresh(instance.jobs.using(using).values_list("pk", flat=True))
+
+
+def _purge_job_counter_pages(job_ids, using):
+    # Cached anonymous pages show the counts, and update() fires no Job receivers
+    tags = ["listings", *(f"job:{job_id}" for job_id in job_ids)]
+    transaction.on_commit(lambda: purge_tags(*tags), using=using)
+
+
+def _adjust_job_counter(job_id, field, delta, using):
+    # A single UPDATE ... SET field = field + delta, so concurrent requests
+    # can't lose each other's increments
+    Job.objects.using(using).filter(pk=job_id).update(**{field: Greatest(F(field) + delta, 0)})
+    _purge_job_counter_pages([job_id], using)
+
+
+def _deleting_job_ids(origin):
+    """Ids of the jobs being deleted by the ``delete()`` call ``origin``."""
+    if origin is None:
+        return set()
+    return vars(origin).setdefault("_deleting_job_ids", set())
+
+
+@receiver(pre_delete, sender=Job)
+def mark_job_deleting(sender, instance, using=None, origin=None, **kwargs):
+    # The job's applications and saved jobs go with it: their post_delete
+    # receivers skip the counters of a row that is about to disappear
+    _deleting_job_ids(origin).add(instance.pk)
+    if getattr(settings, "EMPLOYER_STATS_ROLLUP", False):
+        # Taken off the employer's totals at once by remove_employer_job_stats
+        instance._application_statuses = dict(
+            instance.applications.using(using).order_by().values_list("status").annotate(Count("pk"))
+        )
+
+
+@receiver(post_save, sender=Application)
+@receiver(post_save, sender=SavedJob)
+def increment_job_counter(sender, instance, created, raw=False, using=None, **kwargs):
+    if raw or not created:
+        return
+    field = "application_count" if sender is Application else "saved_count"
+    _adjust_job_counter(instance.job_id, field, 1, using)
+
+
+@receiver(post_delete, sender=Application)
+@receiver(post_delete, sender=SavedJob)
+def decrement_job_counter(sender, instance, using=None, origin=None, **kwargs):
+    if instance.job_id in _deleting_job_ids(origin):
+        return
+    field = "application_count" if sender is Application else "saved_count"
+    _adjust_job_counter(instance.job_id, field, -1, using)
+
+
+def _adjust_employer_stats(stats, using, **deltas):
+    if not getattr(settings, "EMPLOYER_STATS_ROLLUP", False):
+        return
+    deltas = {field: delta for field, delta in deltas.items() if delta}
+    if deltas:
+        # Employers without a row yet are counted in full on their next dashboard view
+        stats.using(using).update(**{field: Greatest(F(field) + delta, 0) for field, delta in deltas.items()})
+
+
+@receiver(post_save, sender=Job)
+def update_employer_job_stats(sender, instance, created, raw=False, using=None, **kwargs):
+    if raw:
+        return
+    if created:
+        deltas = {"total_jobs": 1, "active_jobs": int(instance.is_active)}
+    else:
+        was_active = getattr(instance, "_loaded_is_active", None)
+        if was_active is None:
+            return
+        deltas = {"active_jobs": int(instance.is_active) - int(was_active)}
+    _adjust_employer_stats(EmployerStats.objects.filter(employer_id=instance.posted_by_id), using, **deltas)
+    instance._loaded_is_active = instance.is_active
+
+
+@receiver(post_delete, sender=Job)
+def remove_employer_job_stats(sender, instance, using=None, **kwargs):
+    was_active = getattr(instance, "_loaded_is_active", instance.is_active)
+    statuses = getattr(instance, "_application_statuses", {})
+    _adjust_employer_stats(
+        EmployerStats.objects.filter(employer_id=instance.posted_by_id),
+        using,
+        total_jobs=-1,
+        active_jobs=-int(was_active),
+        total_applications=-sum(statuses.values()),
+        **{status: -count for status, count in statuses.items()},
+    )
+
+
+@receiver(post_save, sender=Application)
+def update_employer_application_stats(sender, instance, created, raw=False, using=None, **kwargs):
+    if raw:
+        return
+    if created:
+        deltas = {"total_applications": 1, instance.status: 1}
+    else:
+        previous = getattr(instance, "_loaded_status", None)
+        if previous is None or previous == instance.status:
+            return
+        deltas = {previous: -1, instance.status: 1}
+    _adjust_employer_stats(EmployerStats.objects.filter(employer__posted_jobs=instance.job_id), using, **deltas)
+    instance._loaded_status = instance.status
+
+
+@receiver(post_delete, sender=Application)
+def remove_employer_application_stats(sender, instance, using=None, origin=None, **kwargs):
+    if instance.job_id in _deleting_job_ids(origin):
+        return
+    status = getattr(instance, "_loaded_status", None) or instance.status
+    _adjust_employer_stats(
+        EmployerStats.objects.filter(employer__posted_jobs=instance.job_id),
+        using,
+        total_applications=-1,
+        **{status: -1},
+    )
+
+
+@receiver(post_save, sender=Job)
+@receiver(post_delete, sender=Job)
+@receiver(post_save, sender=Company)
+@receiver(post_delete, sender=Company)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_job_listings(sender, instance, using=None, **kwargs):
+    # Listings depend on every job; cached pages only on the objects they tag
+    tags = ["listings", f"{sender._meta.model_name}:{instance.pk}"]
+
+    def invalidate():
+        bump_listing_version()
+        purge_tags(*tags)
+
+    transaction.on_commit(invalidate, using=using)
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Company)
+@receiver(post_delete, sender=Company)
+@receiver(post_save, sender=FAQ)
+@receiver(post_delete, sender=FAQ)
+@receiver(post_save, sender=Testimonial)
+@receiver(post_delete, sender=Testimonial)
+def invalidate_reference_data(sender, instance, using=None, **kwargs):
+    # Every process reloads the table on its next read (see jobs.refdata)
+    name = reference_table(sender)
+    transaction.on_commit(lambda: bump_reference_version(name), using=using)
+
+
+@receiver(post_save, sender=Job)
+def publish_saved_job(sender, instance, created, raw=False, using=None, **kwargs):
+    if raw:
+        return
+    pk = instance.pk
+    # After commit: subscribers see the saved row, display values included
+    transaction.on_commit(lambda: publish_job(pk, created=created, using=using), using=using)
+
+
+@receiver(post_delete, sender=Job)
+def publish_deleted_job(sender, instance, using=None, **kwargs):
+    pk = instance.pk
+    transaction.on_commit(lambda: publish_job(pk, removed=True, using=using), using=using)
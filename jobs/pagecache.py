@@ -0,0 +1,155 @@
+"""
+Full-response cache for anonymous visitors.
+
+Views wrapped in ``cache_anonymous_page`` are served from the cache for
+anonymous GET/HEAD requests, keyed by the path and the normalized query
+string. While rendering, a view names what its page depends on with
+``tag_page`` (``listings``, ``job:42``, ``company:7``...); the cached
+response records the versions of those tags and is discarded once one of
+them is purged by the model signal receivers. Hits are answered with a
+304 when the stored ETag/Last-Modified still match the request. Async
+views are wrapped the same way and tag their pages with ``atag_page``.
+"""
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+
+from django.conf import settings
+from django.contrib import messages
+from django.core.cache import cache
+from django.utils.cache import get_conditional_response
+from django.utils.http import parse_http_date_safe
+
+from .cache import _acount, _count, atag_versions, cache_stats, params_digest, tag_versions
+
+PAGE_HITS_KEY = "jobs:page:hits"
+PAGE_MISSES_KEY = "jobs:page:misses"
+
+
+def page_timeout():
+    return getattr(settings, "JOB_PAGE_CACHE_TIMEOUT", 60)
+
+
+def page_stats():
+    return cache_stats(PAGE_HITS_KEY, PAGE_MISSES_KEY)
+
+
+def tag_page(request, *tags):
+    """
+    Record that the page being rendered for ``request`` depends on
+    ``tags``. Call it before loading the data the tags stand for: their
+    versions are read now, so a purge that lands while the page renders
+    leaves the cached copy stale rather than hiding the change.
+    """
+    if not hasattr(request, "_page_cache_tags"):
+        request._page_cache_tags = {}
+    new_tags = [str(tag) for tag in tags if str(tag) not in request._page_cache_tags]
+    if new_tags:
+        request._page_cache_tags.update(tag_versions(new_tags))
+
+
+async def atag_page(request, *tags):
+    if not hasattr(request, "_page_cache_tags"):
+        request._page_cache_tags = {}
+    new_tags = [str(tag) for tag in tags if str(tag) not in request._page_cache_tags]
+    if new_tags:
+        request._page_cache_tags.update(await atag_versions(new_tags))
+
+
+def _cacheable_request(request):
+    return (
+        request.method in ("GET", "HEAD")
+        and not request.user.is_authenticated
+        # Queued flash messages have to be rendered, not served from cache
+        and not len(messages.get_messages(request))
+    )
+
+
+async def _acacheable_request(request):
+    if request.method not in ("GET", "HEAD") or (await request.auser()).is_authenticated:
+        return False
+    # Message storage may read the session, which is sync only
+    return not await sync_to_async(len)(messages.get_messages(request))
+
+
+def _page_key(namespace, request):
+    return f"jobs:page:{namespace}:{params_digest(request.GET)}:{request.path}"
+
+
+def _storable(request, response):
+    return (
+        request._page_cache_tags
+        and response.status_code == 200
+        and not response.streaming
+        and not response.cookies
+        and not request.META.get("CSRF_COOKIE_NEEDS_UPDATE")
+        and "no-store" not in response.get("Cache-Control", "")
+    )
+
+
+def _not_modified(request, response):
+    return get_conditional_response(
+        request,
+        etag=response.get("ETag"),
+        last_modified=parse_http_date_safe(response.get("Last-Modified", "")),
+        response=response,
+    )
+
+
+def cache_anonymous_page(namespace, on_hit=None):
+    """
+    Cache the responses of the decorated view for anonymous visitors.
+    ``on_hit(request, *args, **kwargs)`` runs for requests answered from
+    the cache, for side effects the view would have had (view counting).
+    """
+    def decorator(view):
+        if iscoroutinefunction(view):
+            return _async_cached_view(view, namespace, on_hit)
+
+        @wraps(view)
+        def wrapped(request, *args, **kwargs):
+            if not _cacheable_request(request):
+                return view(request, *args, **kwargs)
+
+            key = _page_key(namespace, request)
+            entry = cache.get(key)
+            if entry is not None and tag_versions(entry["tags"]) == entry["tags"]:
+                _count(PAGE_HITS_KEY)
+                if on_hit is not None:
+                    on_hit(request, *args, **kwargs)
+                return _not_modified(request, entry["response"])
+
+            _count(PAGE_MISSES_KEY)
+            request._page_cache_tags = {}
+            response = view(request, *args, **kwargs)
+            if _storable(request, response):
+                cache.set(key, {"tags": request._page_cache_tags, "response": response}, page_timeout())
+            return response
+
+        return wrapped
+
+    return decorator
+
+
+def _async_cached_view(view, namespace, on_hit):
+    @wraps(view)
+    async def wrapped(request, *args, **kwargs):
+        if not await _acacheable_request(request):
+            return await view(request, *args, **kwargs)
+
+        key = _page_key(namespace, request)
+        entry = await cache.aget(key)
+        if entry is not None and await atag_versions(entry["tags"]) == entry["tags"]:
+            await _acount(PAGE_HITS_KEY)
+            if on_hit is not None:
+                await sync_to_async(on_hit)(request, *args, **kwargs)
+            return _not_modified(request, entry["response"])
+
+        await _acount(PAGE_MISSES_KEY)
+        request._page_cache_tags = {}
+        response = await view(request, *args, **kwargs)
+        if _storable(request, response):
+            await cache.aset(key, {"tags": request._page_cache_tags, "response": response}, page_timeout())
+        return response
+
+    return wrapped
@@ -0,0 +1,317 @@
+"""
+Pagination for job listings.
+
+``ApproximateCountPaginator`` avoids exact ``COUNT(*)`` on large result
+sets. Besides cached page numbers this module provides keyset (cursor)
+pagination over
+``(created_at, id)``: a cursor names the last row of the previous page and
+the next page is read with an index range scan from there, so deep pages
+cost the same as the first one, no ``COUNT(*)`` is needed, and rows
+inserted meanwhile cannot shift items between pages.
+"""
+import base64
+import hashlib
+import json
+from collections import OrderedDict
+from datetime import datetime
+from functools import partial
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.paginator import InvalidPage, Paginator
+from django.db import connections
+from django.db.models import Q
+from django.utils.functional import cached_property
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from .cache import acached_page, alisting_key, apaginator_count, cached_page, listing_key, row_pk
+
+KEYSET_ORDERING = ("-created_at", "-pk")
+
+
+class ApproximateCountPaginator(Paginator):
+    """
+    Paginator whose ``count`` is exact up to ``threshold`` rows and an
+    estimate above it: PostgreSQL's planner row estimate, or elsewhere an
+    exact count cached for ``cache_timeout`` seconds. ``is_approximate``
+    tells templates to say "about N".
+
+    The exact part is a ``COUNT(*)`` over a ``LIMIT threshold + 1``
+    subquery, so it never reads more than ``threshold + 1`` rows.
+    """
+
+    def __init__(self, object_list, per_page, threshold=1000, cache_timeout=60, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.threshold = threshold
+        self.cache_timeout = cache_timeout
+        self.is_approximate = False
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list.order_by()
+        bounded = queryset[:self.threshold + 1].count()
+        if bounded <= self.threshold:
+            return bounded
+        self.is_approximate = True
+        return max(self.estimate_count(queryset), bounded)
+
+    async def acount(self):
+        """``count`` for async callers, with the same queries."""
+        queryset = self.object_list.order_by()
+        bounded = await queryset[:self.threshold + 1].acount()
+        if bounded <= self.threshold:
+            return bounded
+        self.is_approximate = True
+        return max(await self.aestimate_count(queryset), bounded)
+
+    def count_key(self, queryset):
+        sql, params = queryset.query.sql_with_params()
+        return "jobs:count:" + hashlib.sha1(repr((queryset.db, sql, params)).encode()).hexdigest()
+
+    def estimate_count(self, queryset):
+        if connections[queryset.db].vendor == "postgresql":
+            plan = json.loads(queryset.explain(format="json"))
+            return int(plan[0]["Plan"]["Plan Rows"])
+        key = self.count_key(queryset)
+        count = cache.get(key)
+        if count is None:
+            count = queryset.count()
+            cache.set(key, count, self.cache_timeout)
+        return count
+
+    async def aestimate_count(self, queryset):
+        if connections[queryset.db].vendor == "postgresql":
+            plan = json.loads(await queryset.aexplain(format="json"))
+            return int(plan[0]["Plan"]["Plan Rows"])
+        key = self.count_key(queryset)
+        count = await cache.aget(key)
+        if count is None:
+            count = await queryset.acount()
+            await cache.aset(key, count, self.cache_timeout)
+        return count
+
+    def validate_number(self, number):
+        # is_approximate is only known once count has been evaluated
+        self.count
+        # An estimate may undercount, so pages past num_pages stay reachable
+        if not self.is_approximate:
+            return super().validate_number(number)
+        try:
+            number = int(number)
+        except (TypeError, ValueError):
+            return super().validate_number(number)
+        if number < 1:
+            return super().validate_number(number)
+        return number
+
+    def page(self, number):
+        number = self.validate_number(number)
+        if not self.is_approximate:
+            return super().page(number)
+        # Not capped at the estimated count: the last pages hold whatever rows there are
+        bottom = (number - 1) * self.per_page
+        return self._get_page(self.object_list[bottom:bottom + self.per_page], number, self)
+
+
+def listing_paginator(view_name):
+    """
+    Paginator for a listing view, per settings.APPROXIMATE_COUNT_THRESHOLDS:
+    a row threshold switches the view to approximate counts, None keeps
+    exact ones.
+    """
+    threshold = getattr(settings, "APPROXIMATE_COUNT_THRESHOLDS", {}).get(view_name)
+    if threshold is None:
+        return Paginator
+    return partial(ApproximateCountPaginator, threshold=threshold)
+
+
+def encode_cursor(obj, backwards=False):
+    created_at = obj["created_at"] if isinstance(obj, dict) else obj.created_at
+    raw = f"{created_at.isoformat()}|{row_pk(obj)}|{int(backwards)}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    """``(created_at, pk, backwards)`` from a cursor; ValueError if malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, pk, backwards = raw.split("|")
+        return datetime.fromisoformat(created_at), int(pk), backwards == "1"
+    except (TypeError, UnicodeDecodeError, ValueError) as exc:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from exc
+
+
+def keyset_ordered(queryset):
+    """
+    Whether ``queryset`` is in the newest-first order keyset pages follow,
+    rather than an explicit or relevance (search, fuzzy match) ordering.
+    """
+    return tuple(queryset.query.order_by) in ((), ("-created_at",), ("-created_at", "-id"), KEYSET_ORDERING)
+
+
+def keyset_query(queryset, cursor, size):
+    """
+    The rows to read for a ``keyset_page``, and whether the cursor reads
+    backwards (None without a cursor). ValueError if the cursor is malformed.
+    """
+    queryset = queryset.order_by(*KEYSET_ORDERING)
+    if cursor is None:
+        return queryset[:size + 1], None
+    created_at, pk, backwards = decode_cursor(cursor)
+    if not backwards:
+        # The created_at bound on its own lets the database range-scan
+        # the (created_at, id) index; the OR breaks ties by id.
+        return queryset.filter(
+            Q(created_at__lte=created_at),
+            Q(created_at__lt=created_at) | Q(pk__lt=pk),
+        )[:size + 1], False
+    return queryset.filter(
+        Q(created_at__gte=created_at),
+        Q(created_at__gt=created_at) | Q(pk__gt=pk),
+    ).order_by("created_at", "pk")[:size + 1], True
+
+
+def keyset_result(rows, size, backwards):
+    """``keyset_page``'s result from the rows read by ``keyset_query``."""
+    if backwards is None:
+        has_next, has_previous = len(rows) > size, False
+        rows = rows[:size]
+    elif not backwards:
+        has_next, has_previous = len(rows) > size, True
+        rows = rows[:size]
+    else:
+        has_next, has_previous = True, len(rows) > size
+        rows = rows[:size][::-1]
+
+    next_cursor = encode_cursor(rows[-1]) if has_next and rows else None
+    previous_cursor = encode_cursor(rows[0], backwards=True) if has_previous and rows else None
+    return rows, next_cursor, previous_cursor
+
+
+def keyset_page(queryset, cursor, size):
+    """
+    One page of ``queryset`` in newest-first order, starting after (or, for
+    a backwards cursor, ending before) the cursor position.
+
+    Returns ``(objects, next_cursor, previous_cursor)``; cursors are None at
+    either end of the listing.
+    """
+    rows, backwards = keyset_query(queryset, cursor, size)
+    return keyset_result(list(rows), size, backwards)
+
+
+async def akeyset_page(queryset, cursor, size):
+    rows, backwards = keyset_query(queryset, cursor, size)
+    return keyset_result([row async for row in rows], size, backwards)
+
+
+class CachedPageNumberPagination(PageNumberPagination):
+    """
+    PageNumberPagination whose page IDs and total count come from the
+    listing cache (see jobs.cache) for repeated identical requests.
+
+    ``?pagination=cursor`` (and any ``?cursor=``) switches to keyset
+    pagination in newest-first order: the response then has ``next`` and
+    ``previous`` cursor links but no ``count``. Listings in another order
+    (``?ordering=``, or relevance-ranked searches) answer 400 instead.
+    """
+    cursor_query_param = 'cursor'
+    cursor = None
+    invalid_cursor_ordering_message = (
+        'Cursor pagination lists jobs newest first only; use page numbers with '
+        'an ordering or a ranked search.'
+    )
+
+    def uses_cursor(self, request, queryset):
+        params = request.query_params
+        if not (self.cursor_query_param in params or params.get('pagination') == 'cursor'):
+            return False
+        if not keyset_ordered(queryset):
+            raise ValidationError({self.cursor_query_param: self.invalid_cursor_ordering_message})
+        return True
+
+    def paginate_queryset(self, queryset, request, view=None):
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+
+        self.request = request
+        if self.uses_cursor(request, queryset):
+            return self.paginate_keyset(queryset, request, page_size)
+
+        page_number = request.query_params.get(self.page_query_param) or 1
+        key = listing_key(f"api:{view.basename}", request.query_params, ignore=(self.page_query_param,))
+        try:
+            if page_number in self.last_page_strings:
+                page_number = self.django_paginator_class(queryset, page_size).num_pages
+            self.page = cached_page(
+                queryset, page_size, page_number, key, view.get_queryset(), strict=True
+            )
+        except InvalidPage as exc:
+            msg = self.invalid_page_message.format(page_number=page_number, message=str(exc))
+            raise NotFound(msg)
+
+        if self.page.paginator.num_pages > 1 and self.template is not None:
+            self.display_page_controls = True
+        return list(self.page)
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """``paginate_queryset`` for async views (jobs.async_views)."""
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+
+        self.request = request
+        if self.uses_cursor(request, queryset):
+            self.cursor = request.query_params.get(self.cursor_query_param) or None
+            try:
+                rows, self.next_cursor, self.previous_cursor = await akeyset_page(queryset, self.cursor, page_size)
+            except ValueError as exc:
+                raise NotFound(str(exc))
+            self.page = None
+            return rows
+
+        page_number = request.query_params.get(self.page_query_param) or 1
+        key = await alisting_key(f"api:{view.basename}", request.query_params, ignore=(self.page_query_param,))
+        try:
+            if page_number in self.last_page_strings:
+                paginator = self.django_paginator_class(queryset, page_size)
+                await apaginator_count(paginator)
+                page_number = paginator.num_pages
+            self.page = await acached_page(
+                queryset, page_size, page_number, key, view.get_queryset(), strict=True
+            )
+        except InvalidPage as exc:
+            msg = self.invalid_page_message.format(page_number=page_number, message=str(exc))
+            raise NotFound(msg)
+
+        if self.page.paginator.num_pages > 1 and self.template is not None:
+            self.display_page_controls = True
+        return list(self.page)
+
+    def paginate_keyset(self, queryset, request, page_size):
+        self.cursor = request.query_params.get(self.cursor_query_param) or None
+        try:
+            rows, self.next_cursor, self.previous_cursor = keyset_page(queryset, self.cursor, page_size)
+        except ValueError as exc:
+            raise NotFound(str(exc))
+        self.page = None
+        return rows
+
+    def _cursor_link(self, cursor):
+        if cursor is None:
+            return None
+        url = remove_query_param(self.request.build_absolute_uri(), self.page_query_param)
+        return replace_query_param(url, self.cursor_query_param, cursor)
+
+    def get_paginated_response(self, data):
+        if self.page is not None:
+            return super().get_paginated_response(data)
+        return Response(OrderedDict([
+            ('next', self._cursor_link(self.next_cursor)),
+            ('previous', self._cursor_link(self.previous_cursor)),
+            ('results', data),
+        ]))
@@ -0,0 +1,221 @@
+"""
+Per-process cache of near-static reference data.
+
+Categories, companies, active FAQs and active testimonials change a few
+times a month but are read on most requests. Each process keeps their rows
+in memory together with the version of the table they were loaded at. The
+versions live in the configured cache, like the listing version: saving
+or deleting a row bumps its table's version (see the receivers in
+jobs.models) and every process reloads the table on its first read after
+that. With a shared cache backend all workers converge right away; a read
+costs one cache lookup instead of a query. Entries are also reloaded once
+they are ``REFERENCE_DATA_RELOAD_SECONDS`` old, which is how workers
+converge when the cache is per process (the default LocMemCache), where a
+bump is only seen by the process that made the change.
+
+The API endpoints for these tables are served from the same rows, with an
+ETag derived from their contents (so every worker gives the same one) and
+a long ``Cache-Control: max-age``.
+"""
+import hashlib
+import threading
+import time
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+from django.http import Http404
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import quote_etag
+
+from .cache import params_digest
+
+VERSION_KEY = "jobs:refdata:{}:version"
+
+# Table name -> (model, filter of the cached rows)
+REFERENCE_TABLES = {
+    "categories": ("jobs.Category", {}),
+    "companies": ("jobs.Company", {}),
+    "faqs": ("jobs.FAQ", {"is_active": True}),
+    "testimonials": ("jobs.Testimonial", {"is_active": True}),
+}
+
+
+def reference_max_age():
+    return getattr(settings, "REFERENCE_DATA_MAX_AGE", 3600)
+
+
+def reference_reload_seconds():
+    return getattr(settings, "REFERENCE_DATA_RELOAD_SECONDS", 60)
+
+
+def reference_table(model):
+    """Name of the reference table holding ``model``'s rows, or None."""
+    label = model._meta.label
+    for name, (model_label, _) in REFERENCE_TABLES.items():
+        if model_label == label:
+            return name
+    return None
+
+
+def reference_version(name):
+    key = VERSION_KEY.format(name)
+    version = cache.get(key)
+    if version is None:
+        # Seeded from the clock so an evicted version never repeats an old one
+        version = int(time.time() * 1000)
+        cache.add(key, version, None)
+        version = cache.get(key, version)
+    return version
+
+
+async def areference_version(name):
+    key = VERSION_KEY.format(name)
+    version = await cache.aget(key)
+    if version is None:
+        version = int(time.time() * 1000)
+        await cache.aadd(key, version, None)
+        version = await cache.aget(key, version)
+    return version
+
+
+def bump_reference_version(name):
+    key = VERSION_KEY.format(name)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, int(time.time() * 1000), None)
+
+
+class ReferenceEntry:
+    """The rows of one reference table as loaded at ``version``."""
+
+    def __init__(self, version, rows):
+        self.version = version
+        self.rows = rows
+        self.by_pk = {row.pk: row for row in rows}
+        self.loaded_at = time.monotonic()
+        self.digest = hashlib.sha1(repr([
+            [getattr(row, field.attname) for field in row._meta.concrete_fields] for row in rows
+        ]).encode()).hexdigest()[:16]
+
+
+class ReferenceCache:
+    """Per-process store of reference tables, reloaded when their version changes."""
+
+    def __init__(self):
+        self.entries = {}
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.loads = 0
+
+    def get(self, name):
+        # Read the version first: a change committed while the rows load
+        # leaves an entry older than its version, reloaded on the next read
+        version = reference_version(name)
+        entry = self.current(name, version)
+        if entry is None:
+            entry = self.store(name, version, list(self.rows_queryset(name)))
+        return entry
+
+    async def aget(self, name):
+        version = await areference_version(name)
+        entry = self.current(name, version)
+        if entry is None:
+            entry = self.store(name, version, [row async for row in self.rows_queryset(name)])
+        return entry
+
+    def current(self, name, version):
+        entry = self.entries.get(name)
+        if (
+            entry is not None and entry.version == version
+            and time.monotonic() - entry.loaded_at < reference_reload_seconds()
+        ):
+            self.hits += 1
+            return entry
+        return None
+
+    def rows_queryset(self, name):
+        model_label, filters = REFERENCE_TABLES[name]
+        return apps.get_model(model_label).objects.filter(**filters)
+
+    def store(self, name, version, rows):
+        entry = ReferenceEntry(version, rows)
+        with self.lock:
+            self.entries[name] = entry
+            self.loads += 1
+        return entry
+
+    def clear(self, name=None):
+        with self.lock:
+            if name is None:
+                self.entries.clear()
+            else:
+                self.entries.pop(name, None)
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "loads": self.loads,
+            "tables": {name: len(entry.rows) for name, entry in self.entries.items()},
+        }
+
+
+reference_cache = ReferenceCache()
+
+
+def reference_rows(name):
+    """Cached rows of reference table ``name``; treat them as read-only."""
+    return reference_cache.get(name).rows
+
+
+class ReferenceDataViewSetMixin:
+    """
+    Read-only viewset serving reference table ``reference`` from the
+    per-process cache. Responses carry an ETag (digest of the rows, query
+    parameters and renderer) and ``Cache-Control: public, max-age``;
+    requests with a matching ``If-None-Match`` get a 304.
+    """
+    reference = None
+    # The rows are a list: there is no queryset to filter or order
+    filter_backends = []
+
+    def reference_entry(self):
+        if not hasattr(self, "_reference_entry"):
+            self._reference_entry = reference_cache.get(self.reference)
+        return self._reference_entry
+
+    def get_queryset(self):
+        return self.reference_entry().rows
+
+    def get_object(self):
+        lookup = self.kwargs[self.lookup_url_kwarg or self.lookup_field]
+        try:
+            obj = self.reference_entry().by_pk[int(lookup)]
+        except (KeyError, ValueError):
+            raise Http404
+        self.check_object_permissions(self.request, obj)
+        return obj
+
+    def get_etag(self, request):
+        return quote_etag("{}-{}-{}-{}".format(
+            self.reference,
+            self.reference_entry().digest,
+            request.accepted_renderer.format,
+            params_digest(request.query_params)[:16],
+        ))
+
+    def cached_response(self, respond, request, *args, **kwargs):
+        etag = self.get_etag(request)
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = respond(request, *args, **kwargs)
+        response["ETag"] = etag
+        patch_cache_control(response, public=True, max_age=reference_max_age())
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(super().retrieve, request, *args, **kwargs)
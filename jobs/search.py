@@ -0,0 +1,615 @@
+"""
+Keyword and fuzzy search for job listings.
+
+On PostgreSQL every job carries a weighted ``search_vector`` (title, then
+skills, then company name, then description) backed by a GIN index, and
+matches are ranked with ``ts_rank``. Location and title matching use pg_trgm
+word similarity over trigram GIN indexes, so typos still match.
+
+Other backends (the SQLite fallback in settings) answer keyword queries from
+an in-process ``InvertedIndex`` over active jobs and compute trigram
+similarity in Python.
+"""
+import datetime
+import json
+import logging
+import os
+import re
+import stat
+import tempfile
+import threading
+import time
+from array import array
+from bisect import bisect_left
+
+from django.conf import settings
+from django.db import connections
+from django.db.models import Case, Count, F, FloatField, OuterRef, Q, Subquery, Value, When
+from django.db.models.functions import Greatest
+
+from django.contrib.postgres.search import (
+    SearchQuery, SearchRank, SearchVector, TrigramWordSimilarity,
+)
+
+logger = logging.getLogger(__name__)
+
+SEARCH_CONFIG = "english"
+
+# Matches pg_trgm's default pg_trgm.word_similarity_threshold
+WORD_SIMILARITY_THRESHOLD = 0.6
+
+# Renamed cities that share too few trigrams to match each other fuzzily
+LOCATION_ALIASES = [
+    {"bangalore", "bengaluru"},
+    {"bombay", "mumbai"},
+    {"calcutta", "kolkata"},
+    {"gurgaon", "gurugram"},
+    {"madras", "chennai"},
+    {"peking", "beijing"},
+]
+
+
+def uses_full_text(using):
+    return connections[using].vendor == "postgresql"
+
+
+def job_search_vector():
+    """Expression computing the search document of a job row."""
+    from .models import Company
+
+    company_name = Subquery(Company.objects.filter(pk=OuterRef("company_id")).values("name")[:1])
+    return (
+        SearchVector("title", weight="A", config=SEARCH_CONFIG)
+        + SearchVector("skills_required", weight="B", config=SEARCH_CONFIG)
+        + SearchVector(company_name, weight="C", config=SEARCH_CONFIG)
+        + SearchVector("description", weight="D", config=SEARCH_CONFIG)
+    )
+
+
+def update_search_vectors(queryset):
+    """Recompute ``search_vector`` for every job in ``queryset``."""
+    if not uses_full_text(queryset.db):
+        return 0
+    return queryset.update(search_vector=job_search_vector())
+
+
+def search_jobs(queryset, q, ranked=True):
+    """
+    Filter ``queryset`` down to jobs matching the keyword query ``q``.
+
+    With ``ranked`` the full-text path orders results by relevance (newest
+    first among equal ranks); pass ``ranked=False`` when the caller applies
+    its own ordering. Without full-text search, a query matching more than
+    ``InvertedIndex.MAX_MATCHES`` jobs is cut to its best matches.
+    """
+    q = (q or "").strip()
+    if not q:
+        return queryset
+
+    if uses_full_text(queryset.db):
+        query = SearchQuery(q, search_type="websearch", config=SEARCH_CONFIG)
+        queryset = queryset.filter(search_vector=query)
+        if ranked:
+            queryset = queryset.annotate(
+                search_rank=SearchRank(F("search_vector"), query)
+            ).order_by("-search_rank", "-created_at")
+        return queryset
+
+    index = get_search_index(queryset.db)
+    if index is not None:
+        # Bound parameters: SQLite allows 999 per query before 3.32
+        ids = index.search(q)[:InvertedIndex.MAX_MATCHES]
+        queryset = queryset.filter(pk__in=ids)
+        if ranked and ids:
+            top = ids[:InvertedIndex.RANKED_RESULTS]
+            rank = Case(
+                *[When(pk=pk, then=Value(len(top) - position)) for position, pk in enumerate(top)],
+                default=Value(0),
+            )
+            queryset = queryset.annotate(search_rank=rank).order_by("-search_rank", "-created_at")
+        return queryset
+
+    return queryset.filter(
+        Q(title__icontains=q) |
+        Q(description__icontains=q) |
+        Q(company__name__icontains=q) |
+        Q(skills_required__icontains=q)
+    )
+
+
+def match_skills(queryset, skills, match_all=False):
+    """
+    Filter to jobs requiring any (or, with ``match_all``, every) skill in
+    ``skills``. Names match whole skills case-insensitively, so "Java" does
+    not match "JavaScript"; the lookup runs on the JobSkill (skill, job) index.
+    """
+    from .models import JobSkill, Skill
+
+    keys = {Skill.normalize(skill) for skill in skills if skill.strip()}
+    if not keys:
+        return queryset
+    job_skills = JobSkill.objects.filter(skill__key__in=keys).values("job_id")
+    if match_all:
+        job_skills = (
+            job_skills.annotate(matched=Count("skill_id")).filter(matched=len(keys)).values("job_id")
+        )
+    return queryset.filter(pk__in=job_skills)
+
+
+def trigrams(value):
+    """Ordered trigrams of ``value`` following pg_trgm's word padding rules."""
+    grams = []
+    for word in re.findall(r"\w+", value.lower()):
+        padded = f"  {word} "
+        grams.extend(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def word_similarity(query, value):
+    """
+    Greatest trigram similarity between ``query`` and any contiguous extent
+    of the trigrams of ``value``; mirrors pg_trgm's ``word_similarity()``.
+    """
+    query_grams = set(trigrams(query))
+    value_grams = trigrams(value)
+    if not query_grams or not value_grams:
+        return 0.0
+    best = 0.0
+    for start in range(len(value_grams)):
+        if value_grams[start] not in query_grams:
+            continue
+        extent = set()
+        for gram in value_grams[start:]:
+            extent.add(gram)
+            if gram in query_grams:
+                shared = len(query_grams & extent)
+                best = max(best, shared / len(query_grams | extent))
+        if best == 1.0:
+            break
+    return best
+
+
+def location_variants(location):
+    """``location`` plus any alias spellings of the words it contains."""
+    variants = [location]
+    lowered = location.lower()
+    for aliases in LOCATION_ALIASES:
+        for name in aliases:
+            if re.search(rf"\b{name}\b", lowered):
+                variants.extend(
+                    re.sub(rf"\b{name}\b", alias, lowered) for alias in aliases - {name}
+                )
+    return variants
+
+
+# SQLite fallback: fuzzy matches are scored in Python against the this many
+# most common column values, reread at most every this many seconds. Rarer
+# values are still found by substring, just not by a misspelling.
+FUZZY_CANDIDATE_LIMIT = 5000
+FUZZY_CANDIDATE_TTL = 60.0
+
+_fuzzy_candidates = {}
+
+
+def fuzzy_candidates(model, field, using):
+    """
+    The ``FUZZY_CANDIDATE_LIMIT`` most common values of ``field`` to score
+    typo matches against (ties by value, so every worker picks the same
+    ones), cached per process.
+    """
+    key = (model._meta.label, field, using)
+    cached = _fuzzy_candidates.get(key)
+    if cached is not None and time.monotonic() - cached[0] < FUZZY_CANDIDATE_TTL:
+        return cached[1]
+    values = list(
+        model._default_manager.using(using).values(field).annotate(rows=Count("pk"))
+        .order_by("-rows", field).values_list(field, flat=True)[:FUZZY_CANDIDATE_LIMIT]
+    )
+    _fuzzy_candidates[key] = (time.monotonic(), values)
+    return values
+
+
+def order_by_similarity(queryset):
+    """
+    Order ``queryset`` by the sum of every ``*_similarity`` score annotated
+    by ``fuzzy_filter`` so far, so filtering on title and location ranks
+    by both matches rather than by the last one applied.
+    """
+    scores = [F(name) for name in queryset.query.annotations if name.endswith("_similarity")]
+    total = scores[0]
+    for score in scores[1:]:
+        total = total + score
+    return queryset.order_by(total.desc(), "-created_at")
+
+
+def fuzzy_filter(queryset, field, values, ranked=True):
+    """
+    Filter ``queryset`` to rows whose ``field`` is a close trigram match for
+    any of ``values``. With ``ranked`` the best matches come first.
+    """
+    values = [value.strip() for value in values if value and value.strip()]
+    if not values:
+        return queryset
+
+    if uses_full_text(queryset.db):
+        condition = Q()
+        for value in values:
+            condition |= Q(**{f"{field}__trigram_word_similar": value})
+        queryset = queryset.filter(condition)
+        if ranked:
+            similarities = [TrigramWordSimilarity(value, field) for value in values]
+            score = Greatest(*similarities) if len(similarities) > 1 else similarities[0]
+            queryset = order_by_similarity(queryset.annotate(**{f"{field}_similarity": score}))
+        return queryset
+
+    # No pg_trgm: substring matches are left to the database; typo matches
+    # are found by scoring the (cached) distinct column values in Python and
+    # filtering by exact value, so the database only does equality lookups.
+    contains = Q()
+    for value in values:
+        contains |= Q(**{f"{field}__icontains": value})
+    scores = {}
+    for candidate in fuzzy_candidates(queryset.model, field, queryset.db):
+        score = max(word_similarity(value, candidate) for value in values)
+        if score >= WORD_SIMILARITY_THRESHOLD:
+            scores[candidate] = score
+    queryset = queryset.filter(contains | Q(**{f"{field}__in": list(scores)}))
+    if ranked:
+        score = Case(
+            When(contains, then=Value(1.0)),
+            *[When(**{field: candidate}, then=Value(s)) for candidate, s in scores.items()],
+            default=Value(0.0),
+            output_field=FloatField(),
+        )
+        queryset = order_by_similarity(queryset.annotate(**{f"{field}_similarity": score}))
+    return queryset
+
+
+def match_location(queryset, location, ranked=True):
+    """Typo- and alias-tolerant location filter."""
+    return fuzzy_filter(queryset, "location", location_variants(location), ranked=ranked)
+
+
+def match_title(queryset, title, ranked=True):
+    """Typo-tolerant job title filter."""
+    return fuzzy_filter(queryset, "title", [title], ranked=ranked)
+
+
+# --- In-process inverted index ---------------------------------------------
+
+TOKEN_RE = re.compile(r"\w+")
+
+
+def tokenize(text):
+    """Lowercased word tokens with a trailing plural ``s`` stripped."""
+    tokens = []
+    for token in TOKEN_RE.findall(text.lower()):
+        if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+            token = token[:-1]
+        tokens.append(token)
+    return tokens
+
+
+class InvertedIndex:
+    """
+    Token -> posting list index over active jobs.
+
+    Each posting list is a pair of parallel arrays: sorted job IDs and the
+    weighted term frequency of the token in that job. A query matches jobs
+    containing every query token and returns their IDs best-first.
+
+    The index follows the database in two ways: ``Job`` save/delete signals
+    update it directly in the process that made the change, and ``sync()``
+    (called at most every ``SYNC_INTERVAL`` seconds by queries) re-indexes
+    rows whose ``updated_at`` moved past the watermark, which picks up
+    changes made by other workers. An index with a ``path`` is written
+    there again whenever ``sync()`` rebuilds it or has re-indexed
+    ``SAVE_THRESHOLD`` rows since the last write, so a restarted worker
+    only catches up on recent changes.
+    """
+    FORMAT_VERSION = 2
+    FIELD_WEIGHTS = {"title": 4, "skills_required": 3, "company__name": 2, "description": 1}
+    SYNC_INTERVAL = 5.0
+    SAVE_THRESHOLD = 500
+    # Only the best matches are ordered by relevance, the rest by recency
+    RANKED_RESULTS = 200
+    # Jobs a search lists at most (its best matches), as they are passed to
+    # the database as an IN list
+    MAX_MATCHES = 500
+
+    def __init__(self, using="default", path=None):
+        self.using = using
+        self.path = path
+        self.unsaved_rows = 0
+        self.postings = {}
+        self.documents = {}
+        self.watermark = None
+        self.lock = threading.RLock()
+        self.last_sync = 0.0
+        self.build_seconds = None
+        self.query_count = 0
+        self.query_seconds_total = 0.0
+        self.query_seconds_max = 0.0
+
+    # Documents
+
+    def _queryset(self):
+        from .models import Job
+
+        return Job.objects.using(self.using).order_by().values_list(
+            "pk", "is_active", "updated_at", *self.FIELD_WEIGHTS
+        )
+
+    def _add(self, job_id, fields):
+        frequencies = {}
+        for field, text in zip(self.FIELD_WEIGHTS, fields):
+            weight = self.FIELD_WEIGHTS[field]
+            for token in tokenize(text or ""):
+                frequencies[token] = frequencies.get(token, 0) + weight
+        for token, frequency in frequencies.items():
+            ids, weights = self.postings.setdefault(token, (array("L"), array("H")))
+            position = bisect_left(ids, job_id)
+            ids.insert(position, job_id)
+            weights.insert(position, min(frequency, 0xFFFF))
+        self.documents[job_id] = tuple(frequencies)
+
+    def _remove(self, job_id):
+        for token in self.documents.pop(job_id, ()):
+            ids, weights = self.postings[token]
+            position = bisect_left(ids, job_id)
+            if position < len(ids) and ids[position] == job_id:
+                del ids[position]
+                del weights[position]
+            if not ids:
+                del self.postings[token]
+
+    def _apply(self, rows):
+        """Index ``rows``; returns the newest ``updated_at`` among them."""
+        newest = None
+        for job_id, is_active, updated_at, *fields in rows:
+            self._remove(job_id)
+            if is_active:
+                self._add(job_id, fields)
+            if newest is None or updated_at > newest:
+                newest = updated_at
+        return newest
+
+    def build(self):
+        """Rebuild the whole index from the database."""
+        started = time.perf_counter()
+        with self.lock:
+            self.postings = {}
+            self.documents = {}
+            self.watermark = self._apply(
+                self._queryset().filter(is_active=True).iterator(chunk_size=2000)
+            )
+            self.last_sync = time.monotonic()
+        self.build_seconds = time.perf_counter() - started
+        logger.info("Built job search index: %s", self.stats())
+        return self
+
+    def refresh(self, job_ids):
+        """
+        Re-index (or drop, if inactive or gone) the given jobs. The watermark
+        is left alone so changes from other workers are still picked up.
+        """
+        job_ids = list(job_ids)
+        with self.lock:
+            rows = list(self._queryset().filter(pk__in=job_ids))
+            for job_id in set(job_ids) - {row[0] for row in rows}:
+                self._remove(job_id)
+            self._apply(rows)
+
+    def discard(self, job_id):
+        with self.lock:
+            self._remove(job_id)
+
+    def sync(self, force=False):
+        """
+        Catch up with changes made by other processes. Rows updated after
+        the watermark are re-indexed; if the number of active jobs still
+        disagrees (rows were deleted elsewhere) the index is rebuilt.
+        """
+        if not force and time.monotonic() - self.last_sync < self.SYNC_INTERVAL:
+            return
+        from .models import Job
+
+        with self.lock:
+            self.last_sync = time.monotonic()
+            changed = self._queryset()
+            if self.watermark is not None:
+                changed = changed.filter(updated_at__gte=self.watermark)
+            rows = list(changed)
+            self.watermark = self._apply(rows) or self.watermark
+            self.unsaved_rows += len(rows)
+            active = Job.objects.using(self.using).filter(is_active=True).count()
+            rebuilt = active != len(self.documents)
+            if rebuilt:
+                self.build()
+        if rebuilt or self.unsaved_rows >= self.SAVE_THRESHOLD:
+            self.persist()
+
+    # Queries
+
+    def search(self, q):
+        """IDs of active jobs containing every token of ``q``, best first."""
+        started = time.perf_counter()
+        self.sync()
+        tokens = set(tokenize(q))
+        with self.lock:
+            lists = [self.postings.get(token) for token in tokens]
+            if not lists or None in lists:
+                ids = []
+            else:
+                lists.sort(key=lambda posting: len(posting[0]))
+                scores = dict(zip(*lists[0]))
+                for other_ids, other_weights in lists[1:]:
+                    other = dict(zip(other_ids, other_weights))
+                    scores = {
+                        job_id: score + other[job_id]
+                        for job_id, score in scores.items() if job_id in other
+                    }
+                ids = sorted(scores, key=lambda job_id: (-scores[job_id], -job_id))
+        elapsed = time.perf_counter() - started
+        self.query_count += 1
+        self.query_seconds_total += elapsed
+        self.query_seconds_max = max(self.query_seconds_max, elapsed)
+        return ids
+
+    def stats(self):
+        return {
+            "documents": len(self.documents),
+            "tokens": len(self.postings),
+            "postings": sum(len(ids) for ids, _ in self.postings.values()),
+            "posting_bytes": sum(
+                ids.itemsize * len(ids) + weights.itemsize * len(weights)
+                for ids, weights in self.postings.values()
+            ),
+            "build_ms": round(self.build_seconds * 1000, 2) if self.build_seconds is not None else None,
+            "queries": self.query_count,
+            "query_avg_ms": round(self.query_seconds_total / self.query_count * 1000, 3) if self.query_count else None,
+            "query_max_ms": round(self.query_seconds_max * 1000, 3),
+        }
+
+    # Persistence
+
+    def persist(self):
+        """Write the index to its ``path``, if it has one; failures are logged."""
+        if self.path is None:
+            return
+        try:
+            self.save(self.path)
+        except OSError:
+            logger.warning("Could not persist job search index to %s", self.path, exc_info=True)
+
+    def save(self, path):
+        """
+        Atomically write the index to ``path`` as JSON: plain lists and
+        strings, so loading a tampered file cannot run code.
+        """
+        with self.lock:
+            payload = {
+                "version": self.FORMAT_VERSION,
+                "watermark": self.watermark.isoformat() if self.watermark is not None else None,
+                "postings": {token: [ids.tolist(), weights.tolist()] for token, (ids, weights) in self.postings.items()},
+                "documents": [[job_id, list(tokens)] for job_id, tokens in self.documents.items()],
+            }
+            self.unsaved_rows = 0
+        # Searches go on while the file is written
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".search-index-")
+        with os.fdopen(fd, "w") as f:
+            json.dump(payload, f, separators=(",", ":"))
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path, using="default"):
+        """
+        Read an index saved with ``save()``; None if missing, in a stale
+        format, or not private to this user (see ``private_file``).
+        """
+        if not private_file(path):
+            return None
+        try:
+            with open(path) as f:
+                payload = json.load(f)
+            if payload.get("version") != cls.FORMAT_VERSION:
+                return None
+            index = cls(using, path)
+            watermark = payload["watermark"]
+            index.watermark = datetime.datetime.fromisoformat(watermark) if watermark else None
+            index.postings = {
+                token: (array("L", ids), array("H", weights))
+                for token, (ids, weights) in payload["postings"].items()
+            }
+            index.documents = {job_id: tuple(tokens) for job_id, tokens in payload["documents"]}
+        except (OSError, ValueError, TypeError, KeyError, OverflowError):
+            return None
+        return index
+
+
+def private_file(path):
+    """
+    Whether ``path`` is ours and only we (or root) can have written it or
+    swapped it in: the file owned by this user and not writable by others,
+    its directory owned by this user or root and only shared if sticky.
+    """
+    if not hasattr(os, "getuid"):
+        return os.path.isfile(path)
+    uid = os.getuid()
+    try:
+        info = os.stat(path)
+        directory = os.stat(os.path.dirname(os.path.abspath(path)))
+    except OSError:
+        return False
+    shared = stat.S_IWGRP | stat.S_IWOTH
+    if (
+        info.st_uid != uid or info.st_mode & shared
+        or directory.st_uid not in (uid, 0)
+        or (directory.st_mode & shared and not directory.st_mode & stat.S_ISVTX)
+    ):
+        logger.warning("Not loading job search index %s: it is not private to this user", path)
+        return False
+    return True
+
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def search_index_enabled(using):
+    return getattr(settings, "JOB_SEARCH_INDEX_ENABLED", True) and not uses_full_text(using)
+
+
+def search_index_path():
+    """``JOB_SEARCH_INDEX_PATH``, or a file in a directory of the temp dir private to this user."""
+    user = os.getuid() if hasattr(os, "getuid") else "default"
+    return getattr(settings, "JOB_SEARCH_INDEX_PATH", None) or os.path.join(
+        tempfile.gettempdir(), f"jobportal-{user}", "search-index.json"
+    )
+
+
+def get_search_index(using="default"):
+    """
+    The process-wide index for database ``using``, or None when Postgres
+    full-text search is available or the index is disabled. The first call
+    in a worker (normally ``preload_search_index`` at worker startup) loads
+    the persisted index file, catching up on rows changed since it was
+    written, or builds and persists a fresh one.
+    """
+    if not search_index_enabled(using):
+        return None
+    index = _indexes.get(using)
+    if index is not None:
+        return index
+    with _indexes_lock:
+        if using not in _indexes:
+            path = search_index_path()
+            started = time.perf_counter()
+            index = InvertedIndex.load(path, using)
+            if index is not None:
+                index.sync(force=True)
+                index.build_seconds = time.perf_counter() - started
+            else:
+                index = InvertedIndex(using, path).build()
+                index.persist()
+            _indexes[using] = index
+        return _indexes[using]
+
+
+def preload_search_index(using="default"):
+    """
+    Load or build the index when a worker starts (see gunicorn.conf.py), so
+    the first search request does not pay for it. Failures are logged; the
+    first search then tries again.
+    """
+    try:
+        get_search_index(using)
+    except Exception:
+        logger.warning("Could not preload the job search index", exc_info=True)
+
+
+def loaded_search_index(using="default"):
+    """The index for ``using`` if this process has already loaded it."""
+    return _indexes.get(using)
@@ -1,20 +1,21 @@
 from rest_framework import serializers
-from .models import Job, Company, Category, Application, SavedJob, Testimonial, FAQ
+from .fieldsets import SparseFieldsSerializerMixin
+from .models import Job, Company, Category, Application, SavedJob, JobDailyStats, Testimonial, FAQ
 
 
-class CompanySerializer(serializers.ModelSerializer):
+class CompanySerializer(SparseFieldsSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Company
         fields = ['id', 'name']
 
 
-class CategorySerializer(serializers.ModelSerializer):
+class CategorySerializer(SparseFieldsSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Category
         fields = ['id', 'name', 'slug']
 
 
-class JobSerializer(serializers.ModelSerializer):
+class JobSerializer(SparseFieldsSerializerMixin, serializers.ModelSerializer):
     company = CompanySerializer(read_only=True)
     category = CategorySerializer(read_only=True)
     skills = serializers.SerializerMethodField()
@@ -28,34 +29,30 @@ class JobSerializer(serializers.ModelSerializer):
             'id', 'title', 'description', 'requirements', 'responsibilities',
             'company', 'category', 'location', 'employment_type', 'work_mode',
             'experience', 'salary', 'skills', 'is_active', 'posted_date',
-            'application_deadline'
+            'application_deadline', 'application_count', 'saved_count'
         ]
+        # Model fields read by the method fields, for ?fields=
+        sparse_sources = {
+            'skills': ['display'],
+            'salary': ['display'],
+            'experience': ['display'],
+            'posted_date': ['display'],
+        }
     
     def get_skills(self, obj):
-        return obj.skills_list
+        return obj.display_values['skills']
     
     def get_salary(self, obj):
-        if obj.salary_min and obj.salary_max:
-            return f"{obj.salary_min//1000}K-{obj.salary_max//1000}K"
-        elif obj.salary_min:
-            return f"{obj.salary_min//1000}K+"
-        return "Not specified"
+        return obj.display_values['salary']
     
     def get_experience(self, obj):
-        experience_map = {
-            'entry': '0-1 Yrs',
-            'junior': '1-3 Yrs',
-            'mid': '3-5 Yrs',
-            'senior': '5-8 Yrs',
-            'lead': '8+ Yrs',
-        }
-        return experience_map.get(obj.experience_level, obj.get_experience_level_display())
+        return obj.display_values['experience']
     
     def get_posted_date(self, obj):
-        return obj.created_at.strftime('%a %b %d %Y')
+        return obj.display_values['posted_date']
 
 
-class JobListSerializer(serializers.ModelSerializer):
+class JobListSerializer(SparseFieldsSerializerMixin, serializers.ModelSerializer):
     """Simplified serializer for job listings"""
     company_name = serializers.CharField(source='company.name', read_only=True)
     skills = serializers.SerializerMethodField()
@@ -67,32 +64,141 @@ class JobListSerializer(serializers.ModelSerializer):
         model = Job
         fields = [
             'id', 'title', 'company_name', 'location', 'employment_type',
-            'work_mode', 'experience', 'salary', 'skills', 'posted_date'
+            'work_mode', 'experience', 'salary', 'skills', 'posted_date',
+            'application_count', 'saved_count'
         ]
+        # Model fields read by the method fields, for ?fields=
+        sparse_sources = {
+            'skills': ['display'],
+            'salary': ['display'],
+            'experience': ['display'],
+            'posted_date': ['display'],
+        }
     
     def get_skills(self, obj):
-        return obj.skills_list[:6]  # Limit to 6 skills for list view
+        return obj.display_values['skills'][:6]  # Limit to 6 skills for list view
     
     def get_salary(self, obj):
-        if obj.salary_min and obj.salary_max:
-            return f"{obj.salary_min//1000}K-{obj.salary_max//1000}K"
-        return "Not specified"
+        return obj.display_values['salary_short']
     
     def get_experience(self, obj):
-        experience_map = {
-            'entry': '0-1 Yrs',
-            'junior': '1-3 Yrs',
-            'mid': '3-5 Yrs',
-            'senior': '5-8 Yrs',
-            'lead': '8+ Yrs',
-        }
-        return experience_map.get(obj.experience_level, obj.get_experience_level_display())
+        return obj.display_values['experience']
     
     def get_posted_date(self, obj):
-        return obj.created_at.strftime('%a %b %d %Y')
+        return obj.display_values['posted_date']
+
+
+class JobListFastSerializer:
+    """
+    Drop-in for JobListSerializer on list responses, built from ``values()``
+    rows (see ``values``) instead of model instances and DRF fields. The
+    formatted values come from the precomputed ``Job.display``. The output
+    is the same, key for key, as JobListSerializer's. ``fields`` (as given
+    by ``?fields=``) keeps only those keys; ``values_for()`` gives the
+    columns they need.
+    """
+    values = (
+        'id', 'title', 'company__name', 'location', 'employment_type', 'work_mode',
+        'created_at', 'application_count', 'saved_count', 'display',
+    )
+    # Output key -> columns of ``values`` it is built from
+    sources = {
+        'id': ('id',),
+        'title': ('title',),
+        'company_name': ('company__name',),
+        'location': ('location',),
+        'employment_type': ('employment_type',),
+        'work_mode': ('work_mode',),
+        'experience': ('display',),
+        'salary': ('display',),
+        'skills': ('display',),
+        'posted_date': ('display',),
+        'application_count': ('application_count',),
+        'saved_count': ('saved_count',),
+    }
+    # Output key -> key of Job.display
+    display_keys = {
+        'experience': 'experience',
+        'salary': 'salary_short',
+        'posted_date': 'posted_date',
+    }
+
+    def __init__(self, instance=None, many=True, fields=None, **kwargs):
+        self.instance = instance
+        self.fields = list(self.sources) if fields is None else [name for name in self.sources if name in fields]
+
+    @classmethod
+    def values_for(cls, fields=None, keep=('id', 'created_at')):
+        """Columns of ``values`` needed for ``fields`` (all of them by default) plus ``keep``."""
+        if fields is None:
+            return cls.values
+        needed = set(keep).union(*(cls.sources[name] for name in fields))
+        return tuple(column for column in cls.values if column in needed)
+
+    @staticmethod
+    def jobs_missing_display(rows):
+        """Jobs of the rows saved without ``display``, or None if there are none."""
+        pks = [row['id'] for row in rows if 'display' in row and not row['display']]
+        if not pks:
+            return None
+        return Job.objects.filter(pk__in=pks).prefetch_related('job_skills__skill').defer('search_vector')
+
+    @classmethod
+    def missing_display(cls, rows):
+        """``display`` for rows whose job was saved without one, computed from the job."""
+        jobs = cls.jobs_missing_display(rows)
+        return {} if jobs is None else {job.pk: job.build_display() for job in jobs}
+
+    @classmethod
+    async def amissing_display(cls, rows):
+        jobs = cls.jobs_missing_display(rows)
+        return {} if jobs is None else {job.pk: job.build_display() async for job in jobs}
+
+    @property
+    def data(self):
+        rows = list(self.instance)
+        return self.build(rows, self.missing_display(rows))
 
+    async def adata(self):
+        """``data`` for async views; the rows have to be loaded already."""
+        rows = list(self.instance)
+        return self.build(rows, await self.amissing_display(rows))
 
-class ApplicationSerializer(serializers.ModelSerializer):
+    def build(self, rows, built):
+        fields = self.fields
+        data = []
+        for row in rows:
+            display = row.get('display') or built.get(row['id'])
+            item = {}
+            for name in fields:
+                if name == 'company_name':
+                    value = row['company__name']
+                elif name == 'skills':
+                    value = display['skills'][:6]
+                elif name in self.display_keys:
+                    value = display[self.display_keys[name]]
+                else:
+                    value = row[name]
+                item[name] = value
+            data.append(item)
+        return data
+
+
+class JobChangesSerializer(JobListFastSerializer):
+    """
+    JobListFastSerializer for /api/jobs/changes/, without the keys whose
+    changes do not move ``updated_at`` (the counters, written with
+    ``QuerySet.update()``, and the company name): a client would keep
+    stale values for them.
+    """
+    values = ('id', 'title', 'location', 'employment_type', 'work_mode', 'created_at', 'display')
+    sources = {
+        name: columns for name, columns in JobListFastSerializer.sources.items()
+        if name not in ('company_name', 'application_count', 'saved_count')
+    }
+
+
+class ApplicationSerializer(SparseFieldsSerializerMixin, serializers.ModelSerializer):
     job = JobListSerializer(read_only=True)
     applicant_name = serializers.CharField(source='applicant.username', read_only=True)
     
@@ -102,13 +208,28 @@ class ApplicationSerializer(serializers.ModelSerializer):
         read_only_fields = ['status', 'created_at']
 
 
-class TestimonialSerializer(serializers.ModelSerializer):
+class JobBatchSerializer(serializers.Serializer):
+    ids = serializers.ListField(child=serializers.IntegerField(min_value=1), allow_empty=False, max_length=500)
+
+
+class ApplicationStatusBulkSerializer(serializers.Serializer):
+    ids = serializers.ListField(child=serializers.IntegerField(min_value=1), allow_empty=False, max_length=1000)
+    status = serializers.ChoiceField(choices=Application.STATUS_CHOICES)
+
+
+class JobDailyStatsSerializer(SparseFieldsSerializerMixin, serializers.ModelSerializer):
+    class Meta:
+        model = JobDailyStats
+        fields = ['job', 'date', 'views', 'saves', 'applications']
+
+
+class TestimonialSerializer(SparseFieldsSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Testimonial
         fields = ['id', 'name', 'position', 'company', 'content', 'rating']
 
 
-class FAQSerializer(serializers.ModelSerializer):
+class FAQSerializer(SparseFieldsSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = FAQ
         fields = ['id', 'question', 'answer', 'order']
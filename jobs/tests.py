@@ -1,3 +1,767 @@
-from django.test import TestCase
+import csv
+import datetime
+import io
+import json
+import os
+import tempfile
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import async_to_sync
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+from django.db import connection
+from django.test import AsyncRequestFactory, RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.throttling import BaseThrottle
+
+from . import async_views
+from .api_views import JobViewSet
+from .cache import listing_stats, listing_version, tag_versions
+from .changes import START, ChangesCursor, decode_changes_cursor, encode_changes_cursor
+from .live import Broadcaster, RedisBackend
+from .models import Application, Category, Company, EmployerStats, Job, JobDailyStats, JobSkill, SavedJob, Skill
+from .pagination import ApproximateCountPaginator, decode_cursor, encode_cursor, keyset_page
+from .refdata import ReferenceCache
+from .search import InvertedIndex, fuzzy_candidates, match_location, search_jobs
+from .serializers import JobListFastSerializer, JobListSerializer
+from .viewcounter import ViewCounter
+
+
+class DenyAllThrottle(BaseThrottle):
+    def allow_request(self, request, view):
+        return False
+
+
+class JobFixtureMixin:
+    @classmethod
+    def setUpTestData(cls):
+        cls.employer = User.objects.create_user("employer", password="x")
+        cls.applicant = User.objects.create_user("applicant", password="x")
+        cls.company = Company.objects.create(name="Acme")
+
+    def create_job(self, **fields):
+        return Job.objects.create(**{
+            "title": "Backend Engineer",
+            "description": "Build APIs",
+            "location": "Berlin, Germany",
+            "skills_required": "Python, Django",
+            "company": self.company,
+            "posted_by": self.employer,
+            **fields,
+        })
+
+
+class JobCounterTests(JobFixtureMixin, TestCase):
+    def counters(self, job):
+        return Job.objects.values_list("application_count", "saved_count", "view_count").get(pk=job.pk)
+
+    def test_receivers_count_applications_and_saves(self):
+        job = self.create_job()
+        application = Application.objects.create(job=job, applicant=self.applicant)
+        SavedJob.objects.create(job=job, user=self.applicant)
+        self.assertEqual(self.counters(job), (1, 1, 0))
+
+        application.delete()
+        self.assertEqual(self.counters(job), (0, 1, 0))
+
+    def test_saving_stale_instance_keeps_counters(self):
+        job = self.create_job()
+        stale = Job.objects.get(pk=job.pk)
+        Application.objects.create(job=job, applicant=self.applicant)
+        SavedJob.objects.create(job=job, user=self.applicant)
+        Job.objects.filter(pk=job.pk).update(view_count=7)
+
+        stale.title = "Senior Backend Engineer"
+        stale.save()
+
+        self.assertEqual(self.counters(job), (1, 1, 7))
+        self.assertEqual(Job.objects.get(pk=job.pk).title, "Senior Backend Engineer")
+
+    def job_with_activity(self, applicants):
+        job = self.create_job()
+        for number in range(applicants):
+            user = User.objects.create_user(f"applicant-{job.pk}-{number}", password="x")
+            Application.objects.create(job=job, applicant=user)
+            SavedJob.objects.create(job=job, user=user)
+        return job
+
+    def delete_queries(self, job):
+        with CaptureQueriesContext(connection) as queries:
+            job.delete()
+        return [query["sql"] for query in queries.captured_queries]
+
+    def test_job_delete_does_not_update_counters_per_row(self):
+        few = self.delete_queries(self.job_with_activity(1))
+        many = self.delete_queries(self.job_with_activity(5))
+
+        self.assertEqual(len(many), len(few))
+        self.assertFalse([sql for sql in many if sql.startswith('UPDATE "jobs_job"')])
+
+    def test_deleting_an_applicant_updates_the_counters(self):
+        job = self.job_with_activity(2)
+
+        User.objects.get(username=f"applicant-{job.pk}-0").delete()
+
+        self.assertEqual(self.counters(job), (1, 1, 0))
+
+    @override_settings(EMPLOYER_STATS_ROLLUP=True)
+    def test_job_delete_takes_its_applications_off_the_employer_stats(self):
+        kept = self.job_with_activity(1)
+        deleted = self.job_with_activity(3)
+        EmployerStats.objects.create(
+            employer=self.employer, total_jobs=2, active_jobs=2, total_applications=4, pending=4
+        )
+
+        deleted.delete()
+
+        stats = EmployerStats.objects.get(employer=self.employer)
+        self.assertEqual((stats.total_jobs, stats.total_applications, stats.pending), (1, 1, 1))
+        self.assertEqual(self.counters(kept), (1, 1, 0))
+
+    def test_saving_deferred_instance_keeps_counters(self):
+        job = self.create_job()
+        stale = Job.objects.defer("description").get(pk=job.pk)
+        Application.objects.create(job=job, applicant=self.applicant)
+
+        stale.is_active = False
+        stale.save()
+
+        self.assertEqual(self.counters(job), (1, 0, 0))
+        self.assertFalse(Job.objects.get(pk=job.pk).is_active)
+
+
+class ViewCounterTests(JobFixtureMixin, TestCase):
+    def test_flush_counts_views_on_the_day_recorded(self):
+        job = self.create_job()
+        counter = ViewCounter(flush_interval=3600, flush_threshold=1000)
+        with mock.patch("jobs.viewcounter.timezone.localdate", return_value=datetime.date(2026, 1, 1)):
+            counter.record(job.pk)
+            counter.record(job.pk)
+        with mock.patch("jobs.viewcounter.timezone.localdate", return_value=datetime.date(2026, 1, 2)):
+            counter.record(job.pk)
+
+        self.assertEqual(counter.flush(), 3)
+
+        self.assertEqual(Job.objects.get(pk=job.pk).view_count, 3)
+        self.assertEqual(
+            list(JobDailyStats.objects.filter(job=job).values_list("date", "views")),
+            [(datetime.date(2026, 1, 1), 2), (datetime.date(2026, 1, 2), 1)],
+        )
+
+    def test_saving_stale_instance_keeps_view_count(self):
+        job = self.create_job()
+        stale = Job.objects.get(pk=job.pk)
+        counter = ViewCounter(flush_interval=3600, flush_threshold=1000)
+        counter.record(job.pk)
+        counter.flush()
+
+        stale.save()
+
+        self.assertEqual(Job.objects.get(pk=job.pk).view_count, 1)
+
+
+class PageCacheTests(JobFixtureMixin, TestCase):
+    def test_application_purges_cached_pages_showing_the_count(self):
+        job = self.create_job()
+        versions = tag_versions(["listings", f"job:{job.pk}"])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Application.objects.create(job=job, applicant=self.applicant)
+
+        after = tag_versions(["listings", f"job:{job.pk}"])
+        self.assertNotEqual(after["listings"], versions["listings"])
+        self.assertNotEqual(after[f"job:{job.pk}"], versions[f"job:{job.pk}"])
+
+
+class JobDisplayTests(JobFixtureMixin, TestCase):
+    def test_display_keeps_each_jobs_skill_spelling(self):
+        first = self.create_job(skills_required="python, Django")
+        second = self.create_job(skills_required="Python, DJANGO")
+
+        self.assertEqual(Job.objects.get(pk=first.pk).display["skills"], ["python", "Django"])
+        self.assertEqual(Job.objects.get(pk=second.pk).display["skills"], ["Python", "DJANGO"])
+
+    def test_long_skills_are_cut_to_the_skill_name_length(self):
+        job = self.create_job(skills_required="Go, " + "x" * 150)
+
+        self.assertEqual([len(skill) for skill in Job.objects.get(pk=job.pk).display["skills"]], [2, 100])
+
+    def test_skill_rename_refreshes_jobs_shown_with_its_name(self):
+        job = self.create_job(skills_required="Go")
+        JobSkill.objects.filter(job=job).update(label="")
+        skill = Skill.objects.get(key="go")
+        skill.name = "Golang"
+        skill.save()
+
+        self.assertEqual(Job.objects.get(pk=job.pk).display["skills"], ["Golang"])
+
+    def test_rebuild_display_after_update(self):
+        job = self.create_job(salary_min=80000, salary_max=100000)
+        Job.objects.filter(pk=job.pk).update(salary_max=120000)
+
+        self.assertEqual(Job.rebuild_display(Job.objects.filter(pk=job.pk)), (1, 1))
+        self.assertEqual(Job.objects.get(pk=job.pk).display["salary"], "80K-120K")
+
+
+class ReferenceCacheTests(TestCase):
+    def test_entries_reload_without_a_version_bump_once_old(self):
+        reference = ReferenceCache()
+        Category.objects.create(name="Engineering", slug="engineering")
+        first = reference.get("categories")
+        # A change another worker made, with its version bump unseen here
+        Category.objects.bulk_create([Category(name="Design", slug="design")])
+
+        self.assertIs(reference.get("categories"), first)
+        with override_settings(REFERENCE_DATA_RELOAD_SECONDS=0):
+            reloaded = reference.get("categories")
+        self.assertEqual(sorted(row.name for row in reloaded.rows), ["Design", "Engineering"])
+        self.assertNotEqual(reloaded.digest, first.digest)
+
+
+class JobChangesTests(JobFixtureMixin, TestCase):
+    def test_cursor_round_trips_and_times_are_accepted(self):
+        now = timezone.now()
+        cursor = ChangesCursor(now, now, 12, 3)
+
+        self.assertEqual(decode_changes_cursor(encode_changes_cursor(cursor)), cursor)
+        self.assertEqual(decode_changes_cursor(""), START)
+        self.assertEqual(decode_changes_cursor(now.isoformat()), ChangesCursor(now, now, 0, None))
+        with self.assertRaises(ValueError):
+            decode_changes_cursor("c1.not-base64!")
+
+    @override_settings(JOB_CHANGES_SETTLE_SECONDS=0)
+    def test_changes_leave_out_fields_that_do_not_move_updated_at(self):
+        job = self.create_job()
+
+        response = self.client.get("/api/jobs/changes/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([item["id"] for item in response.json()["changed"]], [job.pk])
+        self.assertFalse({"company_name", "application_count", "saved_count"} & set(response.json()["changed"][0]))
+        response = self.client.get("/api/jobs/changes/", {"fields": "id,saved_count"})
+        self.assertEqual(response.status_code, 400)
+
+
+@override_settings(REDIS_URL="redis://localhost:6379/0")
+class RedisLiveBackendTests(TestCase):
+    def test_events_are_only_wanted_while_a_process_listens(self):
+        try:
+            backend = RedisBackend(Broadcaster())
+        except ImproperlyConfigured:
+            self.skipTest("redis is not installed")
+        backend.client = mock.Mock()
+        backend.client.pubsub_numsub.return_value = [(b"jobs:live", 0)]
+        self.assertFalse(backend.wants_events())
+
+        backend.client.pubsub_numsub.return_value = [(b"jobs:live", 2)]
+        self.assertFalse(backend.wants_events())
+        backend.listeners_checked -= backend.listeners_ttl
+        self.assertTrue(backend.wants_events())
+
+
+class AsyncViewTests(JobFixtureMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.category = Category.objects.create(name="Engineering", slug="engineering")
+
+    def setUp(self):
+        self.job = self.create_job(category=self.category, work_mode="remote")
+        self.create_job(title="Designer")
+
+    def assertSameResponses(self, route, view, path, params=None, **kwargs):
+        sync_response = route.sync_view(RequestFactory().get(path, params), **kwargs)
+        sync_response.render()
+        async_response = async_to_sync(view)(AsyncRequestFactory().get(path, params), **kwargs)
+
+        self.assertEqual(async_response.status_code, sync_response.status_code)
+        self.assertEqual(async_response.content, sync_response.content)
+        self.assertEqual(async_response.get("ETag"), sync_response.get("ETag"))
+
+    def test_job_routes_match_the_sync_views(self):
+        for params in [{}, {"work_mode": "remote"}, {"pagination": "cursor"}, {"fields": "id,title"},
+                       {"page": "9"}, {"fields": "nope"}, {"ordering": "salary_min", "pagination": "cursor"}]:
+            with self.subTest(params=params):
+                self.assertSameResponses(async_views.JOB_LIST, async_views.job_list, "/api/jobs/", params)
+        for pk in [self.job.pk, 0]:
+            with self.subTest(pk=pk):
+                self.assertSameResponses(
+                    async_views.JOB_DETAIL, async_views.job_detail, f"/api/jobs/{pk}/", pk=pk
+                )
+
+    def test_reference_routes_match_the_sync_views(self):
+        routes = [
+            (async_views.CATEGORY_LIST, async_views.category_list, async_views.CATEGORY_DETAIL,
+             async_views.category_detail, "/api/categories/", self.category.pk),
+            (async_views.COMPANY_LIST, async_views.company_list, async_views.COMPANY_DETAIL,
+             async_views.company_detail, "/api/companies/", self.company.pk),
+        ]
+        for list_route, list_view, detail_route, detail_view, path, pk in routes:
+            with self.subTest(path=path):
+                self.assertSameResponses(list_route, list_view, path)
+                self.assertSameResponses(detail_route, detail_view, f"{path}{pk}/", pk=pk)
+                self.assertSameResponses(detail_route, detail_view, f"{path}0/", pk=0)
+
+    def test_async_views_check_throttles(self):
+        with mock.patch.object(JobViewSet, "throttle_classes", [DenyAllThrottle]):
+            response = async_to_sync(async_views.job_list)(AsyncRequestFactory().get("/api/jobs/"))
+
+        self.assertEqual(response.status_code, 429)
+
+
+class EmployerDashboardTests(JobFixtureMixin, TestCase):
+    @override_settings(EMPLOYER_STATS_ROLLUP=True)
+    def test_dashboard_pages_by_the_real_job_count(self):
+        self.employer.profile.role = "employer"
+        self.employer.profile.save()
+        for _ in range(25):
+            self.create_job()
+        # A rollup that drifted from the jobs table
+        EmployerStats.objects.update_or_create(employer=self.employer, defaults={"total_jobs": 5})
+        self.client.force_login(self.employer)
+
+        first = self.client.get("/employer/dashboard/")
+        second = self.client.get("/employer/dashboard/", {"page": 2})
+
+        self.assertEqual(first.context["jobs"].paginator.count, 25)
+        self.assertEqual(len(first.context["jobs"]), 20)
+        self.assertEqual(len(second.context["jobs"]), 5)
+
+
+class SearchIndexTests(JobFixtureMixin, TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "search-index.json")
+
+    def test_sync_saves_the_index_once_enough_rows_changed(self):
+        job = self.create_job(title="Backend Engineer")
+        index = InvertedIndex(path=self.path).build()
+        index.persist()
+        job.title = "Platform Engineer"
+        job.save()
+
+        with mock.patch.object(InvertedIndex, "SAVE_THRESHOLD", 1):
+            index.sync(force=True)
+
+        saved = InvertedIndex.load(self.path)
+        self.assertEqual(saved.watermark, Job.objects.get(pk=job.pk).updated_at)
+        self.assertIn("platform", saved.documents[job.pk])
+
+    def test_broad_queries_pass_a_bounded_id_list(self):
+        Job.objects.bulk_create([
+            Job(title=f"Engineer {number}", description="x", location="Berlin", company=self.company,
+                posted_by=self.employer)
+            for number in range(30)
+        ])
+        index = InvertedIndex().build()
+
+        with mock.patch("jobs.search.get_search_index", return_value=index), \
+                mock.patch.object(InvertedIndex, "MAX_MATCHES", 10):
+            with CaptureQueriesContext(connection) as queries:
+                jobs = list(search_jobs(Job.objects.all(), "engineer"))
+
+        self.assertEqual(len(jobs), 10)
+        self.assertEqual([job.pk for job in jobs], index.search("engineer")[:10])
+        self.assertLess(len(queries.captured_queries[-1]["sql"]), 2000)
+
+
+class FuzzyMatchTests(JobFixtureMixin, TestCase):
+    def setUp(self):
+        patcher = mock.patch("jobs.search._fuzzy_candidates", {})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_candidates_are_the_most_common_values(self):
+        for location in ["Seattle", "Seattle", "San Francisco", "Austin", "Austin", "Austin"]:
+            self.create_job(location=location)
+
+        with mock.patch("jobs.search.FUZZY_CANDIDATE_LIMIT", 2):
+            self.assertEqual(fuzzy_candidates(Job, "location", "default"), ["Austin", "Seattle"])
+
+    def test_typos_match_the_common_values(self):
+        seattle = self.create_job(location="Seattle")
+        self.create_job(location="Seattle")
+        self.create_job(location="Boston")
+
+        with mock.patch("jobs.search.FUZZY_CANDIDATE_LIMIT", 1):
+            jobs = match_location(Job.objects.all(), "Seatle")
+
+        self.assertIn(seattle, jobs)
+        self.assertEqual({job.location for job in jobs}, {"Seattle"})
+
+
+class ApplicationBulkStatusTests(JobFixtureMixin, TestCase):
+    def setUp(self):
+        self.other_employer = User.objects.create_user("other-employer", password="x")
+        self.other_applicant = User.objects.create_user("other-applicant", password="x")
+        job = self.create_job()
+        other_job = self.create_job(posted_by=self.other_employer)
+        self.own = [
+            Application.objects.create(job=job, applicant=self.applicant),
+            Application.objects.create(job=job, applicant=self.other_applicant),
+        ]
+        self.foreign = Application.objects.create(job=other_job, applicant=self.applicant)
+
+    def bulk_status(self, user, applications, status="reviewed"):
+        self.client.force_login(user)
+        response = self.client.post(
+            "/api/applications/bulk-status/",
+            {"ids": [application.pk for application in applications], "status": status},
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 200)
+        return response.json()["updated"]
+
+    def statuses(self):
+        return dict(Application.objects.values_list("pk", "status"))
+
+    def test_owner_updates_only_their_jobs_applications(self):
+        updated = self.bulk_status(self.employer, [*self.own, self.foreign])
+
+        self.assertEqual(updated, 2)
+        self.assertEqual(self.statuses(), {
+            self.own[0].pk: "reviewed", self.own[1].pk: "reviewed", self.foreign.pk: "pending",
+        })
+
+    def test_other_employer_updates_nothing(self):
+        self.assertEqual(self.bulk_status(self.other_employer, self.own), 0)
+        self.assertEqual(set(self.statuses().values()), {"pending"})
+
+    def test_applicant_updates_nothing(self):
+        self.assertEqual(self.bulk_status(self.applicant, [self.own[0], self.foreign], "hired"), 0)
+        self.assertEqual(set(self.statuses().values()), {"pending"})
+
+    @override_settings(EMPLOYER_STATS_ROLLUP=True)
+    def test_rollup_path_checks_ownership_too(self):
+        EmployerStats.objects.create(employer=self.employer, total_jobs=1, active_jobs=1, total_applications=2, pending=2)
+
+        self.assertEqual(self.bulk_status(self.other_employer, self.own), 0)
+        self.assertEqual(self.bulk_status(self.employer, [*self.own, self.foreign]), 2)
+
+        stats = EmployerStats.objects.get(employer=self.employer)
+        self.assertEqual((stats.pending, stats.reviewed), (0, 2))
+        self.assertEqual(self.statuses()[self.foreign.pk], "pending")
+
+
+class KeysetPaginationTests(JobFixtureMixin, TestCase):
+    def setUp(self):
+        jobs = [self.create_job(title=f"Job {number}") for number in range(5)]
+        # Three jobs share a created_at, so pages have to break ties by id
+        tied = timezone.now()
+        Job.objects.filter(pk__in=[job.pk for job in jobs[1:4]]).update(created_at=tied)
+        self.expected = list(Job.objects.order_by("-created_at", "-pk").values_list("pk", flat=True))
+
+    def test_next_and_previous_walk_through_ties(self):
+        jobs = Job.objects.filter(is_active=True)
+        pages, cursor = [], None
+        while True:
+            rows, next_cursor, previous_cursor = keyset_page(jobs, cursor, 2)
+            pages.append(([job.pk for job in rows], previous_cursor))
+            if next_cursor is None:
+                break
+            cursor = next_cursor
+        self.assertEqual([pk for page, _ in pages for pk in page], self.expected)
+
+        # Back from the last page
+        previous = [keyset_page(jobs, previous_cursor, 2)[0] for _, previous_cursor in pages[1:]]
+        self.assertEqual([[job.pk for job in rows] for rows in previous], [page for page, _ in pages[:-1]])
+
+    def test_cursor_round_trips(self):
+        job = Job.objects.get(pk=self.expected[2])
+        self.assertEqual(decode_cursor(encode_cursor(job, backwards=True)), (job.created_at, job.pk, True))
+        with self.assertRaises(ValueError):
+            decode_cursor("not a cursor")
+
+    def test_api_rejects_malformed_cursors(self):
+        response = self.client.get("/api/jobs/", {"cursor": "not a cursor"})
+
+        self.assertEqual(response.status_code, 404)
+
+    def test_api_cursor_needs_newest_first_order(self):
+        response = self.client.get("/api/jobs/", {"pagination": "cursor", "ordering": "salary_min"})
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("cursor", response.json())
+
+    def test_api_cursor_pages(self):
+        response = self.client.get("/api/jobs/", {"pagination": "cursor"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([job["id"] for job in response.json()["results"]], self.expected)
+        self.assertNotIn("count", response.json())
+
+
+class JobListSerializationTests(JobFixtureMixin, TestCase):
+    def setUp(self):
+        self.create_job(salary_min=80000, salary_max=120000, experience_level="senior")
+        self.create_job(title="Designer", skills_required="Figma, " + ", ".join(f"Skill {n}" for n in range(8)))
+        missing_display = self.create_job(title="Analyst")
+        Job.objects.filter(pk=missing_display.pk).update(display={})
+
+    def test_fast_serializer_output_matches_the_list_serializer(self):
+        jobs = JobViewSet.queryset.order_by("-created_at", "-pk")
+        slow = JSONRenderer().render(JobListSerializer(jobs, many=True).data)
+        fast = JSONRenderer().render(JobListFastSerializer(jobs.values(*JobListFastSerializer.values)).data)
+
+        self.assertEqual(fast, slow)
+
+
+class SparseFieldsTests(JobFixtureMixin, TestCase):
+    def setUp(self):
+        self.create_job()
+        self.create_job(title="Designer")
+
+    def job_columns(self, queries):
+        """Columns of jobs_job selected by the captured queries."""
+        return {
+            column for query in queries.captured_queries if query["sql"].startswith("SELECT")
+            for column in ("title", "description", "location", "display", "skills_required")
+            if f'"jobs_job"."{column}"' in query["sql"]
+        }
+
+    def test_fields_narrow_the_list_payload_and_columns(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/api/jobs/", {"fields": "id,title"})
+
+        self.assertEqual({tuple(job) for job in response.json()["results"]}, {("id", "title")})
+        self.assertEqual(self.job_columns(queries), {"title"})
+        self.assertNotIn('"jobs_company"', " ".join(query["sql"] for query in queries.captured_queries))
+
+    def test_fields_narrow_the_detail_payload_and_columns(self):
+        job = Job.objects.first()
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(f"/api/jobs/{job.pk}/", {"fields": "id,location"})
+
+        self.assertEqual(response.json(), {"id": job.pk, "location": job.location})
+        self.assertEqual(self.job_columns(queries), {"location"})
+
+
+class ListingCacheTests(JobFixtureMixin, TestCase):
+    def list_titles(self):
+        return [job["title"] for job in self.client.get("/api/jobs/").json()["results"]]
+
+    def test_job_save_invalidates_cached_listings(self):
+        self.create_job(title="Backend Engineer")
+        self.assertEqual(self.list_titles(), ["Backend Engineer"])
+        hits = listing_stats()["hits"]
+        self.assertEqual(self.list_titles(), ["Backend Engineer"])
+        self.assertEqual(listing_stats()["hits"], hits + 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.create_job(title="Data Engineer")
+
+        self.assertEqual(self.list_titles(), ["Data Engineer", "Backend Engineer"])
+
+    def test_company_save_invalidates_cached_listings(self):
+        self.create_job()
+        self.list_titles()
+        version = listing_version()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.company.name = "Acme Labs"
+            self.company.save()
+
+        self.assertNotEqual(listing_version(), version)
+        misses = listing_stats()["misses"]
+        self.assertEqual(self.client.get("/api/jobs/").json()["results"][0]["company_name"], "Acme Labs")
+        self.assertEqual(listing_stats()["misses"], misses + 1)
+
+
+class ApplicationExportTests(JobFixtureMixin, TestCase):
+    def setUp(self):
+        self.job = self.create_job()
+        Application.objects.create(job=self.job, applicant=self.applicant, cover_letter="=HYPERLINK(\"http://x\")")
+
+    def export(self, user, job, **params):
+        self.client.force_login(user)
+        return self.client.get(f"/jobs/{job.pk}/applications/export/", params)
+
+    def test_csv_escapes_formula_cells(self):
+        response = self.export(self.employer, self.job)
+
+        self.assertEqual(response.status_code, 200)
+        rows = list(csv.DictReader(io.StringIO(b"".join(response.streaming_content).decode())))
+        self.assertEqual(rows[0]["cover_letter"], "'=HYPERLINK(\"http://x\")")
+        self.assertEqual(rows[0]["applicant"], "applicant")
+
+    def test_ndjson_keeps_values_as_written(self):
+        response = self.export(self.employer, self.job, format="ndjson")
+
+        rows = [json.loads(line) for line in b"".join(response.streaming_content).decode().splitlines()]
+        self.assertEqual(rows[0]["cover_letter"], "=HYPERLINK(\"http://x\")")
+
+    def test_other_employers_job_is_not_found(self):
+        other_employer = User.objects.create_user("other-employer", password="x")
+
+        self.assertEqual(self.export(other_employer, self.job).status_code, 404)
+
+
+class JobDetailETagTests(JobFixtureMixin, TestCase):
+    def test_repeat_anonymous_visit_is_not_modified(self):
+        job = self.create_job()
+        url = f"/jobs/{job.pk}/"
+
+        etag = self.client.get(url).headers["ETag"]
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.headers["ETag"], etag)
+
+    def test_edit_changes_the_etag(self):
+        job = self.create_job()
+        url = f"/jobs/{job.pk}/"
+        etag = self.client.get(url).headers["ETag"]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            job.title = "Staff Engineer"
+            job.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.headers["ETag"], etag)
+        self.assertContains(response, "Staff Engineer")
+
+
+class JobBatchTests(JobFixtureMixin, TestCase):
+    def test_jobs_come_back_in_the_requested_order(self):
+        first = self.create_job(title="First")
+        second = self.create_job(title="Second")
+        closed = self.create_job(title="Closed", is_active=False)
+
+        data = self.client.get(f"/api/jobs/batch/?ids={second.pk},999999,{first.pk},{closed.pk},{second.pk}").json()
+
+        self.assertEqual([job["id"] for job in data["results"]], [second.pk, first.pk])
+        self.assertEqual(data["missing"], [999999, closed.pk])
+
+    def test_post_takes_a_list(self):
+        job = self.create_job()
+
+        response = self.client.post("/api/jobs/batch/", {"ids": [job.pk]}, content_type="application/json")
+
+        self.assertEqual([row["id"] for row in response.json()["results"]], [job.pk])
+
+    def test_too_many_ids_are_rejected(self):
+        ids = ",".join(str(pk) for pk in range(1, 502))
+
+        self.assertEqual(self.client.get(f"/api/jobs/batch/?ids={ids}").status_code, 400)
+
+
+class ApproximateCountTests(JobFixtureMixin, TestCase):
+    def paginator(self, estimate):
+        for number in range(7):
+            self.create_job(title=f"Job {number}")
+        paginator = ApproximateCountPaginator(Job.objects.order_by("pk"), 2, threshold=2)
+        patcher = mock.patch.object(paginator, "estimate_count", return_value=estimate)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        return paginator
+
+    def test_small_listings_are_counted_exactly(self):
+        self.create_job()
+        paginator = ApproximateCountPaginator(Job.objects.all(), 2, threshold=2)
+
+        self.assertEqual(paginator.count, 1)
+        self.assertFalse(paginator.is_approximate)
+
+    def test_pages_past_an_undercounting_estimate_still_resolve(self):
+        paginator = self.paginator(estimate=3)
+
+        self.assertEqual(paginator.count, 3)
+        self.assertTrue(paginator.is_approximate)
+        self.assertEqual([job.title for job in paginator.page(4)], ["Job 6"])
+        self.assertEqual(paginator.get_page(3).number, 3)
+
+
+class JobSearchFilterTests(JobFixtureMixin, TestCase):
+    def setUp(self):
+        # A fresh index (and no cached listings) per test
+        cache.clear()
+        patcher = mock.patch("jobs.search._indexes", {})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        settings_override = override_settings(JOB_SEARCH_INDEX_PATH=os.path.join(directory.name, "index.json"))
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def search_titles(self, q, **params):
+        response = self.client.get("/api/jobs/", {"search": q, **params})
+        return [job["title"] for job in response.json()["results"]]
+
+    def test_title_matches_rank_first(self):
+        self.create_job(title="Django Developer", skills_required="Python")
+        self.create_job(title="Backend Engineer", description="Our API is built with Django.", skills_required="Go")
+        self.create_job(title="Designer", skills_required="Figma")
+
+        self.assertEqual(self.search_titles("django"), ["Django Developer", "Backend Engineer"])
+
+    def test_explicit_ordering_replaces_relevance(self):
+        self.create_job(title="Django Developer", salary_min=50000)
+        self.create_job(title="Backend Engineer", description="Django", salary_min=90000)
+
+        self.assertEqual(
+            self.search_titles("django", ordering="-salary_min"), ["Backend Engineer", "Django Developer"]
+        )
+
+    @override_settings(JOB_SEARCH_INDEX_ENABLED=False)
+    def test_substring_fallback_without_an_index(self):
+        self.create_job(title="Django Developer")
+        self.create_job(title="Designer", skills_required="Figma")
+
+        self.assertEqual(self.search_titles("djang"), ["Django Developer"])
+
+
+class FacetCountTests(JobFixtureMixin, TestCase):
+    def setUp(self):
+        self.create_job(work_mode="remote", employment_type="full_time")
+        self.create_job(work_mode="remote", employment_type="contract")
+        self.create_job(work_mode="onsite", employment_type="contract")
+        self.create_job(work_mode="remote", employment_type="full_time", is_active=False)
+
+    def facets(self, **params):
+        data = self.client.get("/api/jobs/facets/", params).json()
+        return {name: {value["value"]: value["count"] for value in values} for name, values in data.items()}
+
+    def test_counts_per_value(self):
+        facets = self.facets()
+
+        self.assertEqual(facets["work_mode"], {"remote": 2, "onsite": 1, "hybrid": 0})
+        self.assertEqual(facets["employment_type"]["contract"], 2)
+
+    def test_each_facet_ignores_its_own_filter(self):
+        facets = self.facets(work_mode="remote")
+
+        # Other work modes stay countable once one is selected...
+        self.assertEqual(facets["work_mode"], {"remote": 2, "onsite": 1, "hybrid": 0})
+        # ...while every other facet counts only the selected work mode
+        self.assertEqual(facets["employment_type"]["full_time"], 1)
+        self.assertEqual(facets["employment_type"]["contract"], 1)
+
+
+class JobStatsRollupTests(JobFixtureMixin, TestCase):
+    def rollup(self):
+        call_command("rollup_job_stats", lag=0, stdout=io.StringIO())
+        return JobDailyStats.objects.values("job_id", "date", "saves", "applications").get()
+
+    def test_rollup_only_adds_rows_since_the_last_run(self):
+        job = self.create_job()
+        other_applicant = User.objects.create_user("other-applicant", password="x")
+        Application.objects.create(job=job, applicant=self.applicant)
+        SavedJob.objects.create(user=self.applicant, job=job)
+
+        first = self.rollup()
+        self.assertEqual(first, {"job_id": job.pk, "date": timezone.localdate(), "saves": 1, "applications": 1})
+        self.assertEqual(self.rollup(), first)
+
+        Application.objects.create(job=job, applicant=other_applicant)
+
+        self.assertEqual(self.rollup()["applications"], 2)
+        self.assertEqual(self.rollup()["saves"], 1)
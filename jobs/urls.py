@@ -1,11 +1,12 @@
+from django.conf import settings
 from django.urls import path
-from . import views
+from . import async_views, views
 from .health import health_check
 
 app_name = "jobs"
 
 urlpatterns = [
-    path("", views.home, name="home"),
+    path("", async_views.home if settings.ASYNC_READ_VIEWS else views.home, name="home"),
     path("health/", health_check, name="health_check"),
     path("jobs/<int:pk>/", views.job_detail, name="job_detail"),
     path("jobs/create/", views.job_create, name="job_create"),
@@ -18,5 +19,7 @@ urlpatterns = [
     path("my-applications/", views.my_applications, name="my_applications"),
     path("employer/dashboard/", views.employer_dashboard, name="employer_dashboard"),
     path("jobs/<int:pk>/applications/", views.job_applications, name="job_applications"),
+    path("jobs/<int:pk>/applications/export/", views.export_applications, name="export_applications"),
+    path("jobs/<int:pk>/applications/bulk-status/", views.bulk_update_application_status, name="bulk_update_application_status"),
     path("applications/<int:pk>/update-status/", views.update_application_status, name="update_application_status"),
 ]
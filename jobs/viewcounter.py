@@ -0,0 +1,179 @@
+"""
+Buffered job view counting.
+
+``job_detail`` records a view with ``record_view``, which only bumps an
+in-process counter. The buffered increments are written by ``flush`` as a
+single ``UPDATE ... SET view_count = view_count + CASE id WHEN ... END``
+per batch of jobs, plus the matching increments of the day's
+``JobDailyStats`` rows, each view counted on the day it was recorded. A
+flush happens once ``FLUSH_THRESHOLD`` views are pending, every
+``FLUSH_INTERVAL`` seconds from a timer thread (started with the first
+view in each process), and at interpreter exit. A hot job therefore costs
+one row update per flush instead of one per page view, an idle worker
+writes its last views within an interval, and a worker that dies without
+exiting cleanly loses at most one interval's or threshold's worth of views.
+
+``view_count`` is written with ``QuerySet.update()``: it does not touch
+``updated_at``, fire signals or invalidate cached listings, and a full
+``Job.save()`` leaves it alone (see ``Job.DENORMALIZED_FIELDS``).
+"""
+import atexit
+import logging
+import os
+import threading
+import time
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import Case, F, PositiveBigIntegerField, Value, When
+from django.utils import timezone
+
+from .analytics import add_daily_counts
+
+logger = logging.getLogger(__name__)
+
+
+class ViewCounter:
+    """Per-process buffer of job view increments."""
+
+    # Jobs per UPDATE statement
+    BATCH_SIZE = 500
+
+    def __init__(self, using="default", flush_interval=None, flush_threshold=None):
+        self.using = using
+        self.flush_interval = (
+            flush_interval if flush_interval is not None
+            else getattr(settings, "JOB_VIEW_FLUSH_INTERVAL", 10.0)
+        )
+        self.flush_threshold = (
+            flush_threshold if flush_threshold is not None
+            else getattr(settings, "JOB_VIEW_FLUSH_THRESHOLD", 100)
+        )
+        # (job_id, date) -> views
+        self.pending = {}
+        self.pending_views = 0
+        self.lock = threading.Lock()
+        self.timer = None
+        self.timer_pid = None
+        self.stopped = threading.Event()
+        self.last_flush = time.monotonic()
+        self.flush_count = 0
+        self.failed_flushes = 0
+        self.flushed_views = 0
+        self.flush_seconds_last = None
+        self.flush_seconds_max = 0.0
+
+    def record(self, job_id, views=1):
+        key = (job_id, timezone.localdate())
+        with self.lock:
+            self.pending[key] = self.pending.get(key, 0) + views
+            self.pending_views += views
+            due = self.pending_views >= self.flush_threshold
+        self.start_timer()
+        if due:
+            self.flush()
+
+    def start_timer(self):
+        """Start this process's flush timer unless it is running (a forked worker starts its own)."""
+        if self.timer_pid == os.getpid() and self.timer.is_alive():
+            return
+        with self.lock:
+            if self.timer_pid == os.getpid() and self.timer.is_alive():
+                return
+            self.timer = threading.Thread(target=self.run_timer, name="job-view-flush", daemon=True)
+            self.timer_pid = os.getpid()
+            self.timer.start()
+
+    def run_timer(self):
+        delay = self.flush_interval
+        while not self.stopped.wait(delay):
+            # Threshold flushes in between push the next timed one back
+            delay = self.flush_interval - (time.monotonic() - self.last_flush)
+            if delay > 0:
+                continue
+            delay = self.flush_interval
+            if not self.pending_views:
+                continue
+            try:
+                self.flush()
+            except Exception:
+                logger.warning("Could not flush job view counts", exc_info=True)
+            finally:
+                # The timer thread holds its own connection
+                close_old_connections()
+
+    def flush(self):
+        """Write the buffered increments; returns the number of views written."""
+        from .models import Job
+
+        with self.lock:
+            pending, self.pending, self.pending_views = self.pending, {}, 0
+            self.last_flush = time.monotonic()
+        if not pending:
+            return 0
+
+        started = time.perf_counter()
+        totals = {}
+        for (job_id, _), views in pending.items():
+            totals[job_id] = totals.get(job_id, 0) + views
+        job_ids = sorted(totals)
+        written = 0
+        try:
+            for start in range(0, len(job_ids), self.BATCH_SIZE):
+                batch = set(job_ids[start:start + self.BATCH_SIZE])
+                # Sorted ids, so concurrent flushes lock rows in the same order
+                increment = Case(
+                    *[When(pk=job_id, then=Value(totals[job_id])) for job_id in sorted(batch)],
+                    default=Value(0),
+                    output_field=PositiveBigIntegerField(),
+                )
+                daily = {key: views for key, views in pending.items() if key[0] in batch}
+                with transaction.atomic(using=self.using):
+                    Job.objects.using(self.using).filter(pk__in=batch).update(view_count=F("view_count") + increment)
+                    add_daily_counts("views", daily, self.using)
+                written += sum(daily.values())
+                for key in daily:
+                    del pending[key]
+        except Exception:
+            logger.warning("Could not flush job view counts", exc_info=True)
+            self.failed_flushes += 1
+            # Put the unwritten increments back for the next flush
+            with self.lock:
+                for key, views in pending.items():
+                    self.pending[key] = self.pending.get(key, 0) + views
+                    self.pending_views += views
+        elapsed = time.perf_counter() - started
+        self.flush_count += 1
+        self.flushed_views += written
+        self.flush_seconds_last = elapsed
+        self.flush_seconds_max = max(self.flush_seconds_max, elapsed)
+        return written
+
+    def stats(self):
+        return {
+            "pending_views": self.pending_views,
+            "pending_jobs": len({job_id for job_id, _ in self.pending}),
+            "flushes": self.flush_count,
+            "failed_flushes": self.failed_flushes,
+            "flushed_views": self.flushed_views,
+            "last_flush_ms": round(self.flush_seconds_last * 1000, 2) if self.flush_seconds_last is not None else None,
+            "max_flush_ms": round(self.flush_seconds_max * 1000, 2),
+            "flush_interval": self.flush_interval,
+            "flush_threshold": self.flush_threshold,
+        }
+
+
+view_counter = ViewCounter()
+
+
+def record_view(job_id):
+    view_counter.record(job_id)
+
+
+@atexit.register
+def _flush_at_exit():
+    view_counter.stopped.set()
+    try:
+        view_counter.flush()
+    except Exception:
+        logger.warning("Could not flush job view counts at exit", exc_info=True)
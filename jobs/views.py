@@ -1,107 +1,204 @@
 from django.shortcuts import render, get_object_or_404, redirect
+from django.urls import reverse
+from django.http import StreamingHttpResponse
+from django.utils.cache import add_never_cache_headers, get_conditional_response, patch_cache_control
+from django.utils.http import quote_etag
+from django.utils.text import slugify
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
-from django.db.models import Q, Count
-from django.db import models
+from django.db.models import Q, Count, Exists, OuterRef
 from django.core.paginator import Paginator
-from .models import Job, Application, Company, Category, SavedJob, Testimonial, FAQ
+from .models import Job, JobDailyStats, Application, Company, Category, SavedJob, Testimonial, FAQ
 from .forms import JobForm, ApplicationForm, JobSearchForm
+from .cache import cached, cached_page, listing_key, listing_timeout, listing_version
+from .refdata import reference_rows
+from .pagination import KEYSET_ORDERING, encode_cursor, keyset_page, listing_paginator
+from .facets import apply_facet_filters, facet_counts, facet_filters
+from .analytics import daily_series
+from .dashboard import employer_stats
+from .viewcounter import record_view
+from .pagecache import cache_anonymous_page, tag_page
+from .exports import EXPORT_FORMATS, application_rows
+from .search import match_location, match_skills, search_jobs
 
 
-def home(request):
-    # Get search parameters
-    q = request.GET.get("q", "")
-    location = request.GET.get("location", "")
-    category = request.GET.get("category", "")
-    employment_type = request.GET.get("employment_type", "")
-    work_mode = request.GET.get("work_mode", "")
-    experience_level = request.GET.get("experience_level", "")
-    salary_min = request.GET.get("salary_min", "")
-
-    # Start with active jobs - with error handling for missing tables
-    try:
-        jobs = Job.objects.filter(is_active=True).select_related('company', 'category', 'posted_by')
-    except Exception as e:
-        # If tables don't exist, return empty queryset and show setup message
-        from django.http import HttpResponse
-        return HttpResponse("""
-        <h1>Database Setup Required</h1>
-        <p>The database tables haven't been created yet. This usually happens during the first deployment.</p>
-        <p>Please wait a few minutes for the deployment to complete, then refresh this page.</p>
-        <p>If this error persists, check the deployment logs in your Render dashboard.</p>
-        <hr>
-        <p><strong>Error:</strong> {}</p>
-        """.format(str(e)))
-    
+def _listing_url(request, **params):
+    """The current listing URL with page/cursor replaced by ``params``."""
+    query = request.GET.copy()
+    query.pop("page", None)
+    query.pop("cursor", None)
+    query.update(params)
+    return f"?{query.urlencode()}"
+
+
+def home_jobs(params):
+    """
+    Querysets for the home listing with search parameters ``params``: all
+    jobs (that cached page IDs are loaded from), the search results before
+    facet filters (for the facet counts) and the page's listing, plus the
+    active facet filters and whether the listing is newest-first.
+    """
+    q = params.get("q", "")
+    location = params.get("location", "")
+    skills = params.get("skills", "")
+    filters = facet_filters(params)
+
+    # Cards read skills and the other formatted values from Job.display
+    listing = Job.objects.select_related(
+        'company', 'category', 'posted_by'
+    ).defer('search_vector')
+    jobs = listing.filter(is_active=True)
+
     # Apply filters
     if q:
-        jobs = jobs.filter(
-            Q(title__icontains=q) | 
-            Q(description__icontains=q) | 
-            Q(company__name__icontains=q) |
-            Q(skills_required__icontains=q)
-        )
+        jobs = search_jobs(jobs, q)
     if location:
-        jobs = jobs.filter(location__icontains=location)
-    if category:
-        jobs = jobs.filter(category__slug=category)
-    if employment_type:
-        jobs = jobs.filter(employment_type=employment_type)
-    if work_mode:
-        jobs = jobs.filter(work_mode=work_mode)
-    if experience_level:
-        jobs = jobs.filter(experience_level=experience_level)
-    if salary_min:
-        try:
-            salary_min = int(salary_min)
-            jobs = jobs.filter(salary_min__gte=salary_min)
-        except ValueError:
-            pass
+        # Keyword relevance wins over location similarity when both are given
+        jobs = match_location(jobs, location, ranked=not q)
+    if skills:
+        jobs = match_skills(jobs, skills.split(","), match_all=params.get("skills_match") == "all")
+    search_results = jobs
+    jobs = apply_facet_filters(jobs, filters)
+    # Without keyword/location ranking the listing is newest-first, and
+    # "Next" links use keyset cursors instead of page numbers
+    by_recency = not (q or location)
+    if by_recency:
+        jobs = jobs.order_by(*KEYSET_ORDERING)
+    return listing, search_results, jobs, filters, by_recency
 
-    # Pagination with error handling
-    try:
-        paginator = Paginator(jobs, 12)  # Show 12 jobs per page
-        page_number = request.GET.get('page')
-        jobs = paginator.get_page(page_number)
 
-        categories = Category.objects.all()
-        
-        context = {
-            "jobs": jobs,
-            "categories": categories,
-            "search_form": JobSearchForm(request.GET),
-        }
-        return render(request, "jobs/home.html", context)
-    except Exception as e:
-        # If pagination or categories fail due to missing tables
-        from django.http import HttpResponse
-        return HttpResponse(f"""
+def home_page_links(request, page, by_recency):
+    """Next/previous links for a numbered page of the home listing."""
+    pagination = {}
+    if page.has_next():
+        pagination["next"] = (
+            _listing_url(request, cursor=encode_cursor(page[-1])) if by_recency
+            else _listing_url(request, page=page.next_page_number())
+        )
+    if page.has_previous():
+        pagination["previous"] = _listing_url(request, page=page.previous_page_number())
+    return pagination
+
+
+def render_home(request, context):
+    context = {
+        **context,
+        "search_form": JobSearchForm(request.GET),
+        "card_timeout": listing_timeout(),
+    }
+    return render(request, "jobs/home.html", context)
+
+
+def database_setup_response(error):
+    # If pagination or categories fail due to missing tables
+    from django.http import HttpResponse
+    response = HttpResponse(f"""
         <h1>Database Setup In Progress</h1>
         <p>The database is still being set up. Please wait a few minutes and refresh.</p>
         <p>If this error persists, the database migrations may not have run properly during deployment.</p>
         <hr>
         <p><strong>Technical Details:</strong></p>
-        <p>Error: {str(e)}</p>
+        <p>Error: {str(error)}</p>
         <p>This usually means the database tables haven't been created yet.</p>
         <p><a href="/health/">Check System Health</a></p>
         """)
+    add_never_cache_headers(response)
+    return response
+
+
+@cache_anonymous_page("home")
+def home(request):
+    tag_page(request, "listings")
+    listing, search_results, jobs, filters, by_recency = home_jobs(request.GET)
+
+    # Pagination with error handling
+    try:
+        # Page IDs, total count and facets are cached per distinct search
+        key = listing_key("home", request.GET, ignore=("page", "cursor"))
+        cursor = request.GET.get("cursor") if by_recency else None
+        pagination = {}
+        if cursor:
+            try:
+                jobs, next_cursor, previous_cursor = keyset_page(jobs, cursor, 12)
+                pagination = {
+                    "next": next_cursor and _listing_url(request, cursor=next_cursor),
+                    "previous": previous_cursor and _listing_url(request, cursor=previous_cursor),
+                }
+            except ValueError:
+                cursor = None
+        if not cursor:
+            jobs = cached_page(
+                jobs, 12, request.GET.get('page'), key, listing,  # Show 12 jobs per page
+                paginator_class=listing_paginator("home"),
+            )
+            pagination = home_page_links(request, jobs, by_recency)
+
+        categories = reference_rows("categories")
+        facets = cached(f"{key}:facets", lambda: facet_counts(search_results, filters, categories))
+        
+        return render_home(request, {
+            "jobs": jobs,
+            "categories": categories,
+            "facets": facets,
+            "pagination": pagination,
+            # Job cards are fragment-cached per listing version
+            "card_version": listing_version(),
+        })
+    except Exception as e:
+        return database_setup_response(e)
+
+
+def _job_detail_etag(job_id, updated_at):
+    """ETag for the anonymous job_detail page."""
+    # The listing version changes with any job, company or category edit,
+    # so a renamed company also invalidates the page. No Last-Modified:
+    # updated_at alone would miss those edits.
+    return quote_etag(f"{job_id}-{updated_at.timestamp()}-{listing_version()}")
 
 
+def _record_cached_view(request, pk):
+    record_view(pk)
+
+
+@cache_anonymous_page("job_detail", on_hit=_record_cached_view)
 def job_detail(request, pk):
-    job = get_object_or_404(Job, pk=pk)
-    is_saved = False
-    has_applied = False
+    jobs = Job.objects.select_related('company', 'category').defer('search_vector')
+    etag = None
     
     if request.user.is_authenticated:
-        is_saved = SavedJob.objects.filter(user=request.user, job=job).exists()
-        has_applied = Application.objects.filter(applicant=request.user, job=job).exists()
+        jobs = jobs.annotate(
+            is_saved=Exists(SavedJob.objects.filter(user=request.user, job=OuterRef('pk'))),
+            has_applied=Exists(Application.objects.filter(applicant=request.user, job=OuterRef('pk'))),
+        )
+    elif 'If-None-Match' in request.headers:
+        # Anonymous pages depend only on the job: answer repeat visits with a
+        # 304 before loading or rendering anything
+        updated_at = Job.objects.filter(pk=pk).values_list('updated_at', flat=True).first()
+        if updated_at is not None:
+            not_modified = get_conditional_response(request, etag=_job_detail_etag(pk, updated_at))
+            if not_modified is not None:
+                record_view(pk)
+                return not_modified
+    
+    if not request.user.is_authenticated:
+        tag_page(request, f"job:{pk}")
+    job = get_object_or_404(jobs, pk=pk)
+    record_view(job.pk)
+    if not request.user.is_authenticated:
+        tag_page(request, f"company:{job.company_id}", f"category:{job.category_id}")
+        etag = _job_detail_etag(job.pk, job.updated_at)
     
     context = {
         "job": job,
-        "is_saved": is_saved,
-        "has_applied": has_applied,
+        "is_saved": getattr(job, 'is_saved', False),
+        "has_applied": getattr(job, 'has_applied', False),
     }
-    return render(request, "jobs/job_detail.html", context)
+    response = render(request, "jobs/job_detail.html", context)
+    if etag is not None:
+        response.headers['ETag'] = etag
+        # Let browsers keep the page but revalidate it on every visit
+        patch_cache_control(response, private=True, no_cache=True)
+    return response
 
 
 @login_required
@@ -187,10 +284,33 @@ def unsave_job(request, pk):
     return redirect("jobs:job_detail", pk=job.pk)
 
 
+def user_saved_jobs(user):
+    """The saved_jobs listing of ``user``, newest first."""
+    return SavedJob.objects.filter(user=user).select_related('job__company', 'job__category')
+
+
+def applicant_applications(user):
+    """The my_applications listing of ``user``, newest first."""
+    return Application.objects.filter(applicant=user).select_related('job__company')
+
+
+def employer_jobs(user):
+    """The employer_dashboard listing of ``user``'s jobs, newest first."""
+    return Job.objects.filter(posted_by=user).select_related('company').defer('search_vector')
+
+
+def job_application_list(job, status=None):
+    """The job_applications listing of ``job``, newest first, optionally of one status."""
+    applications = job.applications.all().select_related('applicant')
+    if status:
+        applications = applications.filter(status=status)
+    return applications
+
+
 @login_required
 def saved_jobs(request):
-    saved_jobs = SavedJob.objects.filter(user=request.user).select_related('job__company', 'job__category')
-    paginator = Paginator(saved_jobs, 10)
+    saved_jobs = user_saved_jobs(request.user)
+    paginator = listing_paginator("saved_jobs")(saved_jobs, 10)
     page_number = request.GET.get('page')
     saved_jobs = paginator.get_page(page_number)
     return render(request, "jobs/saved_jobs.html", {"saved_jobs": saved_jobs})
@@ -198,8 +318,8 @@ def saved_jobs(request):
 
 @login_required
 def my_applications(request):
-    applications = Application.objects.filter(applicant=request.user).select_related('job__company')
-    paginator = Paginator(applications, 10)
+    applications = applicant_applications(request.user)
+    paginator = listing_paginator("my_applications")(applications, 10)
     page_number = request.GET.get('page')
     applications = paginator.get_page(page_number)
     return render(request, "jobs/my_applications.html", {"applications": applications})
@@ -211,9 +331,11 @@ def employer_dashboard(request):
         messages.error(request, "Access denied. Employer account required.")
         return redirect("jobs:home")
     
-    jobs = Job.objects.filter(posted_by=request.user).annotate(
-        application_count=models.Count('applications')
-    )
+    stats = employer_stats(request.user)
+    jobs = employer_jobs(request.user)
+    # Paged by the real COUNT(*) (cheap on job_posted_by_recent_idx), not
+    # the rollup total, which may have drifted until the next recount
+    jobs = Paginator(jobs, 20).get_page(request.GET.get('page'))
     recent_applications = Application.objects.filter(
         job__posted_by=request.user
     ).select_related('job', 'applicant')[:10]
@@ -221,9 +343,13 @@ def employer_dashboard(request):
     context = {
         'jobs': jobs,
         'recent_applications': recent_applications,
-        'total_jobs': jobs.count(),
-        'active_jobs': jobs.filter(is_active=True).count(),
-        'total_applications': Application.objects.filter(job__posted_by=request.user).count(),
+        'total_jobs': stats['total_jobs'],
+        'active_jobs': stats['active_jobs'],
+        'total_applications': stats['total_applications'],
+        'daily_stats': daily_series(JobDailyStats.objects.filter(job__posted_by=request.user), 30),
+        'status_counts': [
+            (status, label, stats[status]) for status, label in Application.STATUS_CHOICES
+        ],
     }
     return render(request, "jobs/employer_dashboard.html", context)
 
@@ -231,13 +357,8 @@ def employer_dashboard(request):
 @login_required
 def job_applications(request, pk):
     job = get_object_or_404(Job, pk=pk, posted_by=request.user)
-    applications = job.applications.all().select_related('applicant')
-    
-    status_filter = request.GET.get('status')
-    if status_filter:
-        applications = applications.filter(status=status_filter)
-    
-    paginator = Paginator(applications, 10)
+    applications = job_application_list(job, request.GET.get('status'))
+    paginator = listing_paginator("job_applications")(applications, 10)
     page_number = request.GET.get('page')
     applications = paginator.get_page(page_number)
     
@@ -249,6 +370,25 @@ def job_applications(request, pk):
     return render(request, "jobs/job_applications.html", context)
 
 
+@login_required
+def export_applications(request, pk):
+    job = get_object_or_404(Job, pk=pk, posted_by=request.user)
+    export_format = request.GET.get('format', 'csv')
+    if export_format not in EXPORT_FORMATS:
+        export_format = 'csv'
+    content_type, render_lines = EXPORT_FORMATS[export_format]
+    
+    applications = job.applications.all()
+    status_filter = request.GET.get('status')
+    if status_filter:
+        applications = applications.filter(status=status_filter)
+    
+    response = StreamingHttpResponse(render_lines(application_rows(applications)), content_type=content_type)
+    filename = f"{slugify(job.title) or 'job'}-{job.pk}-applications.{export_format}"
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
+
+
 @login_required
 def update_application_status(request, pk):
     application = get_object_or_404(Application, pk=pk, job__posted_by=request.user)
@@ -261,3 +401,22 @@ def update_application_status(request, pk):
             messages.success(request, f"Application status updated to {application.get_status_display()}")
     
     return redirect("jobs:job_applications", pk=application.job.pk)
+
+
+@login_required
+def bulk_update_application_status(request, pk):
+    if request.method == "POST":
+        status = request.POST.get('status')
+        application_ids = [value for value in request.POST.getlist('application_ids') if value.isdigit()]
+        if status not in dict(Application.STATUS_CHOICES):
+            messages.error(request, "Choose a status to apply.")
+        elif not application_ids:
+            messages.error(request, "Select at least one application.")
+        else:
+            updated = Application.bulk_set_status(request.user, application_ids, status, job=pk)
+            label = dict(Application.STATUS_CHOICES)[status]
+            messages.success(request, f"{updated} application{'s' if updated != 1 else ''} updated to {label}")
+    
+    url = reverse("jobs:job_applications", args=[pk])
+    query = request.GET.urlencode()
+    return redirect(f"{url}?{query}" if query else url)